@@ -0,0 +1,90 @@
+"""
+Time the traversal of synthetic node graphs.
+
+Three graphs of about 10,000 nodes are built: a single chain, as deep as a
+graph can be, a pipeline of batches, each with a chain of jobs, fanning out
+from one preprocessing chain, and a layered graph where every node links to
+several nodes of the next layer. For each, the time taken to explore the
+graph from its origin and to call it, both serially and in waves on a pool
+of threads, is printed. The layered graph is not called: an uncalled node
+passes its traffic on every time it is reached, so calling it repeats work
+for every path through the graph, which is the intended behaviour but not a
+traversal cost.
+
+    python benchmarks/graph_traversal.py [--nodes 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from relion.node import Node
+from relion.node.graph import Graph
+
+
+def chain(size):
+    nodes = [Node(f"node{i}") for i in range(size)]
+    for node, next_node in zip(nodes, nodes[1:]):
+        node.link_to(next_node, traffic={"previous": node.name})
+    return nodes
+
+
+def batches(size, jobs_per_batch=5, preprocessing=5):
+    nodes = chain(preprocessing)
+    for batch in range(max((size - preprocessing) // jobs_per_batch, 1)):
+        jobs = [
+            Node(f"batch{batch}:job{job}", independent=True)
+            for job in range(jobs_per_batch)
+        ]
+        nodes[preprocessing - 1].link_to(jobs[0], traffic={"batch_number": batch})
+        for job, next_job in zip(jobs, jobs[1:]):
+            job.link_to(next_job, share=[("batch_number", "batch_number")])
+        nodes.extend(jobs)
+    return nodes
+
+
+def layers(size, width=100, links=3, seed=0):
+    rng = random.Random(seed)
+    nodes = [Node(f"node{i}") for i in range(size)]
+    for start in range(0, size - width, width):
+        for node in nodes[start : start + width]:
+            for next_node in rng.sample(
+                nodes[start + width : start + 2 * width], links
+            ):
+                node.link_to(next_node)
+    # a single origin for the whole graph
+    origin = Node("origin")
+    for node in nodes[:width]:
+        origin.link_to(node)
+    return [origin] + nodes
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    function()
+    print(f"  {label:<20} {time.perf_counter() - start:8.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10000)
+    args = parser.parse_args()
+    for name, build, call in (
+        ("chain", chain, True),
+        ("batches", batches, True),
+        ("layers", layers, False),
+    ):
+        nodes = build(args.nodes)
+        graph = Graph(name, nodes)
+        print(f"{name}: {len(nodes)} nodes")
+        timed("node_explore", lambda: graph.node_explore(nodes[0], []))
+        if call:
+            timed("call", graph)
+            waves = Graph(name, nodes, max_workers=4)
+            timed("call in waves", waves)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure the memory taken by each node of a graph.
+
+Chains of plain nodes and of process nodes, set up as the nodes of a Relion
+pipeline are, are built and the bytes allocated for them, their links and
+their environments are divided by the number of nodes. So is the memory
+taken by a clone of the process node graph, as made for every job graph.
+
+    python benchmarks/node_memory.py [--nodes 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from relion._parser.processnode import ProcessNode
+from relion.node import Node
+from relion.node.graph import Graph
+
+
+def plain_nodes(size):
+    nodes = [Node(f"node{i}") for i in range(size)]
+    for node, next_node in zip(nodes, nodes[1:]):
+        node.link_to(next_node)
+    return nodes
+
+
+def process_nodes(size):
+    nodes = [
+        ProcessNode(f"MotionCorr/job{i:03d}", status=True, alias=None)
+        for i in range(size)
+    ]
+    for node, next_node in zip(nodes, nodes[1:]):
+        node.link_to(next_node)
+    return nodes
+
+
+def bytes_per_node(build, size):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = build(size)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(nodes), nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10000)
+    args = parser.parse_args()
+    plain, _ = bytes_per_node(plain_nodes, args.nodes)
+    print(f"Node                 {plain:8.0f} bytes")
+    process, nodes = bytes_per_node(process_nodes, args.nodes)
+    print(f"ProcessNode          {process:8.0f} bytes")
+    graph = Graph("pipeline", nodes)
+    cloned, _ = bytes_per_node(lambda size: graph.clone().nodes, args.nodes)
+    print(f"cloned ProcessNode   {cloned:8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Time the parsing of a large synthetic run.out file.
+
+A run.out file of about 50 MB is written, made of cluster job submissions
+printed among Relion's progress bars, each followed by the micrographs that
+job processed, and parsed both by the line by line parser run.out files used
+to be read with and by ClusterSubmissions. The results of the two are
+checked to be the same.
+
+    python benchmarks/run_out_parsing.py [--size 50] [--path run.out]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from relion._parser.joblogs import ClusterSubmissions
+
+
+def write_run_out(path, size_mb, seed=0):
+    rng = random.Random(seed)
+    submission = 0
+    with open(path, "w") as run_out:
+        while run_out.tell() < size_mb * 1_000_000:
+            submission += 1
+            progress = "~" * rng.randint(10, 70)
+            run_out.write(
+                f'000/??? sec {progress}(,_,">  [oo] 2022-03-01 '
+                f"12:{submission // 60 % 60:02d}:{submission % 60:02d}.123: "
+                f"Submitted with job ID cluster{submission}\n"
+            )
+            for mic in range(rng.randint(20, 60)):
+                run_out.write(f" * Movies/mic_{submission:05d}_{mic:03d}.tiff\n")
+            for _ in range(rng.randint(20, 60)):
+                run_out.write(f"{rng.randint(0, 999):3d}/999 sec " + "~" * 60 + "\n")
+
+
+def line_by_line(outlog):
+    cluster_ids = []
+    job_count = 0
+    mic_counts = []
+    t = []
+    for line in outlog:
+        if "with job ID" in line:
+            cluster_ids.append(line.split()[-1])
+            job_count += 1
+            mic_counts.append(0)
+            time_string = ":".join(line.split(":")[:3])
+            time_string = time_string.split(".")[-2]
+            for c in ("~", ",", "_", '"', ">", "(", ")", "[", "o", "]"):
+                time_string = time_string.replace(c, "")
+            time_string = " ".join(time_string.split(" ")[-2:])
+            t.append(datetime.datetime.strptime(time_string, "%Y-%m-%d %H:%M:%S"))
+        if (
+            ("*" in line or "Filtering" in line)
+            and (".mrc" in line or ".tiff" in line)
+            and job_count
+        ):
+            mic_counts[job_count - 1] += 1
+    if all(cid.isnumeric() for cid in cluster_ids):
+        mic_counts = None
+    return cluster_ids, t, mic_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=50, help="size in MB")
+    parser.add_argument("--path", help="where to write the run.out file")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = args.path or os.path.join(tmpdir, "run.out")
+        write_run_out(path, args.size)
+        print(f"run.out: {os.path.getsize(path) / 1e6:.1f} MB")
+        start = time.perf_counter()
+        with open(path) as run_out:
+            expected = line_by_line(run_out.readlines())
+        print(f"  {'line by line':<20} {time.perf_counter() - start:8.3f} s")
+        start = time.perf_counter()
+        with open(path) as run_out:
+            submissions = ClusterSubmissions(run_out)
+        print(f"  {'ClusterSubmissions':<20} {time.perf_counter() - start:8.3f} s")
+    found = (
+        submissions.cluster_ids,
+        submissions.start_times,
+        submissions.mic_counts,
+    )
+    assert found == expected, "the parsers disagree"
+    print(f"  {len(submissions.cluster_ids)} submissions, results match")
+
+
+if __name__ == "__main__":
+    main()
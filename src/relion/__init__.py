@@ -6,22 +6,23 @@ https://github.com/DiamondLightSource/python-relion
 from __future__ import annotations
 
 import functools
-import os
 import pathlib
+import sqlite3
 import time
 from collections import namedtuple
 
-from gemmi import cif
-
 from relion._parser.autopick import AutoPick
 from relion._parser.class2D import Class2D
 from relion._parser.class3D import Class3D
 from relion._parser.cryolo import Cryolo, CryoloAutoPick
 from relion._parser.ctffind import CTFFind
+from relion._parser.dirsnapshot import DirectorySnapshot
 from relion._parser.initialmodel import InitialModel
 from relion._parser.motioncorrection import MotionCorr
+from relion._parser.persistentcache import PersistentFileCache
 from relion._parser.relativeicethickness import RelativeIceThickness
 from relion._parser.relion_pipeline import RelionPipeline
+from relion._parser.starcache import read_star_file, star_document_cache
 
 try:
     from relion.cryolo_relion_it.cryolo_relion_it import RelionItOptions
@@ -41,6 +42,7 @@ __version__ = "0.10.24"
 __version_tuple__ = tuple(int(x) for x in __version__.split("."))
 
 pipeline_lock = ".relion_lock"
+persistent_cache_file = ".relion_parser_cache.sqlite"
 
 
 RelionJobResult = namedtuple(
@@ -75,14 +77,28 @@ class Project(RelionPipeline):
         message_constructors=None,
         cluster=False,
         version: int = 3,
+        parser_threads: int = 1,
+        persistent_cache: bool = False,
+        pipeline_threads: int = 1,
     ):
         """
         Create an object representing a Relion project.
         :param path: A string or file system path object pointing to the root
                      directory of an existing Relion project.
+        :param parser_threads: Maximum number of threads used to read the
+                     per-micrograph files of a job, and the directories of
+                     different job types, concurrently.
+        :param persistent_cache: Keep the data parsed from per-micrograph files
+                     in an SQLite file in the project directory so that it
+                     does not have to be parsed again after a restart.
+        :param pipeline_threads: Maximum number of threads used to collect the
+                     results of jobs that do not depend on each other
+                     concurrently when messages are built.
         """
         self.basepath = pathlib.Path(path)
         self._version = version
+        self._parser_threads = parser_threads
+        self._pipeline_threads = pipeline_threads
         super().__init__(
             "Import/job001", locklist=[self.basepath / "default_pipeline.star"]
         )
@@ -92,9 +108,26 @@ class Project(RelionPipeline):
             self.construct_messages = {}
         if not self.basepath.is_dir():
             raise ValueError(f"path {self.basepath} is not a directory")
-        self._data_pipeline = Graph("DataPipeline", [])
+        self._data_pipeline = Graph(
+            "DataPipeline", [], max_workers=self._pipeline_threads
+        )
         self._db_model = DBModel(database)
         self._drift_cache = {}
+        self._particle_cache = {}
+        self._iteration_cache = {}
+        self._star_loop_cache = {}
+        self._snapshot = DirectorySnapshot()
+        self._file_cache = None
+        if persistent_cache:
+            try:
+                self._file_cache = PersistentFileCache(
+                    self.basepath / persistent_cache_file
+                )
+            except sqlite3.Error:
+                logger.warning(
+                    f"Could not open persistent cache in {self.basepath}, continuing without it",
+                    exc_info=True,
+                )
         if run_options is None:
             self.run_options = RelionItOptions()
         else:
@@ -126,6 +159,21 @@ class Project(RelionPipeline):
     def __str__(self):
         return f"<relion.Project at {self.basepath}>"
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """
+        Commit the persistent cache, if there is one, and close it. The
+        project can still be loaded afterwards but is no longer cached on disk.
+        """
+        if self._file_cache is not None:
+            self._file_cache.close()
+            self._file_cache = None
+
     @property
     def _results_dict(self):
         resd = {
@@ -149,7 +197,9 @@ class Project(RelionPipeline):
         """access the CTFFind stage of the project.
         Returns a dictionary-like object with job names as keys,
         and lists of CTFMicrograph namedtuples as values."""
-        return CTFFind(self.basepath / "CtfFind")
+        return CTFFind(
+            self.basepath / "CtfFind", self._star_loop_cache, snapshot=self._snapshot
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
@@ -157,22 +207,44 @@ class Project(RelionPipeline):
         """access the motion correction stage of the project.
         Returns a dictionary-like object with job names as keys,
         and lists of MCMicrograph namedtuples as values."""
-        return MotionCorr(self.basepath / "MotionCorr", self._drift_cache)
+        return MotionCorr(
+            self.basepath / "MotionCorr",
+            self._drift_cache,
+            self._star_loop_cache,
+            threads=self._parser_threads,
+            file_cache=self._file_cache,
+            snapshot=self._snapshot,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
     def autopick(self):
-        return AutoPick(self.basepath / "AutoPick")
+        return AutoPick(
+            self.basepath / "AutoPick",
+            self._particle_cache,
+            file_cache=self._file_cache,
+            snapshot=self._snapshot,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
     def autopick_cryolo(self):
-        return CryoloAutoPick(self.basepath / "AutoPick")
+        return CryoloAutoPick(
+            self.basepath / "AutoPick",
+            self._particle_cache,
+            file_cache=self._file_cache,
+            snapshot=self._snapshot,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
     def cryolo(self):
-        return Cryolo(self.basepath / "External")
+        return Cryolo(
+            self.basepath / "External",
+            self._particle_cache,
+            file_cache=self._file_cache,
+            snapshot=self._snapshot,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
@@ -180,12 +252,20 @@ class Project(RelionPipeline):
         """access the 2D classification stage of the project.
         Returns a dictionary-like object with job names as keys,
         and lists of Class2DParticleClass namedtuples as values."""
-        return Class2D(self.basepath / "Class2D")
+        return Class2D(
+            self.basepath / "Class2D",
+            snapshot=self._snapshot,
+            iteration_cache=self._iteration_cache,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
     def initialmodel(self):
-        return InitialModel(self.basepath / "InitialModel")
+        return InitialModel(
+            self.basepath / "InitialModel",
+            snapshot=self._snapshot,
+            iteration_cache=self._iteration_cache,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
@@ -193,17 +273,23 @@ class Project(RelionPipeline):
         """access the 3D classification stage of the project.
         Returns a dictionary-like object with job names as keys,
         and lists of Class3DParticleClass namedtuples as values."""
-        return Class3D(self.basepath / "Class3D")
+        return Class3D(
+            self.basepath / "Class3D",
+            snapshot=self._snapshot,
+            iteration_cache=self._iteration_cache,
+        )
 
     @property
     @functools.lru_cache(maxsize=1)
     def relativeicethickness(self):
-        return RelativeIceThickness(self.basepath / "External")
+        return RelativeIceThickness(self.basepath / "External", snapshot=self._snapshot)
 
     @property
     @functools.lru_cache(maxsize=1)
     def relativeicethickness_ib(self):
-        return RelativeIceThickness(self.basepath / "IceBreaker")
+        return RelativeIceThickness(
+            self.basepath / "IceBreaker", snapshot=self._snapshot
+        )
 
     def origin_present(self):
         try:
@@ -214,10 +300,22 @@ class Project(RelionPipeline):
             return False
         return (self.basepath / self.origin / "RELION_JOB_EXIT_SUCCESS").is_file()
 
-    def load(self, clear_cache=True, cluster=False):
+    def load(self, clear_cache=True, cluster=False, incremental=False):
+        """
+        Load the state of the project.
+        :param incremental: Only read default_pipeline.star again if it has
+                     changed, and then only add the jobs added to it, so that
+                     the job nodes are the same objects from one load to the
+                     next and the cost of a load does not grow with the size
+                     of the pipeline.
+        """
         if clear_cache:
             self._clear_caches()
-        self._data_pipeline = Graph("DataPipeline", [])
+        # a fresh view of the project directories for this load
+        self._snapshot = DirectorySnapshot()
+        self._data_pipeline = Graph(
+            "DataPipeline", [], max_workers=self._pipeline_threads
+        )
         # reset the in and out lists of database nodes
         # have to avoid removing the permanent connections from other database nodes
         for dbn in self._db_model.values():
@@ -227,8 +325,12 @@ class Project(RelionPipeline):
                 if isinstance(i_node, DBNode) or isinstance(i_node, DBGraph)
             ]
         self._jobs_collapsed = False
-        self.load_nodes_from_star(self.basepath / "default_pipeline.star")
-        self.check_job_node_statuses(self.basepath)
+        self.load_nodes_from_star(
+            self.basepath / "default_pipeline.star", incremental=incremental
+        )
+        self.check_job_node_statuses(
+            self.basepath, snapshot=self._snapshot, threads=self._parser_threads
+        )
         self.collect_job_times(
             list(self.schedule_files), self.basepath / "pipeline_PREPROCESS.log"
         )
@@ -296,6 +398,11 @@ class Project(RelionPipeline):
         self.load()
         super().show_job_nodes(self.basepath)
 
+    @property
+    def star_cache_stats(self):
+        """hit/miss counts and current size of the process-wide STAR document cache"""
+        return star_document_cache.stats
+
     @property
     def schedule_files(self):
         return self.basepath.glob("pipeline*.log")
@@ -338,6 +445,8 @@ class Project(RelionPipeline):
         if currj is None:
             return None
         else:
+            # the job nodes themselves are kept for the next load
+            currj = [n.clone() for n in currj]
             for n in currj:
                 n.change_name(self.basepath / n.name)
             return currj
@@ -358,8 +467,7 @@ class Project(RelionPipeline):
     def get_imported(self):
         try:
             import_job_path = self.basepath / self.origin
-            gemmi_readable_path = os.fspath(import_job_path / "movies.star")
-            star_doc = cif.read_file(gemmi_readable_path)
+            star_doc = read_star_file(import_job_path / "movies.star")
             for index, block in enumerate(star_doc):
                 if list(block.find_loop("_rlnMicrographMovieName")):
                     block_index = index
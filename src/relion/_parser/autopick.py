@@ -5,6 +5,7 @@ import pathlib
 from collections import namedtuple
 
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
 
 logger = logging.getLogger("relion._parser.autopick")
 
@@ -21,6 +22,10 @@ ParticlePickerInfo = namedtuple(
     ],
 )
 
+particle_picker_dtypes = {
+    "number_of_particles": int,
+}
+
 ParticleCacheRecord = namedtuple(
     "ParticleCacheRecord",
     [
@@ -31,9 +36,11 @@ ParticleCacheRecord = namedtuple(
 
 
 class AutoPick(JobType):
-    def __init__(self, path, particle_cache=None):
-        super().__init__(path)
-        self._particle_cache = particle_cache or {}
+    def __init__(self, path, particle_cache=None, file_cache=None, snapshot=None):
+        super().__init__(path, snapshot=snapshot)
+        self._particle_cache = {} if particle_cache is None else particle_cache
+        # optional PersistentFileCache holding coordinates between processes
+        self._file_cache = file_cache
 
     def __eq__(self, other):
         if isinstance(other, AutoPick):  # check this
@@ -60,10 +67,16 @@ class AutoPick(JobType):
             logger.debug(f"_rlnGroupNrParticles not found in file {file}")
             return []
 
-        all_particles = self.parse_star_file("_rlnGroupNrParticles", file, info_table)
+        summary = self.parse_star_columns(
+            file,
+            info_table,
+            ["_rlnGroupNrParticles", "_rlnMicrographName"],
+            dtypes={"_rlnGroupNrParticles": int},
+        )
+        all_particles = summary["_rlnGroupNrParticles"]
         # num_particles = sum([int(n) for n in all_particles])
 
-        mc_micrographs = self.parse_star_file("_rlnMicrographName", file, info_table)
+        mc_micrographs = summary["_rlnMicrographName"]
 
         first_mc_micrograph = mc_micrographs[0]
 
@@ -90,7 +103,11 @@ class AutoPick(JobType):
                 )
             )
 
-        return particle_picker_info
+        if self._file_cache is not None:
+            self._file_cache.commit()
+        return ResultFrame.from_rows(
+            ParticlePickerInfo, particle_picker_info, particle_picker_dtypes
+        )
 
     def _get_particle_info(self, jobdir, micrograph):
         particle_data = []
@@ -106,7 +123,9 @@ class AutoPick(JobType):
                 try:
                     if (
                         self._particle_cache[jobdir][micrograph].file_size
-                        == (self._basepath / jobdir / particle_star_file).stat().st_size
+                        == self._stat(
+                            self._basepath / jobdir / particle_star_file
+                        ).st_size
                     ):
                         return self._particle_cache[jobdir][micrograph].data
                 except FileNotFoundError:
@@ -117,6 +136,19 @@ class AutoPick(JobType):
                     return []
         else:
             self._particle_cache[jobdir] = {}
+        if self._file_cache is not None:
+            file_cache_key = f"{self._basepath.name}/{jobdir}/{particle_star_file}"
+            try:
+                particle_stat = self._stat(self._basepath / jobdir / particle_star_file)
+            except FileNotFoundError:
+                return particle_data
+            stored = self._file_cache.get("particles", file_cache_key, particle_stat)
+            if stored is not None:
+                particle_data = [tuple(coords) for coords in stored]
+                self._particle_cache[jobdir][micrograph] = ParticleCacheRecord(
+                    particle_data, particle_stat.st_size
+                )
+                return particle_data
         try:
             particle_star = self._read_star_file(jobdir, particle_star_file)
         except (FileNotFoundError, RuntimeError, ValueError):
@@ -132,17 +164,23 @@ class AutoPick(JobType):
                 f"_rlnMicrographFrameNumber not found in file {particle_star_file}"
             )
             return particle_data
-        xs = self.parse_star_file("_rlnCoordinateX", particle_star, info_table)
-        ys = self.parse_star_file("_rlnCoordinateY", particle_star, info_table)
-        for x, y in zip(xs, ys):
-            particle_data.append((x, y))
+        coordinates = self.parse_star_columns(
+            particle_star, info_table, ["_rlnCoordinateX", "_rlnCoordinateY"]
+        )
+        particle_data.extend(
+            zip(coordinates["_rlnCoordinateX"], coordinates["_rlnCoordinateY"])
+        )
         try:
             self._particle_cache[jobdir][micrograph] = ParticleCacheRecord(
                 particle_data,
-                (self._basepath / jobdir / particle_star_file).stat().st_size,
+                self._stat(self._basepath / jobdir / particle_star_file).st_size,
             )
         except FileNotFoundError:
             return []
+        if self._file_cache is not None:
+            self._file_cache.put(
+                "particles", file_cache_key, particle_stat, particle_data
+            )
         return particle_data
 
     @staticmethod
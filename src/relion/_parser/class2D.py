@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import logging
-import pathlib
-from collections import Counter, namedtuple
+from collections import namedtuple
 from operator import attrgetter
 
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
+from relion._parser.starcount import count_star_column
 
 logger = logging.getLogger("relion._parser.class2D")
 
@@ -39,6 +40,22 @@ Class2DParticleClass.overall_fourier_completeness.__doc__ = (
 )
 Class2DParticleClass.job.__doc__ = "Job number of the Class2D job."
 
+class2d_model_dtypes = {
+    "_rlnClassDistribution": float,
+    "_rlnAccuracyRotations": float,
+    "_rlnAccuracyTranslationsAngst": float,
+    "_rlnEstimatedResolution": float,
+    "_rlnOverallFourierCompleteness": float,
+}
+
+class2d_particle_class_dtypes = {
+    "class_distribution": float,
+    "accuracy_rotations": float,
+    "accuracy_translations_angst": float,
+    "estimated_resolution": float,
+    "overall_fourier_completeness": float,
+}
+
 
 class Class2D(JobType):
     def __eq__(self, other):
@@ -67,8 +84,10 @@ class Class2D(JobType):
             return []
 
         try:
-            sdfile = self._read_star_file(jobdir, dfile)
             smfile = self._read_star_file(jobdir, mfile)
+            class_counts = count_star_column(
+                self._basepath / jobdir / dfile, "_rlnClassNumber"
+            )
         except (FileNotFoundError, OSError, RuntimeError, ValueError):
             logger.debug(
                 "gemmi could not open file while trying to get data and model files. Returning an empty list",
@@ -81,26 +100,22 @@ class Class2D(JobType):
             logger.debug(f"_rlnClassDistribution not found in file {mfile}")
             return []
 
-        class_distribution = self.parse_star_file(
-            "_rlnClassDistribution", smfile, info_table
-        )
-        accuracy_rotations = self.parse_star_file(
-            "_rlnAccuracyRotations", smfile, info_table
+        model_columns = self.parse_star_columns(
+            smfile,
+            info_table,
+            [
+                "_rlnReferenceImage",
+                "_rlnClassDistribution",
+                "_rlnAccuracyRotations",
+                "_rlnAccuracyTranslationsAngst",
+                "_rlnEstimatedResolution",
+                "_rlnOverallFourierCompleteness",
+            ],
+            dtypes=class2d_model_dtypes,
         )
-        accuracy_translations_angst = self.parse_star_file(
-            "_rlnAccuracyTranslationsAngst", smfile, info_table
-        )
-        estimated_resolution = self.parse_star_file(
-            "_rlnEstimatedResolution", smfile, info_table
-        )
-        overall_fourier_completeness = self.parse_star_file(
-            "_rlnOverallFourierCompleteness", smfile, info_table
-        )
-        reference_image = self.parse_star_file("_rlnReferenceImage", smfile, info_table)
+        reference_image = model_columns["_rlnReferenceImage"]
 
-        class_numbers = self.parse_star_file("_rlnClassNumber", sdfile, info_table)
-        particle_sum = self._sum_all_particles(class_numbers)
-        int_particle_sum = [(int(name), value) for name, value in particle_sum.items()]
+        int_particle_sum = list(class_counts.items())
         # something probably went wrong with file reading if this is the case
         # return empty list and hope to recover later
         if not int_particle_sum:
@@ -120,58 +135,38 @@ class Class2D(JobType):
                 f"Number of reference images did not match number of classes for {jobdir}"
             )
 
-        particle_class_list = []
-
-        try:
-            for j in range(len(reference_image)):
-                particle_class_list.append(
-                    Class2DParticleClass(
-                        checked_particle_list[j],
-                        str(self._basepath.parent / reference_image[j].split("@")[1]),
-                        float(class_distribution[j]),
-                        accuracy_rotations[j],
-                        accuracy_translations_angst[j],
-                        estimated_resolution[j],
-                        overall_fourier_completeness[j],
-                        jobdir,
-                    )
-                )
-        except IndexError:
+        reference_paths = []
+        for image in reference_image[: len(checked_particle_list)]:
+            try:
+                reference_paths.append(str(self._basepath.parent / image.split("@")[1]))
+            except IndexError:
+                break
+        num_classes = min(len(reference_paths), *map(len, model_columns.values()))
+        if num_classes < len(reference_image):
             logger.debug(
                 "An IndexError was encountered while collecting 2D classification data: there was possibly a mismatch between data from different files"
             )
-        return particle_class_list
-
-    def _final_data_and_model(self, job_path):
-        number_list = [
-            entry.stem[6:9]
-            for entry in (self._basepath / job_path).glob("run_it*.star")
-        ]
-        last_iteration_number = max(
-            (int(n) for n in number_list if n.isnumeric()), default=0
+        model_columns = {
+            column: values[:num_classes] for column, values in model_columns.items()
+        }
+        return ResultFrame(
+            Class2DParticleClass,
+            {
+                "particle_sum": checked_particle_list[:num_classes],
+                "reference_image": reference_paths[:num_classes],
+                "class_distribution": model_columns["_rlnClassDistribution"],
+                "accuracy_rotations": model_columns["_rlnAccuracyRotations"],
+                "accuracy_translations_angst": model_columns[
+                    "_rlnAccuracyTranslationsAngst"
+                ],
+                "estimated_resolution": model_columns["_rlnEstimatedResolution"],
+                "overall_fourier_completeness": model_columns[
+                    "_rlnOverallFourierCompleteness"
+                ],
+                "job": [jobdir] * num_classes,
+            },
+            class2d_particle_class_dtypes,
         )
-        if not last_iteration_number:
-            raise ValueError(f"No result files found in {job_path}")
-        data_file = f"run_it{last_iteration_number:03d}_data.star"
-        model_file = f"run_it{last_iteration_number:03d}_model.star"
-        for check_file in (
-            self._basepath / job_path / data_file,
-            self._basepath / job_path / model_file,
-        ):
-            if not check_file.exists():
-                raise ValueError(f"File {check_file} missing from job directory")
-        return data_file, model_file
-
-    def _count_all(self, list):
-        count = Counter(list)
-        return count
-
-    def _sum_all_particles(self, list):
-        counted = self._count_all(
-            list
-        )  # This sorts them into classes and the number of associated particles before summing them all
-        return counted
-        # return sum(counted.values())
 
     def _class_checker(
         self, tuple_list, length
@@ -198,15 +193,14 @@ class Class2D(JobType):
             return_dict[item] = temp_list
         return return_dict
 
-    @staticmethod
-    def db_unpack(particle_class):
+    def db_unpack(self, particle_class):
         def _get_img_mod_time(img):
             if not img:
                 return None
-            imgpath = pathlib.Path(img)
-            if not imgpath.exists():
+            try:
+                return self._stat(img).st_mtime
+            except FileNotFoundError:
                 return None
-            return imgpath.stat().st_mtime
 
         res = [
             {
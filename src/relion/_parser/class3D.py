@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import pathlib
-from collections import Counter, namedtuple
+from collections import namedtuple
 
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
+from relion._parser.starcount import count_star_column
 
 logger = logging.getLogger("relion._parser.class3D")
 
@@ -42,6 +44,22 @@ Class3DParticleClass.initial_model_num_particles.__doc__ = (
 )
 Class3DParticleClass.job.__doc__ = "Job number of the Class3D job."
 
+class3d_model_dtypes = {
+    "_rlnClassDistribution": float,
+    "_rlnAccuracyRotations": float,
+    "_rlnAccuracyTranslationsAngst": float,
+    "_rlnEstimatedResolution": float,
+    "_rlnOverallFourierCompleteness": float,
+}
+
+class3d_particle_class_dtypes = {
+    "class_distribution": float,
+    "accuracy_rotations": float,
+    "accuracy_translations_angst": float,
+    "estimated_resolution": float,
+    "overall_fourier_completeness": float,
+}
+
 
 class Class3D(JobType):
     def __eq__(self, other):
@@ -75,8 +93,10 @@ class Class3D(JobType):
             return []
 
         try:
-            sdfile = self._read_star_file(jobdir, dfile)
             smfile = self._read_star_file(jobdir, mfile)
+            class_counts = count_star_column(
+                self._basepath / jobdir / dfile, "_rlnClassNumber"
+            )
         except (FileNotFoundError, OSError, RuntimeError, ValueError):
             logger.debug(
                 "gemmi could not open file while trying to get data and model files. Returning an empty list",
@@ -89,26 +109,22 @@ class Class3D(JobType):
             logger.debug(f"_rlnClassDistribution not found in file {mfile}")
             return []
 
-        class_distribution = self.parse_star_file(
-            "_rlnClassDistribution", smfile, info_table
-        )
-        accuracy_rotations = self.parse_star_file(
-            "_rlnAccuracyRotations", smfile, info_table
-        )
-        accuracy_translations_angst = self.parse_star_file(
-            "_rlnAccuracyTranslationsAngst", smfile, info_table
-        )
-        estimated_resolution = self.parse_star_file(
-            "_rlnEstimatedResolution", smfile, info_table
+        model_columns = self.parse_star_columns(
+            smfile,
+            info_table,
+            [
+                "_rlnReferenceImage",
+                "_rlnClassDistribution",
+                "_rlnAccuracyRotations",
+                "_rlnAccuracyTranslationsAngst",
+                "_rlnEstimatedResolution",
+                "_rlnOverallFourierCompleteness",
+            ],
+            dtypes=class3d_model_dtypes,
         )
-        overall_fourier_completeness = self.parse_star_file(
-            "_rlnOverallFourierCompleteness", smfile, info_table
-        )
-        reference_image = self.parse_star_file("_rlnReferenceImage", smfile, info_table)
+        reference_image = model_columns["_rlnReferenceImage"]
 
-        class_numbers = self.parse_star_file("_rlnClassNumber", sdfile, info_table)
-        particle_sum = self._sum_all_particles(class_numbers)
-        int_particle_sum = [(int(name), value) for name, value in particle_sum.items()]
+        int_particle_sum = list(class_counts.items())
         # something probably went wrong with file reading if this is the case
         # return empty list and hope to recover later
         if len(int_particle_sum) == 0:
@@ -136,44 +152,50 @@ class Class3D(JobType):
                 f"Number of reference images did not match number of classes for {jobdir}"
             )
 
-        particle_class_list = []
-        try:
-            for j in range(len(reference_image)):
-                particle_class_list.append(
-                    Class3DParticleClass(
-                        checked_particle_list[j],
-                        reference_image[j],
-                        float(class_distribution[j]),
-                        accuracy_rotations[j],
-                        accuracy_translations_angst[j],
-                        estimated_resolution[j],
-                        overall_fourier_completeness[j],
-                        init_nodel_num_particles,
-                        jobdir,
-                    )
-                )
-        except IndexError:
+        num_classes = min(
+            len(reference_image),
+            len(checked_particle_list),
+            *map(len, model_columns.values()),
+        )
+        if num_classes < len(reference_image):
             logger.debug(
                 "An IndexError was encountered while collecting 3D classification data: there was possibly a mismatch between data from different files"
             )
-        return particle_class_list
+        model_columns = {
+            column: values[:num_classes] for column, values in model_columns.items()
+        }
+        return ResultFrame(
+            Class3DParticleClass,
+            {
+                "particle_sum": checked_particle_list[:num_classes],
+                "reference_image": model_columns["_rlnReferenceImage"],
+                "class_distribution": model_columns["_rlnClassDistribution"],
+                "accuracy_rotations": model_columns["_rlnAccuracyRotations"],
+                "accuracy_translations_angst": model_columns[
+                    "_rlnAccuracyTranslationsAngst"
+                ],
+                "estimated_resolution": model_columns["_rlnEstimatedResolution"],
+                "overall_fourier_completeness": model_columns[
+                    "_rlnOverallFourierCompleteness"
+                ],
+                "initial_model_num_particles": [init_nodel_num_particles] * num_classes,
+                "job": [jobdir] * num_classes,
+            },
+            class3d_particle_class_dtypes,
+        )
 
     def _get_init_model_num_particles(self, jobdir, param_file_name):
         paramfile = self._read_star_file(jobdir, param_file_name)
         info_table = self._find_table_from_column_name(
             "_rlnJobOptionVariable", paramfile
         )
-        variables = [
-            p.strip("'")
-            for p in self.parse_star_file(
-                "_rlnJobOptionVariable", paramfile, info_table
-            )
-        ]
+        job_options = self.parse_star_columns(
+            paramfile, info_table, ["_rlnJobOptionVariable", "_rlnJobOptionValue"]
+        )
+        variables = [p.strip("'") for p in job_options["_rlnJobOptionVariable"]]
         ini_model_index = variables.index("fn_ref")
         ini_model_path = pathlib.Path(
-            self.parse_star_file("_rlnJobOptionValue", paramfile, info_table)[
-                ini_model_index
-            ].strip("'")
+            job_options["_rlnJobOptionValue"][ini_model_index].strip("'")
         )
         # this string maniuplation is bad, I'm sorry
         model_file_class_split = str(ini_model_path.name).split("_")
@@ -198,40 +220,12 @@ class Class3D(JobType):
             )
             .replace("mrc", "star")
         )
-        model_info_file = self._read_star_file_from_proj_dir(
-            ini_model_path.parent, model_info_name
-        )
-        info_table = self._find_table_from_column_name(
-            "_rlnClassNumber", model_info_file
-        )
-        # this str(int()) thing strips the 0s off of model_file_class
-        # should be faster than converting everything in num_particles_in_class to int
-        # there's probably a better way
-        num_particles_in_class = self.parse_star_file(
-            "_rlnClassNumber", model_info_file, info_table
-        ).count(str(int(model_file_class)))
+        num_particles_in_class = count_star_column(
+            self._basepath.parent / ini_model_path.parent / model_info_name,
+            "_rlnClassNumber",
+        )[int(model_file_class)]
         return num_particles_in_class
 
-    def _final_data_and_model(self, job_path):
-        number_list = [
-            entry.stem[6:9]
-            for entry in (self._basepath / job_path).glob("run_it*.star")
-        ]
-        last_iteration_number = max(
-            (int(n) for n in number_list if n.isnumeric()), default=0
-        )
-        if not last_iteration_number:
-            raise ValueError(f"No result files found in {job_path}")
-        data_file = f"run_it{last_iteration_number:03d}_data.star"
-        model_file = f"run_it{last_iteration_number:03d}_model.star"
-        for check_file in (
-            self._basepath / job_path / data_file,
-            self._basepath / job_path / model_file,
-        ):
-            if not check_file.exists():
-                raise ValueError(f"File {check_file} missing from job directory")
-        return data_file, model_file
-
     def _class_checker(
         self, tuple_list, length
     ):  # Makes sure every class has a number of associated particles
@@ -247,14 +241,6 @@ class Class3D(JobType):
                 # print("No values found for class", i)
         return tuple_list
 
-    def _count_all(self, list):
-        count = Counter(list)
-        return count
-
-    def _sum_all_particles(self, list):
-        counted = self._count_all(list)
-        return counted
-
     @staticmethod
     def db_unpack(particle_class):
         res = [
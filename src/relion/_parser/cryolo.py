@@ -4,16 +4,30 @@ import logging
 import pathlib
 from typing import List
 
-from relion._parser.autopick import ParticleCacheRecord, ParticlePickerInfo
+from relion._parser.autopick import (
+    ParticleCacheRecord,
+    ParticlePickerInfo,
+    particle_picker_dtypes,
+)
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
 
 logger = logging.getLogger("relion._parser.cryolo")
 
 
 class Cryolo(JobType):
-    def __init__(self, path, particle_cache=None, seen_star_files=None):
-        super().__init__(path)
-        self._particle_cache = particle_cache or {}
+    def __init__(
+        self,
+        path,
+        particle_cache=None,
+        seen_star_files=None,
+        file_cache=None,
+        snapshot=None,
+    ):
+        super().__init__(path, snapshot=snapshot)
+        self._particle_cache = {} if particle_cache is None else particle_cache
+        # optional PersistentFileCache holding coordinates between processes
+        self._file_cache = file_cache
 
     def __eq__(self, other):
         if isinstance(other, Cryolo):  # check this
@@ -44,8 +58,8 @@ class Cryolo(JobType):
         particles_per_micrograph = {}
         first_mic = ""
         coords = {}
-        for star_file in (self._basepath / jobdir / star_location).glob("**/*"):
-            if star_file.is_file() and "gain" not in str(star_file):
+        for star_file in self._files(self._basepath / jobdir / star_location):
+            if "gain" not in str(star_file):
                 part_coords = self._get_particle_info(jobdir, star_file)
                 if part_coords:
                     coords[star_file] = part_coords
@@ -63,12 +77,12 @@ class Cryolo(JobType):
         if info_table is None:
             logger.debug(f"_rlnJobOptionVariable not found in file {jobfile}")
             return []
-        variables = self.parse_star_file("_rlnJobOptionVariable", jobfile, info_table)
-        inmicindex = variables.index(input_tag)
+        job_options = self.parse_star_columns(
+            jobfile, info_table, ["_rlnJobOptionVariable", "_rlnJobOptionValue"]
+        )
+        inmicindex = job_options["_rlnJobOptionVariable"].index(input_tag)
         ctffilename = pathlib.Path(
-            self.parse_star_file("_rlnJobOptionValue", jobfile, info_table)[
-                inmicindex
-            ].replace("'", "")
+            job_options["_rlnJobOptionValue"][inmicindex].replace("'", "")
         )
         ctffile = self._read_star_file_from_proj_dir(
             ctffilename.parts[0], ctffilename.relative_to(ctffilename.parts[0])
@@ -77,9 +91,9 @@ class Cryolo(JobType):
         if info_table is None:
             logger.debug(f"_rlnMicrographName not found in file {ctffile}")
             return []
-        micrograph_names = self.parse_star_file(
-            "_rlnMicrographName", ctffile, info_table
-        )
+        micrograph_names = self.parse_star_columns(
+            ctffile, info_table, ["_rlnMicrographName"]
+        )["_rlnMicrographName"]
         indexed_micrograph_names = {
             pathlib.Path(mn).stem: mn for mn in micrograph_names
         }
@@ -107,7 +121,11 @@ class Cryolo(JobType):
                 )
             )
 
-        return particle_picker_info
+        if self._file_cache is not None:
+            self._file_cache.commit()
+        return ResultFrame.from_rows(
+            ParticlePickerInfo, particle_picker_info, particle_picker_dtypes
+        )
 
     def _get_highlighted_mircograph(
         self, jobdir: str, mc_mic_name: str, mic_parts: List[str]
@@ -127,7 +145,7 @@ class Cryolo(JobType):
             try:
                 if (
                     self._particle_cache[jobdir][star_file].file_size
-                    == star_file.stat().st_size
+                    == self._stat(star_file).st_size
                 ):
                     return self._particle_cache[jobdir][star_file].data
             except FileNotFoundError:
@@ -136,6 +154,19 @@ class Cryolo(JobType):
                     exc_info=True,
                 )
                 return []
+        if self._file_cache is not None:
+            file_cache_key = str(star_file.relative_to(self._basepath.parent))
+            try:
+                particle_stat = self._stat(star_file)
+            except FileNotFoundError:
+                return []
+            stored = self._file_cache.get("particles", file_cache_key, particle_stat)
+            if stored is not None:
+                coords = [tuple(c) for c in stored]
+                self._particle_cache[jobdir][star_file] = ParticleCacheRecord(
+                    coords, particle_stat.st_size
+                )
+                return coords
 
         try:
             file = self._read_star_file(
@@ -149,16 +180,21 @@ class Cryolo(JobType):
             logger.debug(f"_rlnCoordinateX not found in file {file}")
             return []
 
-        all_particles = self.parse_star_file("_rlnCoordinateX", file, info_table)
-        ys = self.parse_star_file("_rlnCoordinateY", file, info_table)
-        coords = [(x, y) for x, y in zip(all_particles, ys)]
+        coordinates = self.parse_star_columns(
+            file, info_table, ["_rlnCoordinateX", "_rlnCoordinateY"]
+        )
+        coords = list(
+            zip(coordinates["_rlnCoordinateX"], coordinates["_rlnCoordinateY"])
+        )
         try:
             self._particle_cache[jobdir][star_file] = ParticleCacheRecord(
                 coords,
-                star_file.stat().st_size,
+                self._stat(star_file).st_size,
             )
         except FileNotFoundError:
             return []
+        if self._file_cache is not None:
+            self._file_cache.put("particles", file_cache_key, particle_stat, coords)
         return coords
 
     def _get_micrograph_name(self, micrograph, micrograph_names):
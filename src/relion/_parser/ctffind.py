@@ -4,6 +4,8 @@ import logging
 from collections import namedtuple
 
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
+from relion._parser.starloop import AppendedStarLoop, StarLoopCacheRecord
 
 logger = logging.getLogger("relion._parser.ctffind")
 
@@ -42,8 +44,25 @@ CTFMicrograph.diagnostic_plot_path.__doc__ = (
     "Path to the CTF diagnostic (fit/data comparison) plot (jpeg)."
 )
 
+ctf_micrograph_dtypes = {
+    "astigmatism": float,
+    "defocus_u": float,
+    "defocus_v": float,
+    "defocus_angle": float,
+    "max_resolution": float,
+    "fig_of_merit": float,
+    "amp_contrast": float,
+}
+
 
 class CTFFind(JobType):
+    def __init__(self, path, star_loop_cache=None, snapshot=None):
+        super().__init__(path, snapshot=snapshot)
+        if star_loop_cache is None:
+            self._star_loop_cache = {}
+        else:
+            self._star_loop_cache = star_loop_cache
+
     def __eq__(self, other):
         if isinstance(other, CTFFind):  # check this
             return self._basepath == other._basepath
@@ -64,50 +83,68 @@ class CTFFind(JobType):
         return jobs
 
     def _load_job_directory(self, jobdir):
+        star_path = self._basepath / jobdir / "micrographs_ctf.star"
+        cached = self._star_loop_cache.get(star_path)
+        if cached is None:
+            cached = StarLoopCacheRecord(
+                AppendedStarLoop(star_path, "_rlnCtfAstigmatism"),
+                ResultFrame.from_rows(CTFMicrograph, [], ctf_micrograph_dtypes),
+            )
         try:
-            file = self._read_star_file(jobdir, "micrographs_ctf.star")
+            unchanged_rows = cached.loop.read()
         except (FileNotFoundError, OSError, RuntimeError, ValueError):
             return []
 
-        info_table = self._find_table_from_column_name("_rlnCtfAstigmatism", file)
-        if info_table is None:
+        info_table = cached.loop
+        if not len(info_table):
             return []
 
-        astigmatism = self.parse_star_file("_rlnCtfAstigmatism", file, info_table)
-        defocus_u = self.parse_star_file("_rlnDefocusU", file, info_table)
-        defocus_v = self.parse_star_file("_rlnDefocusV", file, info_table)
-        defocus_angle = self.parse_star_file("_rlnDefocusAngle", file, info_table)
-        max_resolution = self.parse_star_file("_rlnCtfMaxResolution", file, info_table)
-        fig_of_merit = self.parse_star_file("_rlnCtfFigureOfMerit", file, info_table)
-
-        micrograph_name = self.parse_star_file("_rlnMicrographName", file, info_table)
-        ctf_img_path = self.parse_star_file("_rlnCtfImage", file, info_table)
-
-        info_table = self._find_table_from_column_name("_rlnAmplitudeContrast", file)
-
-        amp_contrast = self.parse_star_file("_rlnAmplitudeContrast", file, info_table)
-
-        micrograph_list = []
-        for j in range(len(micrograph_name)):
-            plot_path = (
-                str(self._basepath.parent / ctf_img_path[j])
-                .split(":")[0]
-                .replace(".ctf", ".jpeg")
-            )
-            micrograph_list.append(
-                CTFMicrograph(
-                    micrograph_name[j],
-                    astigmatism[j],
-                    defocus_u[j],
-                    defocus_v[j],
-                    defocus_angle[j],
-                    max_resolution[j],
-                    fig_of_merit[j],
-                    amp_contrast[0],
-                    plot_path,
-                )
-            )
-        return micrograph_list
+        astigmatism = info_table["_rlnCtfAstigmatism"]
+        defocus_u = info_table["_rlnDefocusU"]
+        defocus_v = info_table["_rlnDefocusV"]
+        defocus_angle = info_table["_rlnDefocusAngle"]
+        max_resolution = info_table["_rlnCtfMaxResolution"]
+        fig_of_merit = info_table["_rlnCtfFigureOfMerit"]
+
+        micrograph_name = info_table["_rlnMicrographName"]
+        ctf_img_path = info_table["_rlnCtfImage"]
+
+        optics_table = self._find_table_from_column_name(
+            "_rlnAmplitudeContrast", info_table.preamble
+        )
+        if optics_table is not None:
+            amp_contrast = self.parse_star_columns(
+                info_table.preamble, optics_table, ["_rlnAmplitudeContrast"]
+            )["_rlnAmplitudeContrast"]
+        else:
+            amp_contrast = info_table["_rlnAmplitudeContrast"]
+
+        previous = cached.results[:unchanged_rows]
+        new_rows = slice(len(previous), None)
+        micrographs = ResultFrame(
+            CTFMicrograph,
+            {
+                "micrograph_name": micrograph_name[new_rows],
+                "astigmatism": astigmatism[new_rows],
+                "defocus_u": defocus_u[new_rows],
+                "defocus_v": defocus_v[new_rows],
+                "defocus_angle": defocus_angle[new_rows],
+                "max_resolution": max_resolution[new_rows],
+                "fig_of_merit": fig_of_merit[new_rows],
+                "amp_contrast": [amp_contrast[0]]
+                * (len(micrograph_name) - len(previous)),
+                "diagnostic_plot_path": [
+                    str(self._basepath.parent / img_path)
+                    .split(":")[0]
+                    .replace(".ctf", ".jpeg")
+                    for img_path in ctf_img_path[new_rows]
+                ],
+            },
+            ctf_micrograph_dtypes,
+        )
+        micrographs = previous + micrographs
+        self._star_loop_cache[star_path] = StarLoopCacheRecord(cached.loop, micrographs)
+        return micrographs
 
     @staticmethod
     def for_cache(ctfmicrograph):
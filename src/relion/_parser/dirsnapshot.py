@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import pathlib
+import threading
+
+logger = logging.getLogger("relion._parser.dirsnapshot")
+
+
+class DirectorySnapshot:
+    """
+    Point in time view of the directories of a project, used in place of
+    separate stat, exists and glob calls on each file.
+
+    Each directory is listed with os.scandir the first time anything inside it
+    is asked for and the listing is kept for the life of the snapshot, so
+    checking whether files exist costs one scandir per directory and the stat
+    of an existing file is only made once. Files created after a directory was
+    listed are not seen until a new snapshot is taken.
+
+    stat() follows the conventions of os.stat, raising FileNotFoundError for
+    missing files, so it can be swapped in wherever os.stat is used.
+    """
+
+    def __init__(self):
+        self._listings = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+
+    def __repr__(self):
+        return "DirectorySnapshot()"
+
+    def __str__(self):
+        return f"<DirectorySnapshot of {len(self._listings)} directories>"
+
+    def _listing(self, directory: str) -> dict | None:
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(directory) as entries:
+                listing = {entry.name: entry for entry in entries}
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            listing = None
+        with self._lock:
+            self.scans += 1
+            return self._listings.setdefault(directory, listing)
+
+    def _entry(self, path) -> os.DirEntry | None:
+        directory, name = os.path.split(os.path.abspath(os.fspath(path)))
+        listing = self._listing(directory)
+        if listing is None:
+            return None
+        return listing.get(name)
+
+    def stat(self, path) -> os.stat_result:
+        entry = self._entry(path)
+        if entry is None:
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), os.fspath(path)
+            )
+        return entry.stat()
+
+    def exists(self, path) -> bool:
+        return self._entry(path) is not None
+
+    def is_file(self, path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry.is_file()
+
+    def is_dir(self, path, follow_symlinks: bool = True) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def iterdir(self, directory) -> list:
+        """The entries of directory in the order that os.scandir gave them"""
+        listing = self._listing(os.path.abspath(os.fspath(directory)))
+        if listing is None:
+            return []
+        return list(listing.values())
+
+    def files(self, directory) -> list:
+        """
+        Paths of all files below directory, recursing into subdirectories in the
+        same order as pathlib.Path.glob("**/*")
+        """
+        directory = pathlib.Path(directory)
+        found = []
+        subdirectories = []
+        for entry in self.iterdir(directory):
+            if entry.is_file():
+                found.append(directory / entry.name)
+            elif entry.is_dir():
+                subdirectories.append(directory / entry.name)
+        for subdirectory in subdirectories:
+            found.extend(self.files(subdirectory))
+        return found
@@ -4,6 +4,7 @@ import logging
 from collections import namedtuple
 
 from relion._parser.jobtype import JobType
+from relion._parser.starcount import count_star_column
 
 logger = logging.getLogger("relion._parser.initalmodel")
 
@@ -37,40 +38,19 @@ class InitialModel(JobType):
             return []
 
         try:
-            model_info_file = self._read_star_file(jobdir, model_info_name)
+            num_particles = count_star_column(
+                self._basepath / jobdir / model_info_name, "_rlnClassNumber"
+            )
         except (RuntimeError, FileNotFoundError, OSError):
             return []
-
-        info_table = self._find_table_from_column_name(
-            "_rlnClassNumber", model_info_file
-        )
-        if info_table is None:
-            logger.debug(f"_rlnClassNumber not found in file {model_info_file}")
+        if not num_particles:
+            logger.debug(f"_rlnClassNumber not found in file {model_info_name}")
             return []
 
-        num_particles = {}
-        class_numbers = self.parse_star_file(
-            "_rlnClassNumber", model_info_file, info_table
-        )
-        for n in class_numbers:
-            num_particles[int(n)] = num_particles.get(int(n), 0) + 1
-
-        return [InitialModelInfo(num_particles)]
+        return [InitialModelInfo(dict(num_particles))]
 
     def _final_data(self, job_path):
-        number_list = [
-            entry.stem[6:9]
-            for entry in (self._basepath / job_path).glob("run_it*.star")
-        ]
-        last_iteration_number = max(
-            (int(n) for n in number_list if n.isnumeric()), default=0
-        )
-        if not last_iteration_number:
-            raise ValueError(f"No result files found in {job_path}")
-        data_file = f"run_it{last_iteration_number:03d}_data.star"
-        for check_file in (self._basepath / job_path / data_file,):
-            if not check_file.exists():
-                raise ValueError(f"File {check_file} missing from job directory")
+        (data_file,) = self._final_iteration_files(job_path, ("data",))
         return data_file
 
     @staticmethod
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime
+import re
+
+# where Relion reports the submission of a cluster job
+_job_id = re.compile("with job ID")
+# the time printed before a submission, among the progress bar characters
+_submit_time = re.compile(r"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)\.")
+
+# the size of the pieces a run.out file is read in
+_chunk_size = 1 << 20
+
+
+class ClusterSubmissions:
+    """
+    The cluster jobs submitted by a Relion job, read from its run.out file:
+    their ids, the times they were submitted at and the number of micrographs
+    processed by each. Logs can be read in any number of goes, so a run.out
+    file that is still being written to can be followed.
+
+    A file is read in large pieces rather than line by line. Submissions are
+    found with a precompiled expression and micrographs are only counted in
+    the lines of pieces that mention any, so the progress bars that make up
+    most of a run.out file cost next to nothing.
+    """
+
+    def __init__(self, log=()):
+        self.cluster_ids = []
+        self.start_times = []
+        self._mic_counts = []
+        self.read(log)
+
+    def __repr__(self):
+        return f"ClusterSubmissions(<{len(self.cluster_ids)} submissions>)"
+
+    def __copy__(self) -> ClusterSubmissions:
+        """A copy that can read more of the log without changing this one"""
+        submissions = ClusterSubmissions.__new__(ClusterSubmissions)
+        submissions.cluster_ids = list(self.cluster_ids)
+        submissions.start_times = list(self.start_times)
+        submissions._mic_counts = list(self._mic_counts)
+        return submissions
+
+    def read(self, log):
+        """
+        Add the submissions in log, a text file object or lines, which follows
+        what was already read
+        """
+        if not hasattr(log, "read"):
+            self._read_text("".join(log))
+            return
+        partial = ""
+        for chunk in iter(lambda: log.read(_chunk_size), ""):
+            text = partial + chunk
+            end = text.rfind("\n") + 1
+            self._read_text(text[:end])
+            partial = text[end:]
+        self._read_text(partial)
+
+    def _read_text(self, text):
+        start = 0
+        for match in _job_id.finditer(text):
+            if match.start() < start:
+                # the submission line has been read already
+                continue
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.end()) + 1 or len(text)
+            self._count_mics(text, start, line_start)
+            self._submit(text[line_start:line_end])
+            self._count_mics(text, line_start, line_end)
+            start = line_end
+        self._count_mics(text, start, len(text))
+
+    def _submit(self, line):
+        self.cluster_ids.append(line.split()[-1])
+        self._mic_counts.append(0)
+        submitted = _submit_time.search(line)
+        if submitted:
+            self.start_times.append(
+                datetime.datetime(*(int(field) for field in submitted.groups()))
+            )
+        else:
+            self.start_times.append(_progress_bar_time(line))
+
+    def _count_mics(self, text, start, end):
+        if not self._mic_counts or start == end:
+            return
+        if (
+            text.find("*", start, end) == -1
+            and text.find("Filtering", start, end) == -1
+        ):
+            return
+        self._mic_counts[-1] += sum(
+            1
+            for line in text[start:end].split("\n")
+            if ("*" in line or "Filtering" in line)
+            and (".mrc" in line or ".tiff" in line)
+        )
+
+    @property
+    def mic_counts(self) -> list | None:
+        """
+        The number of micrographs processed by each submission, None if every
+        cluster id is numeric as those jobs do not report their micrographs
+        """
+        if all(cid.isnumeric() for cid in self.cluster_ids):
+            return None
+        return list(self._mic_counts)
+
+
+def _progress_bar_time(line) -> datetime.datetime:
+    # all of this is annoying stuff to deal with Relion writing its progress bar
+    # while the cluster info we're interested in is written on the same line of the
+    # output log
+    time_string = ":".join(line.split(":")[:3])
+    time_string = time_string.split(".")[-2]
+    for c in ("~", ",", "_", '"', ">", "(", ")", "[", "o", "]"):
+        time_string = time_string.replace(c, "")
+    time_string = " ".join(time_string.split(" ")[-2:])
+    return datetime.datetime.strptime(time_string, "%Y-%m-%d %H:%M:%S")
+
+
+class JobCommand:
+    """The command a Relion job was run with, read from its note.txt file."""
+
+    def __init__(self, lines=()):
+        self.command = None
+        self.read(lines)
+
+    def __repr__(self):
+        return f"JobCommand({self.command!r})"
+
+    def __copy__(self) -> JobCommand:
+        command = JobCommand.__new__(JobCommand)
+        command.command = self.command
+        return command
+
+    def read(self, lines):
+        """Take the command from lines, which follow those already read"""
+        for line in lines:
+            if "which" in line:
+                self.command = line.split()[1].replace("`", "")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import logging
+import os
+import pathlib
+import time
+from collections import namedtuple
+
+from relion._parser.jobtype import _mtime_resolution_ns
+
+logger = logging.getLogger("relion._parser.jobstatus")
+
+# the exit files Relion writes to a job directory, in the order they are
+# looked for, and the status each one gives the job
+_exit_files = (
+    ("RELION_JOB_EXIT_FAILURE", False),
+    ("RELION_JOB_EXIT_SUCCESS", True),
+    ("RELION_JOB_EXIT_ABORTED", False),
+)
+
+JobStatus = namedtuple(
+    "JobStatus",
+    [
+        "status",
+        "end_time_stamp",
+    ],
+)
+
+JobStatus.__doc__ = "State of a job given by the exit file in its directory."
+JobStatus.status.__doc__ = (
+    "True if the job succeeded, False if it failed or was aborted and None if it "
+    "has not finished."
+)
+JobStatus.end_time_stamp.__doc__ = (
+    "Modification time of the exit file as a datetime, None without one."
+)
+
+JobStatusCacheRecord = namedtuple(
+    "JobStatusCacheRecord",
+    [
+        "mtime_ns",
+        "listed_ns",
+        "job_status",
+    ],
+)
+
+JobStatusCacheRecord.__doc__ = "The status found in a job directory."
+JobStatusCacheRecord.mtime_ns.__doc__ = "mtime of the job directory when it was listed."
+JobStatusCacheRecord.listed_ns.__doc__ = "Time at which the job directory was listed."
+JobStatusCacheRecord.job_status.__doc__ = "JobStatus found in the job directory."
+
+_unfinished = JobStatus(None, None)
+
+
+class JobStatusScanner:
+    """
+    Finds the status of jobs from the exit files Relion writes to their
+    directories.
+
+    The directory of each job type is listed once, which gives the modification
+    time of every job directory in it. As writing or removing an exit file
+    changes the modification time of the job directory, a job directory is only
+    listed again once it has changed since the last scan, so the cost of a scan
+    of jobs that have finished does not depend on what else is in their
+    directories. The directories of different job types can be scanned
+    concurrently.
+    """
+
+    def __init__(self):
+        # JobStatusCacheRecords keyed by job directory
+        self._cache = {}
+        self.scans = 0
+
+    def __repr__(self):
+        return "JobStatusScanner()"
+
+    def __str__(self):
+        return f"<JobStatusScanner of {len(self._cache)} job directories>"
+
+    def scan(self, basepath, job_paths, snapshot=None, threads: int = 1) -> dict:
+        """
+        The JobStatus of each job, keyed by the paths of the jobs relative to
+        basepath as given in job_paths.
+
+        Keyword arguments:
+        snapshot -- DirectorySnapshot to list directories through (default None)
+        threads -- number of job type directories scanned at the same time
+        (default 1)
+        """
+        basepath = pathlib.Path(basepath)
+        by_jobtype = {}
+        for job_path in job_paths:
+            by_jobtype.setdefault(
+                basepath / pathlib.PurePosixPath(job_path).parent, []
+            ).append(job_path)
+        statuses = {}
+        if threads > 1 and len(by_jobtype) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                for found in pool.map(
+                    lambda jobtype: self._scan_jobtype(*jobtype, snapshot),
+                    by_jobtype.items(),
+                ):
+                    statuses.update(found)
+        else:
+            for jobtype_path, jobtype_jobs in by_jobtype.items():
+                statuses.update(
+                    self._scan_jobtype(jobtype_path, jobtype_jobs, snapshot)
+                )
+        return statuses
+
+    def _scan_jobtype(self, jobtype_path, job_paths, snapshot) -> dict:
+        entries = {entry.name: entry for entry in _list(jobtype_path, snapshot)}
+        statuses = {}
+        for job_path in job_paths:
+            entry = entries.get(pathlib.PurePosixPath(job_path).name)
+            try:
+                if entry is None or not entry.is_dir():
+                    statuses[job_path] = _unfinished
+                    continue
+                mtime_ns = entry.stat().st_mtime_ns
+            except FileNotFoundError:
+                statuses[job_path] = _unfinished
+                continue
+            statuses[job_path] = self._job_status(entry.path, mtime_ns, snapshot)
+        return statuses
+
+    def _job_status(self, job_directory, mtime_ns, snapshot) -> JobStatus:
+        record = self._cache.get(job_directory)
+        if (
+            record is not None
+            and record.mtime_ns == mtime_ns
+            and record.listed_ns - mtime_ns > _mtime_resolution_ns
+        ):
+            return record.job_status
+        listed_ns = time.time_ns()
+        self.scans += 1
+        entries = {entry.name: entry for entry in _list(job_directory, snapshot)}
+        job_status = _unfinished
+        for name, status in _exit_files:
+            if name not in entries:
+                continue
+            # Relion may remove an exit file between it being listed and its
+            # modification time being read
+            try:
+                end_time_stamp = datetime.datetime.fromtimestamp(
+                    entries[name].stat().st_mtime
+                )
+            except FileNotFoundError:
+                continue
+            job_status = JobStatus(status, end_time_stamp)
+            break
+        self._cache[job_directory] = JobStatusCacheRecord(
+            mtime_ns, listed_ns, job_status
+        )
+        return job_status
+
+
+def _list(directory, snapshot) -> list:
+    if snapshot is not None:
+        return snapshot.iterdir(directory)
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        logger.debug(f"Could not list {directory}")
+        return []
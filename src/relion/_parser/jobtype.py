@@ -1,9 +1,40 @@
 from __future__ import annotations
 
 import collections.abc
+import logging
 import os
+import time
+from collections import namedtuple
 
-from gemmi import cif
+import numpy as np
+
+from relion._parser.starcache import (
+    parse_star_file,
+    read_star_file,
+    star_schema,
+)
+
+logger = logging.getLogger("relion._parser.jobtype")
+
+# a directory listed less than this long after it was last modified may have
+# changed again without its mtime changing, so it is not trusted
+_mtime_resolution_ns = 1_000_000_000
+
+IterationCacheRecord = namedtuple(
+    "IterationCacheRecord",
+    [
+        "mtime_ns",
+        "listed_ns",
+        "iterations",
+    ],
+)
+
+IterationCacheRecord.__doc__ = "The iteration files found in a job directory."
+IterationCacheRecord.mtime_ns.__doc__ = "mtime of the job directory when it was listed."
+IterationCacheRecord.listed_ns.__doc__ = "Time at which the job directory was listed."
+IterationCacheRecord.iterations.__doc__ = (
+    "Iteration number to the set of run_itNNN_<kind>.star kinds present for it."
+)
 
 
 class JobType(collections.abc.Mapping):
@@ -15,9 +46,13 @@ class JobType(collections.abc.Mapping):
     def __hash__(self):
         return hash(("relion._parser.JobType", self._basepath))
 
-    def __init__(self, path):
+    def __init__(self, path, snapshot=None, iteration_cache=None):
         self._basepath = path
         self._jobcache = {}
+        # DirectorySnapshot taken by Project.load, used in place of stat calls
+        self._snapshot = snapshot
+        # IterationCacheRecords of job directories, kept between loads
+        self._iteration_cache = {} if iteration_cache is None else iteration_cache
 
     def __iter__(self):
         return iter(self.jobs)
@@ -33,6 +68,12 @@ class JobType(collections.abc.Mapping):
 
     @property
     def jobs(self):
+        if self._snapshot is not None and self._snapshot.is_dir(self._basepath):
+            return sorted(
+                entry.name
+                for entry in self._snapshot.iterdir(self._basepath)
+                if entry.is_dir(follow_symlinks=False)
+            )
         return sorted(
             d.name
             for d in self._basepath.iterdir()
@@ -44,7 +85,11 @@ class JobType(collections.abc.Mapping):
             raise KeyError(f"Invalid argument {key!r}, expected string")
         if key not in self._jobcache:
             job_path = self._basepath / key
-            if not job_path.is_dir():
+            if not (
+                job_path.is_dir()
+                if self._snapshot is None
+                else self._snapshot.is_dir(job_path)
+            ):
                 raise KeyError(
                     f"no job directory present for {key} in {self._basepath}"
                 )
@@ -59,25 +104,138 @@ class JobType(collections.abc.Mapping):
     def _load_job_directory(self, jobdir, **kwargs):
         raise NotImplementedError("Load job directory not implemented")
 
-    def _read_star_file(self, job_num, file_name):
+    def _stat(self, path):
+        if self._snapshot is None:
+            return os.stat(path)
+        return self._snapshot.stat(path)
+
+    def _files(self, directory):
+        """All files below directory, in the order of directory.glob("**/*")"""
+        if self._snapshot is None:
+            return [f for f in directory.glob("**/*") if f.is_file()]
+        return self._snapshot.files(directory)
+
+    def _iterations(self, jobdir) -> dict:
+        """
+        The iterations written to a job directory, only listing the directory
+        again once its mtime has changed.
+        """
+        job_path = self._basepath / jobdir
+        mtime_ns = self._stat(job_path).st_mtime_ns
+        record = self._iteration_cache.get(str(job_path))
+        if (
+            record is not None
+            and record.mtime_ns == mtime_ns
+            and record.listed_ns - mtime_ns > _mtime_resolution_ns
+        ):
+            return record.iterations
+        listed_ns = time.time_ns()
+        iterations = {}
+        with os.scandir(job_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("run_it") and entry.name.endswith(".star"):
+                    number = entry.name[6:9]
+                    if number.isnumeric():
+                        iterations.setdefault(int(number), set()).add(entry.name[10:-5])
+        self._iteration_cache[str(job_path)] = IterationCacheRecord(
+            mtime_ns, listed_ns, iterations
+        )
+        return iterations
+
+    def newest_complete_iteration(self, jobdir, kinds=("data", "model")):
+        """
+        The number of the last iteration of a job for which all of the
+        run_itNNN_<kind>.star files are present, or None if there is none.
+        """
+        iterations = self._iterations(jobdir)
+        return max(
+            (n for n, found in iterations.items() if n and found.issuperset(kinds)),
+            default=None,
+        )
+
+    def _final_iteration_files(self, jobdir, kinds) -> list:
+        try:
+            iterations = self._iterations(jobdir)
+        except FileNotFoundError:
+            raise ValueError(f"No result files found in {jobdir}")
+        last_iteration_number = max(iterations, default=0)
+        if not last_iteration_number:
+            raise ValueError(f"No result files found in {jobdir}")
+        final_files = []
+        for kind in kinds:
+            final_file = f"run_it{last_iteration_number:03d}_{kind}.star"
+            if kind not in iterations[last_iteration_number]:
+                raise ValueError(
+                    f"File {self._basepath / jobdir / final_file} missing from job directory"
+                )
+            final_files.append(final_file)
+        return final_files
+
+    def _final_data_and_model(self, job_path):
+        data_file, model_file = self._final_iteration_files(job_path, ("data", "model"))
+        return data_file, model_file
+
+    def _read_star_file(self, job_num, file_name, cached=True):
         full_path = self._basepath / job_num / file_name
-        gemmi_readable_path = os.fspath(full_path)
-        star_doc = cif.read_file(gemmi_readable_path)
+        if not cached:
+            return parse_star_file(full_path)
+        star_doc = read_star_file(full_path)
         return star_doc
 
     def _read_star_file_from_proj_dir(self, job_num, file_name):
         full_path = self._basepath.parent / job_num / file_name
-        gemmi_readable_path = os.fspath(full_path)
-        star_doc = cif.read_file(gemmi_readable_path)
+        star_doc = read_star_file(full_path)
         return star_doc
 
     def parse_star_file(self, loop_name, star_doc, block_number):
         data_block = star_doc[block_number]
-        values = data_block.find_loop(loop_name)
-        values_list = list(values)
-        if not values_list:
+        if not star_schema(star_doc).find(
+            loop_name, block=block_number % len(star_doc)
+        ):
             print("Warning - no values found for", loop_name)
-        return values_list
+            return []
+        values = data_block.find_loop(loop_name)
+        return list(values)
+
+    def parse_star_columns(
+        self, star_doc, block_number, columns, dtypes: dict | None = None
+    ) -> dict:
+        """
+        Read several columns of a block in one pass over each loop. Columns
+        with a dtype are returned as NumPy arrays of that type, all others as
+        lists of strings as parse_star_file would give them.
+        """
+        dtypes = dtypes or {}
+        data_block = star_doc[block_number]
+        block_number %= len(star_doc)
+        schema = star_schema(star_doc)
+        tables = {}
+        parsed = {}
+        for column in columns:
+            dtype = dtypes.get(column)
+            location = schema.find(column, block=block_number)
+            if location is None:
+                print("Warning - no values found for", column)
+                parsed[column] = [] if dtype is None else np.empty(0, dtype=dtype)
+                continue
+            if location.item not in tables:
+                loop = data_block.find_loop(column).get_loop()
+                tables[location.item] = np.array(loop.values, dtype=object).reshape(
+                    location.rows, -1
+                )
+            values = tables[location.item][:, location.column]
+            if dtype is None:
+                parsed[column] = values.tolist()
+                continue
+            try:
+                parsed[column] = values.astype(dtype)
+            except (TypeError, ValueError):
+                logger.debug(
+                    f"Could not convert {column} to {np.dtype(dtype)}, keeping the values as strings",
+                    exc_info=True,
+                )
+                parsed[column] = values.tolist()
+        return parsed
 
     def parse_star_file_pair(self, key, star_doc, block_number):
         data_block = star_doc[block_number]
@@ -86,10 +244,7 @@ class JobType(collections.abc.Mapping):
 
     @staticmethod
     def _find_table_from_column_name(cname, star_doc):
-        for block_index, block in enumerate(star_doc):
-            if list(block.find_loop(cname)):
-                return block_index
-        return None
+        return star_schema(star_doc).block_index(cname)
 
     @staticmethod
     def for_cache(element):
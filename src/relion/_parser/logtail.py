@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import copy
+import io
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from relion._parser.jobtype import _mtime_resolution_ns
+
+logger = logging.getLogger("relion._parser.logtail")
+
+# the number of bytes from the start of a log kept to tell whether a file is
+# still the one that was read before
+_head_size = 64
+
+LogTailRecord = namedtuple(
+    "LogTailRecord",
+    [
+        "device",
+        "inode",
+        "size",
+        "mtime_ns",
+        "read_ns",
+        "offset",
+        "head",
+        "state",
+        "result",
+    ],
+)
+
+LogTailRecord.__doc__ = "How far a log file has been read and what was read from it."
+LogTailRecord.device.__doc__ = "Device of the log file when it was read."
+LogTailRecord.inode.__doc__ = "Inode of the log file when it was read."
+LogTailRecord.size.__doc__ = "Size of the log file when it was read."
+LogTailRecord.mtime_ns.__doc__ = "mtime of the log file when it was read."
+LogTailRecord.read_ns.__doc__ = "Time at which the log file was read."
+LogTailRecord.offset.__doc__ = "Byte offset of the end of the last complete line read."
+LogTailRecord.head.__doc__ = "The first bytes of the log file."
+LogTailRecord.state.__doc__ = "Parse state of the complete lines up to offset."
+LogTailRecord.result.__doc__ = (
+    "Parse state of the whole file, last partial line included."
+)
+
+
+class LogTailReader:
+    """
+    Follows log files that are appended to, such as the run.out and note.txt
+    files of jobs and the pipeline*.log files of schedules, so that each byte
+    of a log is only parsed once however often it is read.
+
+    A log is parsed into a state object, made by calling new_state, which has a
+    read(lines) method taking the lines that follow those it has already read.
+    The byte offset of the end of the last complete line is kept with the state
+    and the next read only parses the bytes appended after it. A log that has
+    been replaced, because its inode changed, it is shorter than the offset or
+    its first bytes differ, is parsed again from the start.
+
+    The last line of a log is often still being written, so it is read into a
+    copy of the state which is returned, and read again once it is complete.
+    The state returned must not be changed and holds until the next read of
+    the same log. A state class can define __copy__ to copy only what reading
+    one more line could change, otherwise the state is deep copied.
+    """
+
+    def __init__(self):
+        # LogTailRecords keyed by path
+        self._records = {}
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+
+    def __repr__(self):
+        return "LogTailReader()"
+
+    def __str__(self):
+        return f"<LogTailReader of {len(self._records)} logs>"
+
+    def read(self, path, new_state):
+        """
+        The parse state of the log file at path, None if there is no such
+        file.
+        """
+        path = os.fspath(path)
+        record = self._records.get(path)
+        try:
+            with open(path, "rb") as log:
+                stat = os.fstat(log.fileno())
+                if (
+                    record is not None
+                    and (record.device, record.inode) == (stat.st_dev, stat.st_ino)
+                    and (record.size, record.mtime_ns)
+                    == (stat.st_size, stat.st_mtime_ns)
+                    and record.read_ns - stat.st_mtime_ns > _mtime_resolution_ns
+                ):
+                    return record.result
+                read_ns = time.time_ns()
+                if record is not None and _continues(record, log, stat):
+                    state, offset, head = record.state, record.offset, record.head
+                else:
+                    if record is not None:
+                        logger.debug(f"{path} was replaced, reading it again")
+                    state, offset, head = new_state(), 0, b""
+                log.seek(offset)
+                data = log.read()
+        except (FileNotFoundError, IsADirectoryError):
+            with self._lock:
+                self._records.pop(path, None)
+            return None
+        end = data.rfind(b"\n") + 1
+        state.read(_lines(data[:end]))
+        if len(head) < _head_size:
+            head = (head + data[:end])[:_head_size]
+        if end < len(data):
+            result = _provisional_copy(state)
+            result.read(_lines(data[end:]))
+        else:
+            result = state
+        with self._lock:
+            self.bytes_read += len(data)
+            self._records[path] = LogTailRecord(
+                stat.st_dev,
+                stat.st_ino,
+                stat.st_size,
+                stat.st_mtime_ns,
+                read_ns,
+                offset + end,
+                head,
+                state,
+                result,
+            )
+        return result
+
+
+def _continues(record, log, stat) -> bool:
+    if (record.device, record.inode) != (stat.st_dev, stat.st_ino):
+        return False
+    if stat.st_size < record.offset:
+        return False
+    return log.read(len(record.head)) == record.head
+
+
+def _provisional_copy(state):
+    if hasattr(type(state), "__copy__"):
+        return copy.copy(state)
+    return copy.deepcopy(state)
+
+
+def _lines(data: bytes):
+    # the same lines as a log opened in text mode gives
+    return io.StringIO(data.decode(errors="replace"), newline=None)
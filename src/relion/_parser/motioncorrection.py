@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import logging
 from collections import namedtuple
 
+import numpy as np
+
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
+from relion._parser.starloop import AppendedStarLoop, StarLoopCacheRecord
 
 logger = logging.getLogger("relion._parser.motioncorrection")
 
@@ -36,6 +42,13 @@ MCMicrograph.micrograph_timestamp.__doc__ = (
     "Time stamp at which the micrograph was created."
 )
 
+mc_micrograph_dtypes = {
+    "micrograph_number": int,
+    "total_motion": float,
+    "early_motion": float,
+    "late_motion": float,
+}
+
 
 MCMicrographDrift = namedtuple(
     "MCMicrographDrift",
@@ -46,23 +59,46 @@ MCMicrographDrift = namedtuple(
     ],
 )
 
+drift_dtypes = {
+    "_rlnMicrographFrameNumber": int,
+    "_rlnMicrographShiftX": float,
+    "_rlnMicrographShiftY": float,
+}
+
 MCDriftCacheRecord = namedtuple(
     "MCDriftCacheRecord",
     [
         "data",
         "file_size",
         "movie_name",
+        "file_mtime_ns",
     ],
 )
 
 
 class MotionCorr(JobType):
-    def __init__(self, path, drift_cache=None):
-        super().__init__(path)
+    def __init__(
+        self,
+        path,
+        drift_cache=None,
+        star_loop_cache=None,
+        threads: int = 1,
+        file_cache=None,
+        snapshot=None,
+    ):
+        super().__init__(path, snapshot=snapshot)
+        # number of threads used to read drift files and stat movies
+        self._threads = threads
         if drift_cache is None:
             self._drift_cache = {}
         else:
             self._drift_cache = drift_cache
+        if star_loop_cache is None:
+            self._star_loop_cache = {}
+        else:
+            self._star_loop_cache = star_loop_cache
+        # optional PersistentFileCache holding drift data between processes
+        self._file_cache = file_cache
 
     def __eq__(self, other):
         if isinstance(other, MotionCorr):  # check this
@@ -79,84 +115,161 @@ class MotionCorr(JobType):
         return f"<MotionCorr parser at {self._basepath}>"
 
     def _load_job_directory(self, jobdir):
+        star_path = self._basepath / jobdir / "corrected_micrographs.star"
+        cached = self._star_loop_cache.get(star_path)
+        if cached is None:
+            cached = StarLoopCacheRecord(
+                AppendedStarLoop(star_path, "_rlnAccumMotionTotal"),
+                ResultFrame.from_rows(MCMicrograph, [], mc_micrograph_dtypes),
+            )
         try:
-            file = self._read_star_file(jobdir, "corrected_micrographs.star")
+            unchanged_rows = cached.loop.read()
         except (FileNotFoundError, OSError, RuntimeError, ValueError):
             return []
 
-        info_table = self._find_table_from_column_name("_rlnAccumMotionTotal", file)
-        if info_table is None:
-            logger.debug(f"_rlnAccumMotionTotal not found in file {file}")
+        info_table = cached.loop
+        if not len(info_table):
+            logger.debug(f"_rlnAccumMotionTotal not found in file {star_path}")
             return []
 
-        accum_motion_total = self.parse_star_file(
-            "_rlnAccumMotionTotal", file, info_table
-        )
-        accum_motion_late = self.parse_star_file(
-            "_rlnAccumMotionLate", file, info_table
-        )
-        accum_motion_early = self.parse_star_file(
-            "_rlnAccumMotionEarly", file, info_table
-        )
-        micrograph_name = self.parse_star_file("_rlnMicrographName", file, info_table)
-
-        micrograph_list = []
-        for j in range(len(micrograph_name)):
-            drift_data, movie_name = self.collect_drift_data(micrograph_name[j], jobdir)
-            if movie_name:
-                try:
-                    movie_creation_time = (
-                        (self._basepath.parent / movie_name).resolve().stat().st_ctime
-                    )
-                except FileNotFoundError:
-                    logger.debug(
-                        f"failed to find movie {self._basepath.parent / movie_name} so using default timestamp"
+        accum_motion_total = info_table["_rlnAccumMotionTotal"]
+        accum_motion_late = info_table["_rlnAccumMotionLate"]
+        accum_motion_early = info_table["_rlnAccumMotionEarly"]
+        micrograph_name = info_table["_rlnMicrographName"]
+
+        # rows that were already read are reused up to the first one that was
+        # missing its drift data or movie at the time or whose drift file has
+        # changed since
+        previous = cached.results[:unchanged_rows]
+        for j, (name, drift_data, timestamp) in enumerate(
+            zip(
+                previous.column("micrograph_name"),
+                previous.column("drift_data"),
+                previous.column("micrograph_timestamp"),
+            )
+        ):
+            if (
+                not drift_data
+                or timestamp is None
+                or not self._drift_unchanged(name, jobdir)
+            ):
+                previous = previous[:j]
+                break
+
+        new_rows = range(len(previous), len(micrograph_name))
+        new_names = micrograph_name[new_rows.start :]
+        if self._threads > 1 and len(new_names) > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._threads
+            ) as pool:
+                drift_and_timestamps = list(
+                    pool.map(
+                        functools.partial(self._drift_and_timestamp, jobdir=jobdir),
+                        new_names,
                     )
-                    movie_creation_time = None
-            else:
-                movie_creation_time = None
-            micrograph_list.append(
-                MCMicrograph(
-                    micrograph_name[j],
-                    str(self._basepath.parent / micrograph_name[j]).replace(
-                        ".mrc", ".jpeg"
-                    ),
-                    j + 1,
-                    accum_motion_total[j],
-                    accum_motion_early[j],
-                    accum_motion_late[j],
-                    movie_creation_time,
-                    drift_data,
                 )
+        else:
+            drift_and_timestamps = [
+                self._drift_and_timestamp(name, jobdir) for name in new_names
+            ]
+        drift = [d for d, _ in drift_and_timestamps]
+        timestamps = [t for _, t in drift_and_timestamps]
+        micrographs = ResultFrame(
+            MCMicrograph,
+            {
+                "micrograph_name": new_names,
+                "micrograph_snapshot_full_path": [
+                    str(self._basepath.parent / name).replace(".mrc", ".jpeg")
+                    for name in new_names
+                ],
+                "micrograph_number": np.arange(
+                    new_rows.start + 1, new_rows.stop + 1, dtype=int
+                ),
+                "total_motion": accum_motion_total[new_rows.start :],
+                "early_motion": accum_motion_early[new_rows.start :],
+                "late_motion": accum_motion_late[new_rows.start :],
+                "micrograph_timestamp": timestamps,
+                "drift_data": drift,
+            },
+            mc_micrograph_dtypes,
+        )
+        micrographs = previous + micrographs
+        self._star_loop_cache[star_path] = StarLoopCacheRecord(cached.loop, micrographs)
+        if self._file_cache is not None:
+            self._file_cache.commit()
+        return micrographs
+
+    def _drift_and_timestamp(self, mic_name, jobdir):
+        drift_data, movie_name = self.collect_drift_data(mic_name, jobdir)
+        if not movie_name:
+            return drift_data, None
+        try:
+            movie_creation_time = self._stat(
+                self._basepath.parent / movie_name
+            ).st_ctime
+        except FileNotFoundError:
+            logger.debug(
+                f"failed to find movie {self._basepath.parent / movie_name} so using default timestamp"
+            )
+            movie_creation_time = None
+        return drift_data, movie_creation_time
+
+    @staticmethod
+    def _drift_file_path(mic_name, jobdir):
+        return mic_name.split(jobdir + "/")[-1].replace("mrc", "star")
+
+    def _drift_unchanged(self, mic_name, jobdir) -> bool:
+        """
+        Whether the drift file of a micrograph has the size and mtime it had
+        when its drift data was last read
+        """
+        cached = self._drift_cache.get(jobdir, {}).get(mic_name)
+        if cached is None:
+            return False
+        try:
+            drift_stat = self._stat(
+                self._basepath / jobdir / self._drift_file_path(mic_name, jobdir)
             )
-        return micrograph_list
+        except FileNotFoundError:
+            return False
+        return (cached.file_size, cached.file_mtime_ns) == (
+            drift_stat.st_size,
+            drift_stat.st_mtime_ns,
+        )
 
     def collect_drift_data(self, mic_name, jobdir):
         drift_data = []
-        drift_star_file_path = mic_name.split(jobdir + "/")[-1].replace("mrc", "star")
-        if self._drift_cache.get(jobdir):
-            if self._drift_cache[jobdir].get(mic_name):
-                try:
-                    if (
-                        self._drift_cache[jobdir][mic_name].file_size
-                        == (self._basepath / jobdir / drift_star_file_path)
-                        .stat()
-                        .st_size
-                    ):
-                        return (
-                            self._drift_cache[jobdir][mic_name].data,
-                            self._drift_cache[jobdir][mic_name].movie_name,
-                        )
-                except FileNotFoundError:
-                    logger.debug(
-                        "Could not find expected file containing drift data",
-                        exc_info=True,
-                    )
-                    return [], ""
-        else:
-            self._drift_cache[jobdir] = {}
+        drift_star_file_path = self._drift_file_path(mic_name, jobdir)
+        # setdefault so that threads loading drift files for the same job
+        # share a single dictionary
+        job_drift_cache = self._drift_cache.setdefault(jobdir, {})
+        if job_drift_cache.get(mic_name) and self._drift_unchanged(mic_name, jobdir):
+            return (
+                job_drift_cache[mic_name].data,
+                job_drift_cache[mic_name].movie_name,
+            )
+        if self._file_cache is not None:
+            file_cache_key = f"{self._basepath.name}/{jobdir}/{drift_star_file_path}"
+            try:
+                drift_stat = self._stat(self._basepath / jobdir / drift_star_file_path)
+            except FileNotFoundError:
+                return drift_data, ""
+            stored = self._file_cache.get("drift", file_cache_key, drift_stat)
+            if stored is not None:
+                drift_data = [MCMicrographDrift(*d) for d in stored["drift_data"]]
+                job_drift_cache[mic_name] = MCDriftCacheRecord(
+                    drift_data,
+                    drift_stat.st_size,
+                    stored["movie_name"],
+                    drift_stat.st_mtime_ns,
+                )
+                return drift_data, stored["movie_name"]
         try:
-            drift_star_file = self._read_star_file(jobdir, drift_star_file_path)
+            # drift files are summarised in the drift cache, so keep them out
+            # of the star document cache rather than evict the larger documents
+            drift_star_file = self._read_star_file(
+                jobdir, drift_star_file_path, cached=False
+            )
         except (FileNotFoundError, OSError, RuntimeError, ValueError):
             return drift_data, ""
         try:
@@ -171,28 +284,37 @@ class MotionCorr(JobType):
                 f"_rlnMicrographFrameNumber or _rlnMicrographMovieName not found in file {drift_star_file}"
             )
             return drift_data, ""
-        frame_numbers = self.parse_star_file(
-            "_rlnMicrographFrameNumber", drift_star_file, info_table
-        )
-        deltaxs = self.parse_star_file(
-            "_rlnMicrographShiftX", drift_star_file, info_table
-        )
-        deltays = self.parse_star_file(
-            "_rlnMicrographShiftY", drift_star_file, info_table
+        drift_columns = self.parse_star_columns(
+            drift_star_file,
+            info_table,
+            [
+                "_rlnMicrographFrameNumber",
+                "_rlnMicrographShiftX",
+                "_rlnMicrographShiftY",
+            ],
+            dtypes=drift_dtypes,
         )
         movie_name = self.parse_star_file_pair(
             "_rlnMicrographMovieName", drift_star_file, movie_table
         )
-        for f, dx, dy in zip(frame_numbers, deltaxs, deltays):
+        for f, dx, dy in zip(
+            *(np.asarray(values).tolist() for values in drift_columns.values())
+        ):
             drift_data.append(MCMicrographDrift(int(f), float(dx), float(dy)))
         try:
-            self._drift_cache[jobdir][mic_name] = MCDriftCacheRecord(
-                drift_data,
-                (self._basepath / jobdir / drift_star_file_path).stat().st_size,
-                movie_name,
-            )
+            drift_stat = self._stat(self._basepath / jobdir / drift_star_file_path)
         except FileNotFoundError:
             return [], ""
+        job_drift_cache[mic_name] = MCDriftCacheRecord(
+            drift_data, drift_stat.st_size, movie_name, drift_stat.st_mtime_ns
+        )
+        if self._file_cache is not None:
+            self._file_cache.put(
+                "drift",
+                file_cache_key,
+                drift_stat,
+                {"drift_data": drift_data, "movie_name": movie_name},
+            )
         return drift_data, movie_name
 
     @staticmethod
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger("relion._parser.persistentcache")
+
+_schema = """
+CREATE TABLE IF NOT EXISTS file_cache (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, path)
+)
+"""
+
+
+class PersistentFileCache:
+    """
+    SQLite backed store for data parsed from individual files of a project,
+    e.g. the drift data of a micrograph, so that it survives a restart of the
+    process. Entries are keyed by a kind and the path of the file and are only
+    returned while the size and mtime of the file match those recorded.
+
+    All entries of a kind are read from the database the first time that kind
+    is asked for. New entries are held in memory until commit() writes them
+    in a single transaction.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = os.fspath(db_path)
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._pending = []
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(_schema)
+
+    def __repr__(self):
+        return f"PersistentFileCache({self.db_path!r})"
+
+    def __str__(self):
+        return f"<PersistentFileCache at {self.db_path}>"
+
+    def _kind_entries(self, kind):
+        if kind not in self._entries:
+            rows = self._connection.execute(
+                "SELECT path, size, mtime_ns, data FROM file_cache WHERE kind = ?",
+                (kind,),
+            ).fetchall()
+            self._entries[kind] = {
+                path: (size, mtime_ns, data) for path, size, mtime_ns, data in rows
+            }
+        return self._entries[kind]
+
+    def get(self, kind: str, path: str, stat_result):
+        """
+        Return the data stored for path if the file has not changed since,
+        otherwise None.
+        """
+        with self._lock:
+            try:
+                entry = self._kind_entries(kind).get(path)
+            except sqlite3.Error:
+                logger.warning(f"Could not read from {self.db_path}", exc_info=True)
+                return None
+            if entry is None or entry[:2] != (
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(entry[2])
+
+    def put(self, kind: str, path: str, stat_result, data):
+        entry = (stat_result.st_size, stat_result.st_mtime_ns, json.dumps(data))
+        with self._lock:
+            try:
+                self._kind_entries(kind)[path] = entry
+            except sqlite3.Error:
+                logger.warning(f"Could not read from {self.db_path}", exc_info=True)
+                return
+            self._pending.append((kind, path, *entry))
+
+    def commit(self):
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                with self._connection:
+                    self._connection.execute("BEGIN")
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO file_cache VALUES (?, ?, ?, ?, ?)",
+                        self._pending,
+                    )
+            except sqlite3.Error:
+                logger.warning(f"Could not write to {self.db_path}", exc_info=True)
+            self._pending = []
+
+    def close(self):
+        with self._lock:
+            self.commit()
+            self._connection.close()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "pending": len(self._pending),
+            }
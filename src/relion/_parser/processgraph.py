@@ -5,6 +5,7 @@ try:
 except ImportError:
     pass
 from relion._parser.processnode import ProcessNode
+from relion.node import _depth_first
 from relion.node.graph import Graph
 
 
@@ -35,36 +36,25 @@ class ProcessGraph(Graph):
             raise ValueError("Index of ProcessGraph must be an integer")
         return self._node_list[index]
 
-    def get_by_name(self, name):
-        for i, j in enumerate(self):
-            if j.name == name:
-                return self._node_list[i]
-        return None
+    def __contains__(self, node):
+        return self._find(node) is not None
 
     def extend(self, other):
         if not isinstance(other, ProcessGraph):
             raise ValueError("Can only extend a ProcessGraph with another ProcessGraph")
         self._node_list.extend(other._node_list)
+        self._index_added(other._node_list)
 
-    def index(self, node):
-        return self._node_list.index(node)
-
-    def link_from_to(self, from_node, to_node):
-        self[self.index(from_node)].link_to(to_node)
-
-    def node_explore(self, node, explored):
+    def _check_explorable(self, node):
         if not isinstance(node, ProcessNode):
             raise ValueError(
                 f"ProcessGraph.node_explore must be called with a ProcessNode (not {type(node)}: {node}) as the starting point; a string or similar is insufficient"
             )
-        if node not in explored:
-            explored.append(node)
-        for next_node in node:
-            self.node_explore(next_node, explored)
 
     def add_node(self, new_node):
         if isinstance(new_node, ProcessNode):
             self._node_list.append(new_node)
+            self._index_added([new_node])
         else:
             raise ValueError("Attempted to add a node that was not a ProcessNode")
 
@@ -73,35 +63,57 @@ class ProcessGraph(Graph):
         other_names = [p._path for p in other]
         if len(set(node_names).intersection(set(other_names))) > 0:
             for new_node in other:
-                if new_node._path not in self:
+                node = self._find(new_node._path)
+                if node is None:
                     self.add_node(new_node)
                 else:
                     for next_node in new_node:
-                        if next_node._path not in self[self.index(new_node._path)]:
-                            self[self.index(new_node._path)].link_to(next_node)
+                        if next_node._path not in node:
+                            node.link_to(next_node)
             return True
         else:
             return False
 
     def split_connected(self):
+        """
+        The connected parts of the graph, each a ProcessGraph of the nodes
+        below its origins: those below its first origin in depth first order
+        followed by those below each further origin that are not already in
+        it. Nodes with the same path are treated as one. Nodes are grouped
+        into parts with a union-find over their links, so the time taken grows
+        close to linearly with the size of the graph.
+        """
         if len(self._node_list) == 0:
             return []
-        connected_graphs = []
+        # each node below an origin, in the order they are first reached, and
+        # the index of the origin it is first reached from
+        reached = []
+        visited = set()
         for oi, origin in enumerate(self.find_origins()):
-            curr_graph = []
-            self.node_explore(origin, curr_graph)
-            connected_graphs.append(
-                ProcessGraph(f"{self.name}:Connected:{oi}", curr_graph)
-            )
-        for_removal = []
-        for i, g in enumerate(connected_graphs):
-            for ng in connected_graphs[i + 1 :]:
-                if g.merge(ng):
-                    if ng not in for_removal:
-                        for_removal.append(ng)
-        for r in for_removal:
-            connected_graphs.remove(r)
-        return connected_graphs
+            for node in _depth_first(
+                origin, check=self._check_explorable, visited=visited
+            ):
+                reached.append((oi, node))
+        parents = {node._index_key: node._index_key for _, node in reached}
+        for _, node in reached:
+            for next_node in node:
+                root = _find_root(parents, node._index_key)
+                next_root = _find_root(parents, next_node._index_key)
+                if root != next_root:
+                    parents[next_root] = root
+        # parts are named after, and ordered by, their first origin
+        parts = {}
+        placed = set()
+        for oi, node in reached:
+            if node._index_key in placed:
+                continue
+            placed.add(node._index_key)
+            root = _find_root(parents, node._index_key)
+            parts.setdefault(root, (oi, []))[1].append(node)
+        return [
+            ProcessGraph(f"{self.name}:Connected:{oi}", nodes)
+            for oi, nodes in parts.values()
+        ]
 
     def _split_connected(self, connected_dict, origin, origins_dict):
         connected_graphs = self.split_connected()
@@ -109,7 +121,7 @@ class ProcessGraph(Graph):
         for cg in connected_graphs:
             if origin in cg._node_list:
                 connected_dict["main"] = cg
-                origins_dict["main"] = self[self.index(origin)]
+                origins_dict["main"] = self._find(origin)
             else:
                 connected_dict[f"ancillary:{ancillary_count}"] = cg
                 origins_dict[f"ancillary:{ancillary_count}"] = cg.find_origins()[0]
@@ -131,3 +143,12 @@ class ProcessGraph(Graph):
 
     def wipe(self):
         self._node_list = []
+        self._name_index = None
+
+
+def _find_root(parents: dict, key):
+    # the representative of the set holding key, halving the path to it
+    while parents[key] != key:
+        parents[key] = parents[parents[key]]
+        key = parents[key]
+    return key
@@ -7,6 +7,34 @@ from relion.node import Node
 
 
 class ProcessNode(Node):
+    __slots__ = ("_path", "db_node")
+
+    # the pipeline state of a job or file, anything else attached to a node
+    # (e.g. results) is left behind when it is cloned
+    _clone_environment_keys = frozenset(
+        {
+            "status",
+            "start_time_stamp",
+            "end_time_stamp",
+            "start_time",
+            "end_time",
+            "drop",
+            "alias",
+            "batch_number",
+            "inject",
+            "init_model_class_num",
+            "job",
+            "job_string",
+            "ini_model_job_string",
+            "job_count",
+            "job_start_times",
+            "cluster_job_ids",
+            "cluster_job_start_times",
+            "cluster_job_mic_counts",
+            "cluster_command",
+        }
+    )
+
     def __init__(self, path, **kwargs):
         super().__init__(str(path), **kwargs)
         self._path = pathlib.PurePosixPath(path)
@@ -67,6 +95,10 @@ class ProcessNode(Node):
             return db_results
         return {}
 
+    @property
+    def _index_key(self):
+        return str(self._path)
+
     def change_name(self, new_name):
+        super().change_name(str(new_name))
         self._path = new_name
-        self._name = str(new_name)
@@ -6,6 +6,7 @@ import pathlib
 from collections import namedtuple
 
 from relion._parser.jobtype import JobType
+from relion._parser.resultframe import ResultFrame
 
 logger = logging.getLogger("relion._parser.relativeicethickness")
 
@@ -22,6 +23,14 @@ RelativeIceThicknessMicrograph.q3.__doc__ = "Quartile 3. Unitless"
 RelativeIceThicknessMicrograph.maximum.__doc__ = "Maximum ice thickness. Unitless"
 RelativeIceThicknessMicrograph.micrograph_path.__doc__ = "Micrograph path"
 
+relative_ice_thickness_dtypes = {
+    "minimum": float,
+    "q1": float,
+    "median": float,
+    "q3": float,
+    "maximum": float,
+}
+
 
 class RelativeIceThickness(JobType):
     def __eq__(self, other):
@@ -72,7 +81,11 @@ class RelativeIceThickness(JobType):
                     list_maximum[j],
                 )
             )
-        return micrograph_list
+        return ResultFrame.from_rows(
+            RelativeIceThicknessMicrograph,
+            micrograph_list,
+            relative_ice_thickness_dtypes,
+        )
 
     def csv_to_dict(self, file_path):
         with open(file_path, newline="") as csvfile:
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import copy
 import os
 import pathlib
+import time
 import warnings
 from concurrent.futures import ThreadPoolExecutor
 from threading import RLock
-from typing import Optional, Tuple
+from typing import Optional
 
 from gemmi import cif
 
@@ -13,17 +15,76 @@ try:
     from graphviz import Digraph
 except ImportError:
     pass
-import calendar
-import copy
 import datetime
+from collections import namedtuple
 
+from relion._parser.joblogs import ClusterSubmissions, JobCommand
+from relion._parser.jobstatus import JobStatusScanner
+from relion._parser.jobtype import _mtime_resolution_ns
+from relion._parser.logtail import LogTailReader
 from relion._parser.processgraph import ProcessGraph
 from relion._parser.processnode import ProcessNode
+from relion._parser.schedulelog import ScheduleLog, ScheduleLogIndex
+from relion._parser.starcache import read_star_file, star_schema
+
+PipelineContents = namedtuple(
+    "PipelineContents",
+    [
+        "processes",
+        "aliases",
+        "files",
+        "input_edges",
+        "output_edges",
+    ],
+)
+
+PipelineContents.__doc__ = "Processes, file nodes and edges of a Relion pipeline."
+PipelineContents.processes.__doc__ = "Names of the processes (jobs)."
+PipelineContents.aliases.__doc__ = "Aliases of the processes."
+PipelineContents.files.__doc__ = "Names of the file nodes."
+PipelineContents.input_edges.__doc__ = "(file, process) pairs of process inputs."
+PipelineContents.output_edges.__doc__ = "(process, file) pairs of process outputs."
+
+ClusterInfoRecord = namedtuple(
+    "ClusterInfoRecord",
+    [
+        "fingerprint",
+        "checked_ns",
+        "info",
+    ],
+)
+
+ClusterInfoRecord.__doc__ = "The cluster information collected for a job."
+ClusterInfoRecord.fingerprint.__doc__ = (
+    "(size, mtime_ns) of the run.out, note.txt and schedule log of the job, None "
+    "for those that do not exist."
+)
+ClusterInfoRecord.checked_ns.__doc__ = "Time at which the fingerprint was taken."
+ClusterInfoRecord.info.__doc__ = "The cluster values of the job environment."
+
+# the job environment values set by collect_cluster_info
+_cluster_info_keys = (
+    "cluster_job_ids",
+    "cluster_job_start_times",
+    "cluster_job_mic_counts",
+    "cluster_command",
+    "job_start_times",
+)
+
+_schedule_log_files = {
+    "preproc": "pipeline_PREPROCESS.log",
+    "class2d": "pipeline_CLASS2D.log",
+    "inimodel": "pipeline_INIMODEL.log",
+    "class3d": "pipeline_CLASS3D.log",
+    "ibgroup": "pipeline_ICEBREAKER_GROUP.log",
+}
 
 
 class RelionPipeline:
-    def __init__(self, origin, graphin=ProcessGraph("nodes", []), locklist=None):
+    def __init__(self, origin, graphin=None, locklist=None):
         self.origin = origin
+        if graphin is None:
+            graphin = ProcessGraph("nodes", [])
         self._nodes = graphin
         self._connected = {}
         self.origins = {}
@@ -34,6 +95,21 @@ class RelionPipeline:
         self._jobs_collapsed = False
         self.locklist = locklist or []
         self.preprocess = []
+        # what was loaded from default_pipeline.star, and the inode, size and
+        # modification time of the file it was loaded from
+        self._pipeline_contents = None
+        self._pipeline_stamp = None
+        # job nodes in the order the job type nodes are made from
+        self._job_order = None
+        # kept between loads so that unchanged job directories are not listed
+        self._status_scanner = JobStatusScanner()
+        # kept between loads so that only what is appended to logs is parsed
+        self._log_tails = LogTailReader()
+        # the schedule logs read by the last collect_job_times
+        self._schedule_logs = ScheduleLogIndex()
+        # ClusterInfoRecords keyed by job path, so that the cluster information
+        # of jobs whose logs have not changed is not collected again
+        self._cluster_info = {}
 
     def __iter__(self):
         if not self._jobs_collapsed:
@@ -45,41 +121,59 @@ class RelionPipeline:
         return DummyLock()
 
     def _star_doc(self, star_path):
-        gemmi_readable_path = os.fspath(star_path)
         if star_path in self.locklist:
             with self._plock as pl:
                 if pl.obtained:
-                    star_doc = cif.read_file(gemmi_readable_path)
+                    star_doc = read_star_file(star_path)
                 else:
                     # effectively return an empty star file
                     star_doc = cif.Document()
             return star_doc
-        return cif.read_file(gemmi_readable_path)
+        return read_star_file(star_path)
 
     def _request_star_values(self, star_doc, column, search=None):
         if search is None:
             search = column
-        block_number = None
-        for block_index, block in enumerate(star_doc):
-            if list(block.find_loop(search)):
-                block_number = block_index
-                break
-        else:
+        block_number = star_schema(star_doc).block_index(search)
+        if block_number is None:
             return []
         data_block = star_doc[block_number]
         values = data_block.find_loop(column)
         return list(values)
 
-    def _load_file_nodes_from_star(self, star_doc):
-        return ProcessGraph(
-            "file nodes",
-            [
-                ProcessNode(pathlib.Path(p))
-                for p in self._request_star_values(star_doc, "_rlnPipeLineNodeName")
-            ],
+    def _read_pipeline_contents(self, star_doc) -> PipelineContents:
+        return PipelineContents(
+            tuple(self._request_star_values(star_doc, "_rlnPipeLineProcessName")),
+            tuple(self._request_star_values(star_doc, "_rlnPipeLineProcessAlias")),
+            tuple(self._request_star_values(star_doc, "_rlnPipeLineNodeName")),
+            tuple(
+                zip(
+                    self._request_star_values(star_doc, "_rlnPipeLineEdgeFromNode"),
+                    self._request_star_values(
+                        star_doc,
+                        "_rlnPipeLineEdgeProcess",
+                        search="_rlnPipeLineEdgeFromNode",
+                    ),
+                )
+            ),
+            tuple(
+                zip(
+                    self._request_star_values(
+                        star_doc,
+                        "_rlnPipeLineEdgeProcess",
+                        search="_rlnPipeLineEdgeToNode",
+                    ),
+                    self._request_star_values(star_doc, "_rlnPipeLineEdgeToNode"),
+                )
+            ),
         )
 
-    def _load_job_nodes_from_star(self, star_doc):
+    @staticmethod
+    def _file_nodes(files):
+        return ProcessGraph("file nodes", [ProcessNode(pathlib.Path(p)) for p in files])
+
+    @staticmethod
+    def _process_nodes(processes, aliases):
         drops = {}
         drops["InitialModel"] = ["batch_number"]
         return ProcessGraph(
@@ -91,141 +185,235 @@ class RelionPipeline:
                     alias=al,
                     drop=drops.get(p.split("/")[0]),
                 )
-                for p, al in zip(
-                    self._request_star_values(star_doc, "_rlnPipeLineProcessName"),
-                    self._request_star_values(star_doc, "_rlnPipeLineProcessAlias"),
-                )
+                for p, al in zip(processes, aliases)
             ],
         )
 
-    def load_nodes_from_star(self, star_path):
-        self._nodes.wipe()
-        star_doc_from_path = self._star_doc(star_path)
-        file_nodes = self._load_file_nodes_from_star(star_doc_from_path)
-        job_nodes = self._load_job_nodes_from_star(star_doc_from_path)
-        self._nodes.extend(file_nodes)
-        self._nodes.extend(job_nodes)
-        binding_pairs = [
-            (ProcessNode(p1), ProcessNode(p2))
-            for p1, p2 in zip(
-                self._request_star_values(
-                    star_doc_from_path, "_rlnPipeLineEdgeFromNode"
-                ),
-                self._request_star_values(
-                    star_doc_from_path,
-                    "_rlnPipeLineEdgeProcess",
-                    search="_rlnPipeLineEdgeFromNode",
-                ),
-            )
-        ]
-        binding_pairs.extend(
-            [
-                (ProcessNode(p1), ProcessNode(p2))
-                for p1, p2 in zip(
-                    self._request_star_values(
-                        star_doc_from_path,
-                        "_rlnPipeLineEdgeProcess",
-                        search="_rlnPipeLineEdgeToNode",
-                    ),
-                    self._request_star_values(
-                        star_doc_from_path, "_rlnPipeLineEdgeToNode"
-                    ),
-                )
-            ]
+    @staticmethod
+    def _is_batch_file(path: pathlib.PurePosixPath) -> bool:
+        return str(path.parent.parent) == "Select" and path.name.startswith(
+            "particles_split"
         )
-        for f, t in binding_pairs:
-            self._nodes[self._nodes.index(f._path)].link_to(
-                self._nodes[self._nodes.index(t._path)]
-            )
-            if str(f._path.parent.parent) == "Select" and f._path.name.startswith(
-                "particles_split"
-            ):
-                self._nodes[self._nodes.index(f._path)].environment[
-                    "batch_number"
-                ] = f._path.stem.replace("particles_split", "")
-                self._nodes[self._nodes.index(f._path)].environment["inject"] = [
-                    ("batch_number", "batch_number")
-                ]
-                self._nodes[self._nodes.index(f._path)].propagate(
-                    ("batch_number", "batch_number")
+
+    def _link_edges(self, edges):
+        for f, t in edges:
+            f = pathlib.PurePosixPath(f)
+            t = pathlib.PurePosixPath(t)
+            from_node = self._nodes.get_by_name(f)
+            to_node = self._nodes.get_by_name(t)
+            if from_node is None or to_node is None:
+                raise ValueError(f"Edge from {f} to {t} refers to an unknown node")
+            from_node.link_to(to_node)
+            if self._is_batch_file(f):
+                from_node.environment["batch_number"] = f.stem.replace(
+                    "particles_split", ""
                 )
-                self._nodes[self._nodes.index(f._path)].propagate(("inject", "inject"))
-            if str(f._path.parent.parent) == "InitialModel" and "class" in f._path.name:
-                self._nodes[self._nodes.index(f._path)].environment[
-                    "init_model_class_num"
-                ] = int(f._path.stem.split("class")[-1].split("_")[0])
-                self._nodes[self._nodes.index(f._path)].propagate(
-                    ("init_model_class_num", "init_model_class_num")
+                from_node.environment["inject"] = [("batch_number", "batch_number")]
+                from_node.propagate(("batch_number", "batch_number"))
+                from_node.propagate(("inject", "inject"))
+            if str(f.parent.parent) == "InitialModel" and "class" in f.name:
+                from_node.environment["init_model_class_num"] = int(
+                    f.stem.split("class")[-1].split("_")[0]
                 )
+                from_node.propagate(("init_model_class_num", "init_model_class_num"))
+
+    def load_nodes_from_star(self, star_path, incremental=False):
+        """
+        Build the process and job graphs from a default_pipeline.star file.
+
+        With incremental set the file is not read again if it has not changed
+        since it was last loaded, and if processes and edges have only been
+        added to it then just those are added to the graphs. In both cases the
+        nodes that were already loaded are kept, so that they are the same
+        objects from one load to the next. Any other change to the file, or a
+        load that is not incremental, rebuilds the graphs.
+        """
+        stamp = None
+        if incremental:
+            pipeline_stat = os.stat(star_path)
+            stamp = (
+                pipeline_stat.st_ino,
+                pipeline_stat.st_size,
+                pipeline_stat.st_mtime_ns,
+            )
+            if self._pipeline_contents is not None and stamp == self._pipeline_stamp:
+                return
+        star_doc = self._star_doc(star_path)
+        contents = self._read_pipeline_contents(star_doc)
+        if incremental and self._extends_pipeline(contents):
+            self._add_to_graphs(contents)
+        else:
+            self._build_graphs(contents)
+        self._pipeline_contents = contents
+        # an empty document is also what is read when the pipeline is locked
+        # so it is read again next time
+        self._pipeline_stamp = stamp if len(star_doc) else None
+
+    def _build_graphs(self, contents: PipelineContents):
+        self._nodes.wipe()
+        self._nodes.extend(self._file_nodes(contents.files))
+        self._nodes.extend(self._process_nodes(contents.processes, contents.aliases))
+        self._link_edges(contents.input_edges + contents.output_edges)
+        self._nodes._split_connected(self._connected, self.origin, self.origins)
+        self._set_job_nodes(contents)
+
+    def _extends_pipeline(self, contents: PipelineContents) -> bool:
+        """
+        Whether contents only add processes, files and edges to those last
+        loaded, without adding inputs to processes that were already there
+        """
+        previous = self._pipeline_contents
+        if previous is None or len(contents.processes) != len(contents.aliases):
+            return False
+        for old, new in zip(previous, contents):
+            if new[: len(old)] != old:
+                return False
+        old_processes = set(previous.processes)
+        return not any(
+            process in old_processes
+            for _, process in contents.input_edges[len(previous.input_edges) :]
+        )
+
+    def _add_to_graphs(self, contents: PipelineContents):
+        previous = self._pipeline_contents
+        new_files = contents.files[len(previous.files) :]
+        new_processes = contents.processes[len(previous.processes) :]
+        new_input_edges = contents.input_edges[len(previous.input_edges) :]
+        new_output_edges = contents.output_edges[len(previous.output_edges) :]
+        if not (new_files or new_processes or new_input_edges or new_output_edges):
+            return
+        # keep the file nodes in front of the process nodes, as in a full load
+        file_count = len(previous.files)
+        self._nodes._node_list[file_count:file_count] = self._file_nodes(new_files)
+        process_nodes = self._process_nodes(
+            new_processes, contents.aliases[len(previous.processes) :]
+        )
+        self._nodes.extend(process_nodes)
+        self._link_edges(new_input_edges + new_output_edges)
         self._nodes._split_connected(self._connected, self.origin, self.origins)
-        self._set_job_nodes(star_doc_from_path)
 
-    def check_job_node_statuses(self, basepath):
+        self._job_nodes.extend(
+            ProcessGraph("job nodes", [node.clone() for node in process_nodes])
+        )
+        self._relink_job_nodes(len(contents.files))
+        # hand on what the inputs of the new processes propagate, as removing
+        # the file nodes does in a full load
+        file_positions = {
+            id(node): position
+            for position, node in enumerate(
+                self._nodes._node_list[: len(contents.files)]
+            )
+        }
+        for process_node in process_nodes:
+            job_node = self._job_nodes._find(process_node._path)
+            inputs = sorted(
+                (n for n in process_node._in if id(n) in file_positions),
+                key=lambda n: file_positions[id(n)],
+            )
+            for file_node in inputs:
+                if file_node.environment.propagate.released:
+                    job_node.environment.update_prop(
+                        file_node.environment.propagate.store
+                    )
+                    if self._is_batch_file(file_node._path):
+                        job_node.environment.update(
+                            file_node.environment.propagate.store
+                        )
+        self._job_nodes._split_connected(
+            self._connected_jobs, self.origin, self.job_origins
+        )
+        self._job_order = None
+
+    def _relink_job_nodes(self, file_count):
+        """
+        Link the job nodes as removing the first file_count nodes of the
+        process graph, its file nodes, from a clone of it would
+        """
+        jobs = {node.nodeid: node for node in self._job_nodes}
+        outs = {}
+        ins = {}
+        for node in self._nodes._node_list[file_count:]:
+            job = jobs[node.nodeid]
+            outs[job.nodeid] = [jobs[n.nodeid] for n in node._out if n.nodeid in jobs]
+            ins[job.nodeid] = [jobs[n.nodeid] for n in node._in if n.nodeid in jobs]
+        for file_node in self._nodes._node_list[:file_count]:
+            behind_nodes = []
+            for node in file_node._in:
+                job = jobs.get(node.nodeid)
+                if job is not None and all(b is not job for b in behind_nodes):
+                    behind_nodes.append(job)
+            for behind in behind_nodes:
+                for node in file_node._out:
+                    job = jobs.get(node.nodeid)
+                    if job is not None and all(
+                        n is not job for n in outs[behind.nodeid]
+                    ):
+                        outs[behind.nodeid].append(job)
+                        ins[job.nodeid].append(behind)
+        for job in self._job_nodes:
+            job._drop_descendants()
+        for job in self._job_nodes:
+            job._out = outs[job.nodeid]
+            job._in = ins[job.nodeid]
+            if job._out and not job._link_traffic:
+                job._link_traffic = {}
+            for next_job in job._out:
+                job._link_traffic.setdefault(next_job.nodeid, {})
+
+    def check_job_node_statuses(self, basepath, snapshot=None, threads: int = 1):
+        """
+        Set the status and end time stamp of every job node from the exit file
+        in its directory, see JobStatusScanner.
+
+        Keyword arguments:
+        snapshot -- DirectorySnapshot to list directories through (default None)
+        threads -- number of job type directories scanned at the same time
+        (default 1)
+        """
+        statuses = self._status_scanner.scan(
+            basepath,
+            [node._path for node in self._job_nodes],
+            snapshot=snapshot,
+            threads=threads,
+        )
         for node in self._job_nodes:
-            success = basepath / node._path / "RELION_JOB_EXIT_SUCCESS"
-            failure = basepath / node._path / "RELION_JOB_EXIT_FAILURE"
-            aborted = basepath / node._path / "RELION_JOB_EXIT_ABORTED"
-            # the try/except blocks below catch the case where Relion removes
-            # the SUCCESS/FAILURE file in between checking for its existence
-            # and checking its modification time
-            try:
-                node.environment["end_time_stamp"] = datetime.datetime.fromtimestamp(
-                    failure.stat().st_mtime
-                )
-                node.environment["status"] = False
-                continue
-            except FileNotFoundError:
-                pass
-            try:
-                node.environment["end_time_stamp"] = datetime.datetime.fromtimestamp(
-                    success.stat().st_mtime
-                )
-                node.environment["status"] = True
-                continue
-            except FileNotFoundError:
-                pass
-            try:
-                node.environment["end_time_stamp"] = datetime.datetime.fromtimestamp(
-                    aborted.stat().st_mtime
-                )
-                node.environment["status"] = False
-                continue
-            except FileNotFoundError:
-                pass
-            node.environment["status"] = None
-
-    def _set_job_nodes(self, star_doc):
-        self._job_nodes = copy.deepcopy(self._nodes)
-        file_nodes = self._load_file_nodes_from_star(star_doc)
-        for fnode in file_nodes:
-            if str(
-                fnode._path.parent.parent
-            ) == "Select" and fnode._path.name.startswith("particles_split"):
-                self._job_nodes.remove_node(fnode._path, advance=True)
-            else:
-                self._job_nodes.remove_node(fnode._path)
+            job_status = statuses[node._path]
+            node.environment["end_time_stamp"] = job_status.end_time_stamp
+            node.environment["status"] = job_status.status
+
+    def _set_job_nodes(self, contents: PipelineContents):
+        self._job_nodes = self._nodes.clone()
+        file_paths = [pathlib.PurePosixPath(p) for p in contents.files]
+        self._job_nodes.remove_nodes(
+            file_paths,
+            advance={path for path in file_paths if self._is_batch_file(path)},
+        )
         self._job_nodes._split_connected(
             self._connected_jobs, self.origin, self.job_origins
         )
+        self._job_order = None
 
     def _collapse_jobs_to_jobtypes(self):
-        ordered_graph = []
         if len(self._nodes) == 0:
             self._jobtype_nodes = ProcessGraph("job type nodes", [])
             return
-        self._job_nodes.node_explore(
-            self._job_nodes[self._job_nodes.index(self.origin)], ordered_graph
-        )
-        self._jobtype_nodes = ProcessGraph(
-            "job type nodes", copy.deepcopy(ordered_graph)
+        if self._job_order is None:
+            self._job_order = []
+            self._job_nodes.node_explore(
+                self._job_nodes.get_by_name(self.origin), self._job_order
+            )
+        # job type nodes made from the same job nodes as before are kept
+        previous = {node.nodeid: node for node in self._jobtype_nodes}
+        self._jobtype_nodes = ProcessGraph("job type nodes", self._job_order).clone(
+            reuse=previous
         )
-        for node in self._jobtype_nodes:
-            node.environment["job"] = node._path.name
-            job_string = str(node._path.name)
-            node._path = node._path.parent
+        for job, node in zip(self._job_order, self._jobtype_nodes):
+            node.environment["job"] = job._path.name
+            job_string = str(job._path.name)
+            if node._path != job._path.parent:
+                node.change_name(job._path.parent)
             for inode in node._in:
                 inode._link_traffic[node.nodeid] = inode._link_traffic[node.nodeid]
-            node._name = str(node._path)
             if node.name == "InitialModel":
                 node.environment["ini_model_job_string"] = job_string
             else:
@@ -321,45 +509,68 @@ class RelionPipeline:
         digraph.render(basepath / "Pipeline" / "relion_pipeline_jobs.gv")
 
     def collect_cluster_info(self, basepath: pathlib.Path):
-        # preload schedule log files
+        # schedule logs already indexed by collect_job_times are not read again
         logs = {
-            "preproc": self._get_log(basepath / "pipeline_PREPROCESS.log"),
-            "class2d": self._get_log(basepath / "pipeline_CLASS2D.log"),
-            "inimodel": self._get_log(basepath / "pipeline_INIMODEL.log"),
-            "class3d": self._get_log(basepath / "pipeline_CLASS3D.log"),
-            "ibgroup": self._get_log(basepath / "pipeline_ICEBREAKER_GROUP.log"),
+            sched: self._schedule_logs.get(basepath / log_file)
+            for sched, log_file in _schedule_log_files.items()
         }
+        cluster_info = {}
+        changed = []
+        for job in self._job_nodes:
+            sched = ""
+            if (
+                str(job._path.parent)
+                in [
+                    "Import",
+                    "MotionCorr",
+                    "CtfFind",
+                    "External",
+                    "AutoPick",
+                    "Select",
+                    "Extract",
+                ]
+                and job.environment["alias"]
+                and "Icebreaker_group" not in job.environment["alias"]
+            ):
+                sched = "preproc"
+            elif str(job._path.parent) == "Class2D":
+                sched = "class2d"
+            elif str(job._path.parent) == "InitialModel":
+                sched = "inimodel"
+            elif str(job._path.parent) == "Class3D":
+                sched = "class3d"
+            elif (
+                job.environment["alias"]
+                and "Icebreaker_group" in job.environment["alias"]
+            ):
+                sched = "ibgroup"
+            checked_ns = time.time_ns()
+            fingerprint = _fingerprint(
+                (
+                    basepath / job._path / "run.out",
+                    basepath / job._path / "note.txt",
+                    basepath / _schedule_log_files[sched] if sched else None,
+                )
+            )
+            record = self._cluster_info.get(job._path)
+            if (
+                record is not None
+                and record.fingerprint == fingerprint
+                and all(
+                    record.checked_ns - stamp[1] > _mtime_resolution_ns
+                    for stamp in fingerprint
+                    if stamp is not None
+                )
+            ):
+                for key, value in record.info.items():
+                    job.environment[key] = copy.copy(value)
+                cluster_info[job._path] = record
+                continue
+            changed.append((job, sched, ClusterInfoRecord(fingerprint, checked_ns, {})))
         with ThreadPoolExecutor(max_workers=10) as pool:
             lock = RLock()
             threads = []
-            for job in self._job_nodes:
-                sched = ""
-                if (
-                    str(job._path.parent)
-                    in [
-                        "Import",
-                        "MotionCorr",
-                        "CtfFind",
-                        "External",
-                        "AutoPick",
-                        "Select",
-                        "Extract",
-                    ]
-                    and job.environment["alias"]
-                    and "Icebreaker_group" not in job.environment["alias"]
-                ):
-                    sched = "preproc"
-                elif str(job._path.parent) == "Class2D":
-                    sched = "class2d"
-                elif str(job._path.parent) == "InitialModel":
-                    sched = "inimodel"
-                elif str(job._path.parent) == "Class3D":
-                    sched = "class3d"
-                elif (
-                    job.environment["alias"]
-                    and "Icebreaker_group" in job.environment["alias"]
-                ):
-                    sched = "ibgroup"
+            for job, sched, record in changed:
                 pool_sub = pool.submit(
                     self._job_cluster_info,
                     job,
@@ -370,6 +581,12 @@ class RelionPipeline:
                 threads.append(pool_sub)
             # wait for threads to finish
             [t.result() for t in threads]
+            for job, sched, record in changed:
+                for key in _cluster_info_keys:
+                    if key in job.environment.base.keys():
+                        record.info[key] = copy.copy(job.environment[key])
+                cluster_info[job._path] = record
+            self._cluster_info = cluster_info
             # use the motion correction num micrographs processed counts as
             # the icebreaker counts as those aren't written to the log files
             # needs to be done after all cluster job info is collected
@@ -393,118 +610,51 @@ class RelionPipeline:
         job: str,
         basepath: pathlib.Path,
         lock: RLock,
-        schedule_log: Optional[list] = None,
+        schedule_log: Optional[ScheduleLog] = None,
     ):
-        try:
-            with open(basepath / job._path / "run.out") as logfile:
-                log = logfile.readlines()
-                (
-                    job.environment["cluster_job_ids"],
-                    job.environment["cluster_job_start_times"],
-                    job.environment["cluster_job_mic_counts"],
-                ) = self._parse_out_log(log)
-            with open(basepath / job._path / "note.txt") as logfile:
-                log = logfile.readlines()
-                cmd = None
-                for line in log:
-                    if "which" in line:
-                        cmd = line.split()[1].replace("`", "")
-                job.environment["cluster_command"] = cmd
-        except FileNotFoundError:
+        submissions = self._log_tails.read(
+            basepath / job._path / "run.out", ClusterSubmissions
+        )
+        note = self._log_tails.read(basepath / job._path / "note.txt", JobCommand)
+        if submissions is not None and note is not None:
+            job.environment["cluster_job_ids"] = list(submissions.cluster_ids)
+            job.environment["cluster_job_start_times"] = list(submissions.start_times)
+            job.environment["cluster_job_mic_counts"] = submissions.mic_counts
+            job.environment["cluster_command"] = note.command
+        else:
             job.environment["cluster_job_ids"] = []
             job.environment["cluster_job_start_times"] = []
             job.environment["cluster_job_mic_counts"] = []
-        if schedule_log:
+        if schedule_log is not None and schedule_log.lines:
             with lock:
-                job.environment["job_start_times"] = self._get_job_times(
-                    schedule_log, job._path
-                )
-
-    def _parse_out_log(self, outlog: list) -> Tuple[list]:
-        cluster_ids = []
-        job_count = 0
-        mic_counts = []
-        t = []
-        for line in outlog:
-            if "with job ID" in line:
-                cluster_ids.append(line.split()[-1])
-                job_count += 1
-                mic_counts.append(0)
-                # all of this is annoying stuff to deal with Relion writing its progress bar
-                # while the cluster info we're interested in is written on the same line of the
-                # output log
-                time_string = ":".join(line.split(":")[:3])
-                time_string = time_string.split(".")[-2]
-                for c in ("~", ",", "_", '"', ">", "(", ")", "[", "o", "]"):
-                    time_string = time_string.replace(c, "")
-                time_string = " ".join(time_string.split(" ")[-2:])
-                t.append(datetime.datetime.strptime(time_string, "%Y-%m-%d %H:%M:%S"))
-            if (
-                ("*" in line or "Filtering" in line)
-                and (".mrc" in line or ".tiff" in line)
-                and job_count
-            ):
-                mic_counts[job_count - 1] += 1
-        if all(cid.isnumeric() for cid in cluster_ids):
-            mic_counts = None
-        return cluster_ids, t, mic_counts
-
-    def _get_job_times(self, log: list, job_path: pathlib.Path) -> list:
-        times = []
-        for lindex, line in enumerate(log):
-            if "Executing" in line and str(job_path) in line:
-                split_line = log[lindex - 1].split()
-                time_split = split_line[4].split(":")
-                dtime = datetime.datetime(
-                    year=int(split_line[5]),
-                    month=list(calendar.month_abbr).index(split_line[2]),
-                    day=int(split_line[3]),
-                    hour=int(time_split[0]),
-                    minute=int(time_split[1]),
-                    second=int(time_split[2]),
-                )
-                times.append(dtime)
-        return times
-
-    @staticmethod
-    def _get_log(log_path):
-        try:
-            with open(log_path) as f:
-                log = f.readlines()
-            return log
-        except FileNotFoundError:
-            return []
+                job.environment["job_start_times"] = schedule_log.times(job._path)
 
     def collect_job_times(self, schedule_logs, preproc_log=None):
+        # each log is read once and then looked up for every job
+        self._schedule_logs = ScheduleLogIndex(schedule_logs, tails=self._log_tails)
         for job in self._job_nodes:
-            jtime, jcount = self._lookup_job_time(schedule_logs, job)
-            job.environment["start_time_stamp"] = jtime
-            job.environment["job_count"] = jcount
+            job.environment["start_time_stamp"] = self._schedule_logs.latest(job._path)
+            job.environment["job_count"] = self._schedule_logs.count(job._path)
         self._calculate_relative_job_times()
         self.preprocess = self._get_pipeline_jobs(preproc_log)
 
     def _get_pipeline_jobs(self, logfile):
         if logfile is None:
             return []
-        if logfile.is_file():
-            with open(logfile, "r") as lfile:
-                try:
-                    return [
-                        self._job_nodes[
-                            self._job_nodes.index(
-                                pathlib.PurePosixPath(line.split()[1])
-                            )
-                        ]
-                        for line in lfile
-                        if line.startswith(" - ")
-                    ]
-                # if it doesn't find the job in self._job_nodes then return empty list
-                # should sort itself out later
-                except ValueError:
-                    return []
-        return []
+        pipeline_jobs = []
+        for listed_job in self._schedule_logs.get(logfile).listed_jobs:
+            job_node = self._job_nodes.get_by_name(pathlib.PurePosixPath(listed_job))
+            # if it doesn't find the job in self._job_nodes then return empty list
+            # should sort itself out later
+            if job_node is None:
+                return []
+            pipeline_jobs.append(job_node)
+        return pipeline_jobs
 
     def _calculate_relative_job_times(self):
+        for node in self._job_nodes:
+            node.environment["start_time"] = None
+            node.environment["end_time"] = None
         times = [j.environment["start_time_stamp"] for j in self._job_nodes]
         etimes = [j.environment["end_time_stamp"] for j in self._job_nodes]
         already_started_times = [t for t in times if t is not None]
@@ -526,29 +676,6 @@ class RelionPipeline:
         for node, rt in zip(self._job_nodes, relative_etimes):
             node.environment["end_time"] = just_seconds(datetime.timedelta(seconds=rt))
 
-    def _lookup_job_time(self, schedule_logs, job):
-        time = None
-        jobcount = 0
-        for log in schedule_logs:
-            with open(log, "r") as slf:
-                lines = slf.readlines()
-                for lindex, line in enumerate(lines):
-                    if "Executing" in line and str(job._path) in line:
-                        split_line = lines[lindex - 1].split()
-                        time_split = split_line[4].split(":")
-                        dtime = datetime.datetime(
-                            year=int(split_line[5]),
-                            month=list(calendar.month_abbr).index(split_line[2]),
-                            day=int(split_line[3]),
-                            hour=int(time_split[0]),
-                            minute=int(time_split[1]),
-                            second=int(time_split[2]),
-                        )
-                        if time is None or dtime > time:
-                            time = dtime
-                        jobcount += 1
-        return time, jobcount
-
     @property
     def current_jobs(self):
         running_jobs = []
@@ -564,6 +691,17 @@ class RelionPipeline:
             return running_jobs
 
 
+def _fingerprint(paths) -> tuple:
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path) if path is not None else None
+        except FileNotFoundError:
+            stat = None
+        stamps.append(stat and (stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
 class DummyLock:
     def __init__(self):
         self.obtained = False
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import collections.abc
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("relion._parser.resultframe")
+
+
+class ResultFrame(collections.abc.Sequence):
+    """
+    Column oriented results of a job. Numeric fields are held as typed NumPy
+    arrays and everything else as a list, one entry per row.
+
+    Indexing and iterating give instances of the namedtuple the frame was
+    created with, containing plain Python values, so a frame can be used in
+    place of the list of namedtuples the parsers used to return. Whole columns
+    are available through column(), e.g. for statistics over a job.
+    """
+
+    def __init__(self, row_type, columns: dict, dtypes: dict | None = None):
+        self._row_type = row_type
+        self._columns = {}
+        dtypes = dtypes or {}
+        lengths = set()
+        for field in row_type._fields:
+            self._columns[field] = self._as_column(
+                field, columns[field], dtypes.get(field)
+            )
+            lengths.add(len(self._columns[field]))
+        if len(lengths) > 1:
+            raise ValueError(
+                f"Columns of a {row_type.__name__} frame must all have the same length"
+            )
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, row_type, rows, dtypes: dict | None = None):
+        rows = list(rows)
+        columns = {
+            field: [row[i] for row in rows] for i, field in enumerate(row_type._fields)
+        }
+        return cls(row_type, columns, dtypes)
+
+    @staticmethod
+    def _as_column(field, values, dtype):
+        if isinstance(values, np.ndarray) and (dtype is None or values.dtype == dtype):
+            return values
+        if dtype is None:
+            return list(values)
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError):
+            logger.debug(
+                f"Could not convert {field} to {np.dtype(dtype)}, keeping the values as they are",
+                exc_info=True,
+            )
+            return list(values)
+
+    @property
+    def row_type(self):
+        return self._row_type
+
+    @property
+    def fields(self) -> tuple:
+        return self._row_type._fields
+
+    def column(self, field):
+        """The values of one field for every row: a NumPy array for numeric fields"""
+        return self._columns[field]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultFrame(
+                self._row_type,
+                {field: values[index] for field, values in self._columns.items()},
+            )
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError(
+                f"ResultFrame indices must be integers or slices, not {type(index).__name__}"
+            )
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ResultFrame index out of range")
+        return self._row_type(
+            *(
+                (
+                    values[index].item()
+                    if isinstance(values, np.ndarray)
+                    else values[index]
+                )
+                for values in self._columns.values()
+            )
+        )
+
+    def __iter__(self):
+        columns = [
+            values.tolist() if isinstance(values, np.ndarray) else values
+            for values in self._columns.values()
+        ]
+        for row in zip(*columns):
+            yield self._row_type(*row)
+
+    def __add__(self, other):
+        if not isinstance(other, ResultFrame) or other._row_type != self._row_type:
+            return NotImplemented
+        columns = {}
+        for field, values in self._columns.items():
+            other_values = other._columns[field]
+            if isinstance(values, np.ndarray) and isinstance(other_values, np.ndarray):
+                columns[field] = np.concatenate((values, other_values))
+            else:
+                columns[field] = list(values) + list(other_values)
+        return ResultFrame(self._row_type, columns)
+
+    def tolist(self) -> list:
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, ResultFrame):
+            return self._row_type == other._row_type and self.tolist() == other.tolist()
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ResultFrame({self._row_type.__name__}, {self.tolist()!r})"
+
+    def __str__(self):
+        return f"<ResultFrame of {len(self)} {self._row_type.__name__} rows>"
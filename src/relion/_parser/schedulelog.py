@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import calendar
+import datetime
+import logging
+import pathlib
+
+logger = logging.getLogger("relion._parser.schedulelog")
+
+_months = list(calendar.month_abbr)
+
+
+class ScheduleLog:
+    """
+    The jobs executed by a Relion schedule, read from its pipeline*.log file
+    in a single pass. Each "Executing" line is preceded by a line with the time
+    the job was executed at, so after reading the times at which any job was
+    executed and how often it was are dict lookups.
+    """
+
+    def __init__(self, lines=()):
+        # the execution times of each job keyed by the job path as a string
+        self._times = {}
+        # the jobs listed at the top of the log, in order
+        self.listed_jobs = []
+        self.lines = 0
+        self._previous = None
+        # jobs whose lists of times are shared with the log this is a copy of
+        self._shared = set()
+        self.read(lines)
+
+    def __repr__(self):
+        return f"ScheduleLog(<{self.lines} lines>)"
+
+    def __str__(self):
+        return f"<ScheduleLog of {len(self._times)} jobs>"
+
+    def __copy__(self) -> ScheduleLog:
+        """
+        A copy that can read more lines without changing this log. The list
+        of times of a job is only copied once the copy adds to it.
+        """
+        log = ScheduleLog.__new__(ScheduleLog)
+        log.__dict__.update(self.__dict__)
+        log._times = dict(self._times)
+        log.listed_jobs = list(self.listed_jobs)
+        log._shared = set(self._times)
+        return log
+
+    @classmethod
+    def from_file(cls, log_path) -> ScheduleLog:
+        """The ScheduleLog of a log file, empty if there is no such file"""
+        try:
+            with open(log_path) as log:
+                return cls(log)
+        except (FileNotFoundError, IsADirectoryError):
+            return cls()
+
+    def read(self, lines):
+        """Add the jobs executed in lines, which follow those already read"""
+        for line in lines:
+            self.lines += 1
+            if line.startswith(" - "):
+                self.listed_jobs.append(line.split()[1])
+            elif "Executing" in line and self._previous is not None:
+                # lines like " ---- Executing Class2D/job008/"
+                words = line.partition("Executing")[2].split()
+                if words:
+                    job_path = words[0].rstrip("/")
+                    try:
+                        dtime = _execution_time(self._previous)
+                    except (IndexError, ValueError):
+                        logger.debug(f"No execution time found for {job_path}")
+                    else:
+                        if job_path in self._shared:
+                            self._shared.discard(job_path)
+                            self._times[job_path] = list(self._times[job_path])
+                        self._times.setdefault(job_path, []).append(dtime)
+            self._previous = line
+
+    def times(self, job_path) -> list:
+        """The times at which a job was executed, in the order of the log"""
+        return list(self._times.get(str(job_path), ()))
+
+    def count(self, job_path) -> int:
+        """The number of times a job was executed"""
+        return len(self._times.get(str(job_path), ()))
+
+
+class ScheduleLogIndex:
+    """
+    The ScheduleLogs of a number of pipeline*.log files, keyed by path. Given a
+    LogTailReader, only the lines appended to each log since it was last read
+    through that reader are parsed.
+    """
+
+    def __init__(self, log_paths=(), tails=None):
+        self._tails = tails
+        self.logs = {pathlib.Path(p): self._read(p) for p in log_paths}
+
+    def __repr__(self):
+        return f"ScheduleLogIndex({list(self.logs)!r})"
+
+    def __str__(self):
+        return f"<ScheduleLogIndex of {len(self.logs)} logs>"
+
+    def get(self, log_path) -> ScheduleLog:
+        """
+        The ScheduleLog of a log file, read without being added to the index if
+        it is not indexed
+        """
+        log = self.logs.get(pathlib.Path(log_path))
+        if log is None:
+            return self._read(log_path)
+        return log
+
+    def _read(self, log_path) -> ScheduleLog:
+        if self._tails is None:
+            return ScheduleLog.from_file(log_path)
+        return self._tails.read(log_path, ScheduleLog) or ScheduleLog()
+
+    def times(self, job_path) -> list:
+        """The times at which a job was executed across all logs"""
+        return [t for log in self.logs.values() for t in log.times(job_path)]
+
+    def count(self, job_path) -> int:
+        """The number of times a job was executed across all logs"""
+        return sum(log.count(job_path) for log in self.logs.values())
+
+    def latest(self, job_path) -> datetime.datetime | None:
+        """The last time a job was executed, None if it never was"""
+        return max(self.times(job_path), default=None)
+
+
+def _execution_time(line) -> datetime.datetime:
+    # lines like " + Thu Jul 2 12:27:54 2020"
+    split_line = line.split()
+    time_split = split_line[4].split(":")
+    return datetime.datetime(
+        year=int(split_line[5]),
+        month=_months.index(split_line[2]),
+        day=int(split_line[3]),
+        hour=int(time_split[0]),
+        minute=int(time_split[1]),
+        second=int(time_split[2]),
+    )
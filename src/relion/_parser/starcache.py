@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import threading
+from collections import namedtuple
+
+from gemmi import cif
+
+from relion._parser.starschema import StarSchema
+
+logger = logging.getLogger("relion._parser.starcache")
+
+StarCacheEntry = namedtuple(
+    "StarCacheEntry",
+    [
+        "document",
+        "signature",
+        "size",
+    ],
+)
+
+StarCacheEntry.__doc__ = "A parsed STAR document held by the StarDocumentCache."
+StarCacheEntry.document.__doc__ = "The gemmi document parsed from the file."
+StarCacheEntry.signature.__doc__ = (
+    "(inode, size, mtime_ns) of the file at the time it was parsed."
+)
+StarCacheEntry.size.__doc__ = "Size of the file in bytes. Counted against the budget."
+
+
+class StarDocumentCache:
+    """
+    Process-wide cache of parsed STAR documents keyed by path.
+    A cached document is only handed out while the (inode, size, mtime_ns)
+    signature of the file on disk matches the one recorded when it was parsed.
+    The budget, max_file_bytes, is counted in bytes of the files on disk and
+    the least recently used documents are dropped once it is exceeded. A parsed
+    document takes up around three to four times the size of its file in
+    memory, so the cache holds correspondingly more memory than the budget.
+
+    Documents are shared between all callers so they must be treated as read only.
+    The StarSchema of a cached document is built the first time it is asked for
+    and kept until the document leaves the cache.
+    """
+
+    def __init__(self, max_file_bytes: int = 512 * 1024 * 1024):
+        self.max_file_bytes = max_file_bytes
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        # id() of each cached document to its StarSchema, or None until built
+        self._schemas = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return os.path.abspath(os.fspath(path)) in self._entries
+
+    def __repr__(self):
+        return f"StarDocumentCache(max_file_bytes={self.max_file_bytes})"
+
+    def __str__(self):
+        return f"<StarDocumentCache holding {len(self)} documents ({self._size} bytes on disk)>"
+
+    @staticmethod
+    def _signature(stat_result):
+        return (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+    def read(self, path) -> cif.Document:
+        """
+        Return the parsed document for path, only parsing the file if it has
+        not been seen before or has changed since it was last parsed.
+        """
+        key = os.path.abspath(os.fspath(path))
+        stat_result = os.stat(key)
+        signature = self._signature(stat_result)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.document
+            self.misses += 1
+        # parse outside of the lock so that reading one large file does not
+        # block every other parser
+        document = parse_star_file(key)
+        self._store(key, StarCacheEntry(document, signature, stat_result.st_size))
+        return document
+
+    def schema(self, document: cif.Document) -> StarSchema:
+        """
+        The StarSchema of document, built once for documents held by the cache
+        and on every call for any other document.
+        """
+        with self._lock:
+            schema = self._schemas.get(id(document))
+            if schema is not None:
+                return schema
+            held = id(document) in self._schemas
+        schema = StarSchema(document)
+        if held:
+            with self._lock:
+                if id(document) in self._schemas:
+                    self._schemas[id(document)] = schema
+        return schema
+
+    def _forget(self, entry):
+        self._size -= entry.size
+        self._schemas.pop(id(entry.document), None)
+
+    def _store(self, key, entry):
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._forget(old_entry)
+            if entry.size > self.max_file_bytes:
+                logger.debug(
+                    f"Not caching {key} as it is larger than the cache budget ({self.max_file_bytes} bytes on disk)"
+                )
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            self._schemas[id(entry.document)] = None
+            while self._size > self.max_file_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._forget(evicted)
+                self.evictions += 1
+
+    def invalidate(self, path):
+        key = os.path.abspath(os.fspath(path))
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._forget(entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._schemas.clear()
+            self._size = 0
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "documents": len(self._entries),
+                "file_bytes": self._size,
+                "max_file_bytes": self.max_file_bytes,
+            }
+
+
+def parse_star_file(path) -> cif.Document:
+    """
+    Parse a STAR file without going through the star document cache, for
+    files that are only read once.
+    """
+    path = os.fspath(path)
+    if path.endswith(".gz"):
+        return cif.read_file(path)
+    # reading the file here rather than in gemmi releases the GIL while
+    # waiting on the filesystem, so files can be read from several threads
+    with open(path, "rb") as star_file:
+        return parse_star_contents(star_file.read(), path)
+
+
+def parse_star_contents(contents: bytes, path) -> cif.Document:
+    """Parse the contents of the STAR file at path, naming it in parse errors"""
+    try:
+        return cif.read_string(contents)
+    except (RuntimeError, ValueError) as e:
+        # gemmi names the source of a string "data", so put the path back in
+        # the message as read_file would give it
+        path = os.fspath(path)
+        message = str(e)
+        if message.startswith("data:"):
+            message = path + message[len("data") :]
+        else:
+            message = f"{path}: {message}"
+        raise type(e)(message) from e
+
+
+star_document_cache = StarDocumentCache()
+
+
+def read_star_file(path) -> cif.Document:
+    return star_document_cache.read(path)
+
+
+def star_schema(document: cif.Document) -> StarSchema:
+    return star_document_cache.schema(document)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import collections
+import logging
+import mmap
+import os
+
+import numpy as np
+
+from relion._parser.starcache import read_star_file
+from relion._parser.starloop import _loop_terminators, _tokens
+
+logger = logging.getLogger("relion._parser.starcount")
+
+# number of bytes of rows decoded at a time
+_chunk_size = 16 * 1024 * 1024
+
+_loop_terminator_initials = np.frombuffer(
+    bytes(terminator[0] for terminator in _loop_terminators), dtype=np.uint8
+)
+
+
+class _NotStreamable(Exception):
+    pass
+
+
+def _is_line_start(data, position: int) -> bool:
+    line_start = data.rfind(b"\n", 0, position) + 1
+    return not data[line_start:position].strip()
+
+
+def _find_column(data, column: str):
+    """
+    Find the loop containing column from the loop headers alone, returning
+    the index of the column, the width of the loop and the offset of its
+    first row, or None if there is no such loop.
+    """
+    column = column.lower()
+    position = 0
+    while True:
+        position = data.find(b"loop_", position)
+        if position == -1:
+            return None
+        if not _is_line_start(data, position):
+            position += 5
+            continue
+        position = data.find(b"\n", position)
+        tags = []
+        while position != -1:
+            line_end = data.find(b"\n", position + 1)
+            line = data[position + 1 : None if line_end == -1 else line_end].strip()
+            if line and not line.startswith(b"_"):
+                break
+            if line:
+                tags.append(line.split()[0].decode().lower())
+            position = line_end
+        if position == -1:
+            return None
+        if column in tags:
+            return tags.index(column), len(tags), position + 1
+
+
+def _loop_end(chunk: bytes) -> int | None:
+    """
+    Offset of the first line of chunk, which must start at the beginning of a
+    line, that is not part of the loop, or None if the loop carries on.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    line_starts = np.flatnonzero(data[:-1] == ord("\n")) + 1
+    line_starts = np.concatenate(([0], line_starts))
+    candidates = line_starts[np.isin(data[line_starts], _loop_terminator_initials)]
+    for line_start in candidates.tolist():
+        if chunk.startswith(b";", line_start):
+            # multi-line text fields cannot be split into rows line by line
+            raise _NotStreamable
+        if chunk.startswith(_loop_terminators, line_start):
+            return line_start
+    return None
+
+
+def _token_bounds(chunk: bytes):
+    """Start and end offsets of the whitespace separated tokens of chunk"""
+    is_token = np.concatenate(
+        ([False], np.frombuffer(chunk, dtype=np.uint8) > ord(" "), [False])
+    )
+    edges = np.flatnonzero(is_token[1:] != is_token[:-1])
+    return edges[::2], edges[1::2]
+
+
+def _parse_integers(chunk: bytes, starts, ends) -> np.ndarray:
+    """
+    Convert the tokens of chunk between starts and ends to integers without
+    creating a Python object for each of them, as long as they are all plain
+    unsigned integers.
+    """
+    lengths = ends - starts
+    max_length = int(lengths.max(initial=0))
+    if 0 < max_length <= 18:
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        offsets = np.arange(max_length)
+        in_token = offsets < lengths[:, None]
+        digits = data[np.minimum(starts[:, None] + offsets, len(data) - 1)]
+        digits = digits.astype(np.int64) - ord("0")
+        if np.all(((digits >= 0) & (digits <= 9)) | ~in_token):
+            powers = 10 ** np.clip(lengths[:, None] - 1 - offsets, 0, None)
+            return np.where(in_token, digits * powers, 0).sum(axis=1)
+    return np.array(
+        [chunk[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+    ).astype(np.int64)
+
+
+def _count_values(values: np.ndarray, counts: collections.Counter):
+    if not len(values):
+        return
+    classes, occurrences = np.unique(values, return_counts=True)
+    counts.update(dict(zip(classes.tolist(), occurrences.tolist())))
+
+
+def _count_rows(data, column: str) -> collections.Counter:
+    counts = collections.Counter()
+    location = _find_column(data, column)
+    if location is None:
+        return counts
+    index, width, start = location
+    end = len(data)
+    # rows are allowed to span lines, and so chunks, so values are picked out
+    # by their position in the whole loop rather than within each line
+    tokens_seen = 0
+    last_value = None
+    while start < end:
+        chunk_end = data.rfind(b"\n", start, min(start + _chunk_size, end)) + 1
+        if chunk_end <= start:
+            chunk_end = data.find(b"\n", start, end) + 1 or end
+        chunk = data[start:chunk_end]
+        loop_end = _loop_end(chunk)
+        if loop_end is not None:
+            chunk = chunk[:loop_end]
+            end = chunk_end = start + loop_end
+        first = (index - tokens_seen) % width
+        if b"'" in chunk or b'"' in chunk or b"#" in chunk:
+            tokens = [
+                token for line in chunk.decode().splitlines() for token in _tokens(line)
+            ]
+            values = np.array(tokens[first::width]).astype(np.int64)
+            tokens_seen += len(tokens)
+        else:
+            starts, ends = _token_bounds(chunk)
+            values = _parse_integers(chunk, starts[first::width], ends[first::width])
+            tokens_seen += len(starts)
+        _count_values(values, counts)
+        if len(values):
+            last_value = int(values[-1])
+        start = chunk_end
+    if index < tokens_seen % width:
+        # the last row is incomplete, most likely because it is still being written
+        counts[last_value] -= 1
+        counts += collections.Counter()
+    return counts
+
+
+def count_star_column(path, column: str) -> collections.Counter:
+    """
+    Count how often each integer value appears in a column of a STAR file,
+    e.g. the number of particles in each class from _rlnClassNumber.
+
+    The file is memory mapped and the rows decoded in bounded chunks, so the
+    memory used does not grow with the size of the file. Files that cannot be
+    split into rows line by line are read through gemmi instead.
+    """
+    path = os.fspath(path)
+    with open(path, "rb") as star_file:
+        try:
+            data = mmap.mmap(star_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file cannot be mapped
+            return collections.Counter()
+    try:
+        with data:
+            return _count_rows(data, column)
+    except _NotStreamable:
+        logger.debug(f"Reading {column} from {path} through gemmi")
+    counts = collections.Counter()
+    for block in read_star_file(path):
+        values = list(block.find_loop(column))
+        if values:
+            _count_values(np.array(values).astype(np.int64), counts)
+            break
+    return counts
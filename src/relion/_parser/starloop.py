@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+import zlib
+from collections import namedtuple
+
+from gemmi import cif
+
+from relion._parser.jobtype import _mtime_resolution_ns
+from relion._parser.starcache import parse_star_contents
+
+logger = logging.getLogger("relion._parser.starloop")
+
+# anything at the start of a line that means the loop has ended, or, for ";",
+# that it holds multi-line text fields, which cannot be read line by line
+_loop_terminators = (b"data_", b"loop_", b"_", b";", b"save_", b"global_", b"stop_")
+
+_quoted_tokens = re.compile(r"""'[^']*'|"[^"]*"|\S+""")
+
+StarLoopCacheRecord = namedtuple(
+    "StarLoopCacheRecord",
+    [
+        "loop",
+        "results",
+    ],
+)
+
+StarLoopCacheRecord.__doc__ = (
+    "Incremental reader and the results already built from it."
+)
+StarLoopCacheRecord.loop.__doc__ = "The AppendedStarLoop reading the file."
+StarLoopCacheRecord.results.__doc__ = (
+    "Results built from the rows of the loop, one per row, in file order."
+)
+
+
+def _tokens(line: str) -> list:
+    if "'" in line or '"' in line:
+        tokens = _quoted_tokens.findall(line)
+    else:
+        tokens = line.split()
+    for i, token in enumerate(tokens):
+        if token.startswith("#"):
+            return tokens[:i]
+    return tokens
+
+
+class AppendedStarLoop:
+    """
+    Reads the columns of the loop containing a given column from a STAR file
+    which only ever grows by having rows appended to it, as is the case for
+    corrected_micrographs.star and micrographs_ctf.star while a job runs.
+
+    The byte offset of the end of the last complete row is remembered along
+    with a checksum of everything before it. When the file changes only the
+    rows appended after that offset are decoded, unless the checksum shows
+    that the header or earlier rows have changed, in which case the whole
+    file is parsed again. Loops which are not at the end of the file, or that
+    use multi-line text fields, are read in full through gemmi. If such a loop
+    runs to the end of the file the rows appended to it later are still
+    decoded on their own.
+
+    A last row without a newline may still be being written, so it is left out
+    until the file has not been modified for longer than the mtime resolution.
+    It is then read as gemmi would, but only provisionally: it is dropped and
+    read again the next time the file changes, in case it grew.
+    """
+
+    def __init__(self, path, column: str):
+        self.path = os.path.abspath(os.fspath(path))
+        self.column = column
+        self.full_parses = 0
+        self._signature = None
+        self._settled = False
+        self._reset()
+
+    def _reset(self):
+        self.tags = []
+        self._columns = {}
+        self._num_rows = 0
+        self._offset = None
+        self._crc = 0
+        self._preamble_text = ""
+        self._preamble = None
+        # rows read from a last line without a newline, which come last
+        self._provisional_rows = 0
+        # whether there is a last line without a newline that was left out
+        self._unsettled = False
+
+    def __len__(self):
+        return self._num_rows
+
+    def __contains__(self, tag):
+        return tag in self._columns
+
+    def __getitem__(self, tag) -> list:
+        return self._columns[tag]
+
+    def __repr__(self):
+        return f"AppendedStarLoop({self.path!r}, {self.column!r})"
+
+    def __str__(self):
+        return f"<AppendedStarLoop of {self.column} in {self.path} ({len(self)} rows)>"
+
+    @property
+    def preamble(self) -> cif.Document:
+        """The blocks preceding the loop, e.g. the optics table"""
+        if self._preamble is None:
+            self._preamble = cif.read_string(self._preamble_text)
+        return self._preamble
+
+    def read(self) -> int:
+        """
+        Bring the columns up to date with the file on disk.
+        Returns the number of leading rows that are unchanged since the previous
+        read, so rows from that index onwards are new.
+        """
+        stat_result = os.stat(self.path)
+        signature = (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+        if signature == self._signature:
+            return len(self)
+        self._settled = time.time_ns() - stat_result.st_mtime_ns > _mtime_resolution_ns
+        with open(self.path, "rb") as star_file:
+            data = star_file.read()
+        self._drop_provisional_rows()
+        known_rows = len(self)
+        if (
+            self._offset is not None
+            and len(data) >= self._offset
+            and zlib.crc32(memoryview(data)[: self._offset]) == self._crc
+            and self._read_rows(data, self._offset)
+        ):
+            self._signature = None if self._unsettled else signature
+            return known_rows
+        self._full_parse(data)
+        self._signature = None if self._unsettled else signature
+        return 0
+
+    def _drop_provisional_rows(self):
+        if self._provisional_rows:
+            for tag in self.tags:
+                del self._columns[tag][-self._provisional_rows :]
+            self._num_rows -= self._provisional_rows
+            self._provisional_rows = 0
+
+    def _read_rows(self, data: bytes, offset: int) -> bool:
+        """
+        Decode the complete rows from offset onwards. Returns False, leaving the
+        columns untouched, if anything other than loop rows is found.
+        """
+        width = len(self.tags)
+        values = []
+        pending = []
+        provisional = []
+        end = offset
+        position = offset
+        self._unsettled = False
+        while True:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                line = data[position:].strip()
+                if not line or line.startswith(b"#"):
+                    break
+                if not self._settled:
+                    # a partial line that may still be being written
+                    self._unsettled = True
+                    break
+                if line.startswith(_loop_terminators):
+                    return False
+                tokens = _tokens(line.decode())
+                if (len(pending) + len(tokens)) % width == 0:
+                    provisional = pending + tokens
+                break
+            line = data[position:newline].strip()
+            position = newline + 1
+            if not line or line.startswith(b"#"):
+                if not pending:
+                    end = position
+                continue
+            if line.startswith(_loop_terminators):
+                return False
+            pending.extend(_tokens(line.decode()))
+            if len(pending) % width == 0:
+                values.extend(pending)
+                pending = []
+                end = position
+        for i, tag in enumerate(self.tags):
+            self._columns[tag].extend(values[i::width])
+            self._columns[tag].extend(provisional[i::width])
+        self._num_rows += (len(values) + len(provisional)) // width
+        self._provisional_rows = len(provisional) // width
+        self._crc = zlib.crc32(memoryview(data)[offset:end], self._crc)
+        self._offset = end
+        return True
+
+    def _full_parse(self, data: bytes):
+        self.full_parses += 1
+        self._reset()
+        tags = []
+        in_header = False
+        loop_start = 0
+        header_end = None
+        position = 0
+        while True:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                if in_header and self.column in tags:
+                    header_end = position
+                break
+            line = data[position:newline].strip()
+            if in_header:
+                if line.startswith(b"_"):
+                    tags.append(line.split()[0].decode())
+                    position = newline + 1
+                    continue
+                in_header = False
+                if self.column in tags:
+                    header_end = position
+                    break
+            if line.startswith(b"loop_"):
+                in_header = True
+                tags = []
+                loop_start = position
+            position = newline + 1
+        if header_end is None:
+            logger.debug(f"{self.column} not found in any loop of {self.path}")
+            return
+        self.tags = tags
+        self._columns = {tag: [] for tag in tags}
+        self._preamble_text = data[:loop_start].decode()
+        self._crc = zlib.crc32(memoryview(data)[:header_end])
+        if self._read_rows(data, header_end):
+            return
+        logger.debug(
+            f"Loop containing {self.column} in {self.path} cannot be read incrementally"
+        )
+        self._read_with_gemmi(data)
+
+    def _read_with_gemmi(self, data: bytes):
+        self._offset = None
+        document = parse_star_contents(data, self.path)
+        for block in document:
+            if list(block.find_loop(self.column)):
+                self._columns = {tag: list(block.find_loop(tag)) for tag in self.tags}
+                self._num_rows = len(self._columns[self.column])
+                break
+        else:
+            return
+        items = list(document[len(document) - 1])
+        last_loop = items[-1].loop if items else None
+        if (
+            last_loop is not None
+            and self.column.lower() in (tag.lower() for tag in last_loop.tags)
+            and data.endswith(b"\n")
+        ):
+            # the loop runs to the end of the file, so rows appended to it can
+            # still be read on their own
+            self._crc = zlib.crc32(data)
+            self._offset = len(data)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+from collections import namedtuple
+
+from gemmi import cif
+
+logger = logging.getLogger("relion._parser.starschema")
+
+StarColumn = namedtuple(
+    "StarColumn",
+    [
+        "block",
+        "item",
+        "column",
+        "rows",
+    ],
+)
+
+StarColumn.__doc__ = "Location of a loop column within a STAR document."
+StarColumn.block.__doc__ = "Index of the data block containing the loop."
+StarColumn.item.__doc__ = "Index of the loop among the items of the block."
+StarColumn.column.__doc__ = "Index of the column within the loop."
+StarColumn.rows.__doc__ = "Number of rows in the loop."
+
+
+class StarSchema:
+    """
+    Index of the loop columns of a STAR document, built from the loop headers
+    alone, so that finding the table that holds a column does not depend on
+    how many rows it has. As with gemmi, column names are matched ignoring case.
+
+    A column can appear in more than one block (e.g. _rlnMicrographName in
+    both the micrographs and particles tables of a file); lookups return the
+    first block in which the column has any rows, which is the block that
+    searching with find_loop would have chosen.
+    """
+
+    def __init__(self, document: cif.Document):
+        self._locations = {}
+        for block_index, block in enumerate(document):
+            for item_index, item in enumerate(block):
+                loop = item.loop
+                if loop is None:
+                    continue
+                rows = loop.length()
+                for column_index, tag in enumerate(loop.tags):
+                    self._locations.setdefault(tag.lower(), []).append(
+                        StarColumn(block_index, item_index, column_index, rows)
+                    )
+
+    def __contains__(self, column):
+        return self.find(column) is not None
+
+    def __repr__(self):
+        return f"<StarSchema of {len(self._locations)} columns>"
+
+    @property
+    def columns(self) -> list:
+        return list(self._locations)
+
+    def find(self, column: str, block: int | None = None) -> StarColumn | None:
+        """
+        The location of column, either the first non-empty one or the one in
+        the given block. None if there is no such column with any rows.
+        """
+        for location in self._locations.get(column.lower(), ()):
+            if location.rows and (block is None or location.block == block):
+                return location
+        return None
+
+    def block_index(self, column: str) -> int | None:
+        location = self.find(column)
+        if location is None:
+            return None
+        return location.block
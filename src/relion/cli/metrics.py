@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import time
+
+from relion import Project
+from relion.metrics import as_dict, job_metrics, prometheus_text, stage_metrics
+
+
+def _write(path, text):
+    # written to a temporary file first so that a scraper never reads half a file
+    if path == "-":
+        print(text, end="")
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        description="Export job timelines and throughput of a Relion project"
+    )
+    parser.add_argument("proj_path")
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        help="file to write the metrics to as JSON, - for standard output",
+    )
+    parser.add_argument(
+        "--prometheus",
+        dest="prometheus_path",
+        help="file to write the metrics to in the Prometheus text format, - for standard output",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="write the metrics again every this many seconds",
+    )
+    args = parser.parse_args()
+    if args.json_path is None and args.prometheus_path is None:
+        args.json_path = "-"
+    with Project(pathlib.Path(args.proj_path), cluster=True) as proj:
+        while True:
+            jobs = job_metrics(proj)
+            stages = stage_metrics(jobs)
+            if args.json_path:
+                _write(
+                    args.json_path, json.dumps(as_dict(jobs, stages), indent=2) + "\n"
+                )
+            if args.prometheus_path:
+                _write(args.prometheus_path, prometheus_text(jobs, stages))
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+            # only what changed since the last load is read again
+            proj.load(clear_cache=False, cluster=True, incremental=True)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import bisect
 import functools
 import itertools
 import re
+import threading
 
 from ispyb import sqlalchemy
 
@@ -36,6 +38,14 @@ class Table:
         self._counters = self._make_list(counters, default=[])
         self._append = self._make_list(append, default=[])
         self._required = self._make_list(required, default=[])
+        # row indices keyed by value for the primary key and unique columns,
+        # so that rows are found without scanning a column
+        self._indexes = {
+            c: {} for c in [primary_key] + (self._unique or []) if c in self._tab
+        }
+        # held while rows are added or looked up, as the nodes of a graph
+        # called in waves may share a table between threads
+        self._lock = threading.RLock()
 
     def __getitem__(self, key):
         return self._tab[key]
@@ -49,6 +59,10 @@ class Table:
         return [elem]
 
     def add_row(self, row):
+        with self._lock:
+            return self._add_row(row)
+
+    def _add_row(self, row):
         for req in self._required:
             if row.get(req) is None:
                 return None
@@ -58,7 +72,9 @@ class Table:
         unique_check = self._unique_check(row)
 
         prim_key_arg = unique_check or row.get(self._primary_key)
-        if unique_check is None or prim_key_arg not in self._tab[self._primary_key]:
+        if unique_check is None or not self._row_indices(
+            self._primary_key, prim_key_arg
+        ):
             try:
                 for counter in self._counters:
                     row[counter] = len(self._tab[counter]) + 1
@@ -66,21 +82,24 @@ class Table:
                 pass
         else:
             for counter in self._counters:
-                index = self._tab[self._primary_key].index(prim_key_arg)
+                index = self._row_indices(self._primary_key, prim_key_arg)[0]
                 row[counter] = self._tab[counter][index]
 
         # if no primary key is specified and the uniqueness check has not returned one then add the row
         # with a new primary key id
-        if prim_key_arg is None or prim_key_arg not in self._tab[self._primary_key]:
+        if prim_key_arg is None or not self._row_indices(
+            self._primary_key, prim_key_arg
+        ):
             modified = True
             for c in self.columns:
                 if c == self._primary_key:
                     self._tab[c].append(prim_key_arg or next(WrapperID))
                 else:
                     self._tab[c].append(row.get(c))
+                self._index_value(c, len(self._tab[c]) - 1)
         # otherwise use existing primary key
         else:
-            index = self._tab[self._primary_key].index(prim_key_arg)
+            index = self._row_indices(self._primary_key, prim_key_arg)[0]
             for c in self.columns:
                 if c != self._primary_key:
                     row_value = row.get(c)
@@ -93,24 +112,24 @@ class Table:
                             if row_value is not None:
                                 if not isinstance(self._tab[c][index], list):
                                     if self._tab[c][index] is None:
-                                        self._tab[c][index] = []
+                                        self._set(c, index, [])
                                     else:
-                                        self._tab[c][index] = [self._tab[c][index]]
+                                        self._set(c, index, [self._tab[c][index]])
                                 curr_as_set = set(self._tab[c][index])
                                 curr_orig = set(self._tab[c][index])
                                 if isinstance(row_value, (list, set, tuple)):
                                     curr_as_set |= set(row_value)
-                                    self._tab[c][index] = list(curr_as_set)
+                                    self._set(c, index, list(curr_as_set))
                                 else:
                                     curr_as_set.add(row_value)
-                                    self._tab[c][index] = list(curr_as_set)
+                                    self._set(c, index, list(curr_as_set))
                                 if curr_orig.symmetric_difference(
                                     set(self._tab[c][index])
                                 ):
                                     modified = True
                         else:
                             modified = True
-                            self._tab[c][index] = row_value
+                            self._set(c, index, row_value)
 
         if modified:
             if prim_key_arg is None:
@@ -120,17 +139,43 @@ class Table:
         else:
             return None
 
+    def _row_indices(self, column, value) -> list:
+        index = self._indexes.get(column)
+        if index is not None:
+            try:
+                return list(index.get(value, ()))
+            except TypeError:
+                pass
+        return [i for i, element in enumerate(self._tab[column]) if element == value]
+
+    def _index_value(self, column, row_index):
+        index = self._indexes.get(column)
+        if index is None:
+            return
+        try:
+            bisect.insort(index.setdefault(self._tab[column][row_index], []), row_index)
+        except TypeError:
+            # unhashable values, such as the lists of append columns, cannot
+            # be indexed so the column is scanned instead
+            del self._indexes[column]
+
+    def _set(self, column, row_index, value):
+        index = self._indexes.get(column)
+        if index is not None:
+            old_value = self._tab[column][row_index]
+            index[old_value].remove(row_index)
+            if not index[old_value]:
+                del index[old_value]
+        self._tab[column][row_index] = value
+        self._index_value(column, row_index)
+
     # check if the row being added has already existing values for the columns marked as unique
     def _unique_check(self, in_values):
         try:
             unique_indices = []
             for u in self._unique:
-                if in_values.get(u) in self._tab[u]:
-                    indices = [
-                        i
-                        for i, element in enumerate(self._tab[u])
-                        if element == in_values.get(u)
-                    ]
+                indices = self._row_indices(u, in_values.get(u))
+                if indices:
                     if isinstance(indices, list):
                         unique_indices.append(indices)
                     else:
@@ -159,7 +204,8 @@ class Table:
     def get_row_index(self, key, value):
         if value is None:
             return None
-        indices = [i for i, element in enumerate(self._tab[key]) if element == value]
+        with self._lock:
+            indices = self._row_indices(key, value)
         if indices:
             if len(indices) == 1:
                 return indices[0]
@@ -168,8 +214,9 @@ class Table:
         return None
 
     def get_row_by_primary_key(self, value):
-        row_index = self.get_row_index(self._primary_key, value)
-        return {c: self._tab[c][row_index] for c in self.columns}
+        with self._lock:
+            row_index = self.get_row_index(self._primary_key, value)
+            return {c: self._tab[c][row_index] for c in self.columns}
 
 
 def to_snake_case(camel_case):
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import datetime
+from collections import namedtuple
+
+JobMetrics = namedtuple(
+    "JobMetrics",
+    [
+        "job",
+        "alias",
+        "stage",
+        "status",
+        "start_time",
+        "end_time",
+        "duration",
+        "runs",
+        "cluster_jobs",
+        "queue_wait",
+        "micrographs",
+        "micrographs_per_hour",
+    ],
+)
+
+JobMetrics.__doc__ = "Timeline and throughput of a Relion job."
+JobMetrics.job.__doc__ = "Path of the job, e.g. MotionCorr/job002."
+JobMetrics.alias.__doc__ = "Alias of the job, None without one."
+JobMetrics.stage.__doc__ = "Job type the job belongs to, e.g. MotionCorr."
+JobMetrics.status.__doc__ = (
+    "True if the job succeeded, False if it failed or was aborted and None if it "
+    "is still running or has not been run."
+)
+JobMetrics.start_time.__doc__ = "Last time the job was run by a schedule."
+JobMetrics.end_time.__doc__ = "Time the job finished at, None if it has not."
+JobMetrics.duration.__doc__ = (
+    "Seconds from the start of the job to its end, or to now if it is still running."
+)
+JobMetrics.runs.__doc__ = "Number of times the job was run by a schedule."
+JobMetrics.cluster_jobs.__doc__ = "Number of cluster jobs the job submitted."
+JobMetrics.queue_wait.__doc__ = (
+    "Mean seconds from the job being run by a schedule to it submitting a "
+    "cluster job, None without cluster information."
+)
+JobMetrics.micrographs.__doc__ = (
+    "Number of micrographs processed by the cluster jobs of the job, None if "
+    "they do not report them."
+)
+JobMetrics.micrographs_per_hour.__doc__ = "Micrographs processed per hour of duration."
+
+StageMetrics = namedtuple(
+    "StageMetrics",
+    [
+        "stage",
+        "jobs",
+        "running",
+        "start_time",
+        "end_time",
+        "duration",
+        "micrographs",
+        "micrographs_per_hour",
+    ],
+)
+
+StageMetrics.__doc__ = "Timeline and throughput of all jobs of a job type."
+StageMetrics.stage.__doc__ = "The job type, e.g. MotionCorr."
+StageMetrics.jobs.__doc__ = "Number of jobs of the job type."
+StageMetrics.running.__doc__ = "Number of those jobs still running."
+StageMetrics.start_time.__doc__ = "Earliest start of the jobs."
+StageMetrics.end_time.__doc__ = (
+    "Latest end of the jobs, None if any is still running or none has finished."
+)
+StageMetrics.duration.__doc__ = (
+    "Seconds from the earliest start to the latest end, or to now while a job is "
+    "running."
+)
+StageMetrics.micrographs.__doc__ = "Micrographs processed by the jobs, None if unknown."
+StageMetrics.micrographs_per_hour.__doc__ = (
+    "Micrographs processed per hour of duration."
+)
+
+
+def job_metrics(pipeline, now: datetime.datetime | None = None) -> list:
+    """
+    The JobMetrics of every job of a loaded RelionPipeline or Project, in
+    pipeline order. Cluster values are only known for a pipeline loaded with
+    cluster=True.
+    """
+    now = now or datetime.datetime.now()
+    metrics = []
+    for node in pipeline._job_nodes:
+        env = node.environment
+        start = env["start_time_stamp"]
+        status = env["status"]
+        # an end from an earlier run of a job that has been started again
+        end = env["end_time_stamp"] if status is not None else None
+        if end is not None and start is not None and end < start:
+            end = None
+        duration = None
+        if start is not None:
+            duration = ((end or now) - start).total_seconds()
+        mic_counts = env["cluster_job_mic_counts"]
+        micrographs = sum(mic_counts) if mic_counts else None
+        metrics.append(
+            JobMetrics(
+                job=str(node._path),
+                alias=env["alias"] if env["alias"] != "None" else None,
+                stage=str(node._path.parent),
+                status=status,
+                start_time=start,
+                end_time=end,
+                duration=duration,
+                runs=env["job_count"] or 0,
+                cluster_jobs=len(env["cluster_job_ids"] or ()),
+                queue_wait=_queue_wait(
+                    env["job_start_times"] or (), env["cluster_job_start_times"] or ()
+                ),
+                micrographs=micrographs,
+                micrographs_per_hour=_per_hour(micrographs, duration),
+            )
+        )
+    return metrics
+
+
+def stage_metrics(jobs: list, now: datetime.datetime | None = None) -> list:
+    """The StageMetrics of each job type of a list of JobMetrics."""
+    now = now or datetime.datetime.now()
+    stages = {}
+    for job in jobs:
+        stages.setdefault(job.stage, []).append(job)
+    metrics = []
+    for stage, stage_jobs in stages.items():
+        started = [j for j in stage_jobs if j.start_time is not None]
+        running = sum(1 for j in started if j.end_time is None)
+        start = min((j.start_time for j in started), default=None)
+        end = None
+        if started and not running:
+            end = max(j.end_time for j in started)
+        duration = None
+        if start is not None:
+            duration = ((end or now) - start).total_seconds()
+        counts = [j.micrographs for j in stage_jobs if j.micrographs is not None]
+        micrographs = sum(counts) if counts else None
+        metrics.append(
+            StageMetrics(
+                stage=stage,
+                jobs=len(stage_jobs),
+                running=running,
+                start_time=start,
+                end_time=end,
+                duration=duration,
+                micrographs=micrographs,
+                micrographs_per_hour=_per_hour(micrographs, duration),
+            )
+        )
+    return metrics
+
+
+def as_dict(jobs: list, stages: list, now: datetime.datetime | None = None) -> dict:
+    """JobMetrics and StageMetrics as a dict that can be written as JSON."""
+    now = now or datetime.datetime.now()
+    return {
+        "generated": now.isoformat(),
+        "jobs": [_json_record(j) for j in jobs],
+        "stages": [_json_record(s) for s in stages],
+    }
+
+
+def prometheus_text(jobs: list, stages: list) -> str:
+    """
+    JobMetrics and StageMetrics in the Prometheus text exposition format, as
+    read by the textfile collector of the node exporter. Values that are not
+    known are left out.
+    """
+    lines = []
+    for name, help_text, kind, value in _prometheus_metrics:
+        records = jobs if kind == "jobs" else stages
+        samples = [(r, value(r)) for r in records]
+        samples = [(r, v) for r, v in samples if v is not None]
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for record, sample in samples:
+            lines.append(f"{name}{{{_labels(record)}}} {float(sample)!r}")
+    return "\n".join(lines) + "\n"
+
+
+def _queue_wait(executions, submissions) -> float | None:
+    waits = []
+    for submitted in submissions:
+        executed = [t for t in executions if t <= submitted]
+        if executed:
+            waits.append((submitted - max(executed)).total_seconds())
+    if not waits:
+        return None
+    return sum(waits) / len(waits)
+
+
+def _per_hour(count, seconds) -> float | None:
+    if count is None or not seconds or seconds <= 0:
+        return None
+    return count * 3600 / seconds
+
+
+def _json_record(record) -> dict:
+    return {
+        field: value.isoformat() if isinstance(value, datetime.datetime) else value
+        for field, value in record._asdict().items()
+    }
+
+
+def _timestamp(time) -> float | None:
+    return time.timestamp() if time is not None else None
+
+
+def _labels(record) -> str:
+    if isinstance(record, JobMetrics):
+        labels = {"job": record.job, "stage": record.stage}
+        if record.alias:
+            labels["alias"] = record.alias
+    else:
+        labels = {"stage": record.stage}
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _status(job) -> int | None:
+    if job.status is None:
+        return None
+    return int(job.status)
+
+
+# name, help, whether it is given for jobs or stages and the value of a record
+_prometheus_metrics = (
+    (
+        "relion_job_start_timestamp_seconds",
+        "Last time the job was run by a schedule.",
+        "jobs",
+        lambda j: _timestamp(j.start_time),
+    ),
+    (
+        "relion_job_end_timestamp_seconds",
+        "Time the job finished at.",
+        "jobs",
+        lambda j: _timestamp(j.end_time),
+    ),
+    (
+        "relion_job_duration_seconds",
+        "Seconds from the start of the job to its end or to now.",
+        "jobs",
+        lambda j: j.duration,
+    ),
+    (
+        "relion_job_succeeded",
+        "1 if the job succeeded, 0 if it failed or was aborted.",
+        "jobs",
+        _status,
+    ),
+    (
+        "relion_job_running",
+        "1 if the job is running.",
+        "jobs",
+        lambda j: int(j.start_time is not None and j.end_time is None),
+    ),
+    (
+        "relion_job_runs",
+        "Number of times the job was run by a schedule.",
+        "jobs",
+        lambda j: j.runs,
+    ),
+    (
+        "relion_job_cluster_jobs",
+        "Number of cluster jobs the job submitted.",
+        "jobs",
+        lambda j: j.cluster_jobs,
+    ),
+    (
+        "relion_job_queue_wait_seconds",
+        "Mean seconds from the job being run to it submitting a cluster job.",
+        "jobs",
+        lambda j: j.queue_wait,
+    ),
+    (
+        "relion_job_micrographs",
+        "Micrographs processed by the cluster jobs of the job.",
+        "jobs",
+        lambda j: j.micrographs,
+    ),
+    (
+        "relion_job_micrographs_per_hour",
+        "Micrographs processed by the job per hour.",
+        "jobs",
+        lambda j: j.micrographs_per_hour,
+    ),
+    (
+        "relion_stage_jobs",
+        "Number of jobs of the job type.",
+        "stages",
+        lambda s: s.jobs,
+    ),
+    (
+        "relion_stage_running_jobs",
+        "Number of jobs of the job type that are running.",
+        "stages",
+        lambda s: s.running,
+    ),
+    (
+        "relion_stage_duration_seconds",
+        "Seconds from the first start of a job of the type to the last end or now.",
+        "stages",
+        lambda s: s.duration,
+    ),
+    (
+        "relion_stage_micrographs",
+        "Micrographs processed by the jobs of the job type.",
+        "stages",
+        lambda s: s.micrographs,
+    ),
+    (
+        "relion_stage_micrographs_per_hour",
+        "Micrographs processed by the jobs of the job type per hour.",
+        "stages",
+        lambda s: s.micrographs_per_hour,
+    ),
+)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import copy
 import functools
-import uuid
+import itertools
 
-from relion.node.environment import Environment
+from relion.node.environment import Environment, _copy_value, _empty
+
+# node ids are unique within a process, which is all they are compared in
+_node_ids = itertools.count(1)
 
 
 @functools.total_ordering
@@ -14,20 +18,56 @@ class Node:
     and child nodes are kept in _in and _out.
     """
 
+    __slots__ = (
+        "_name",
+        "nodeid",
+        "_out",
+        "_in",
+        "_completed",
+        "environment",
+        "_link_traffic",
+        "_share_traffic",
+        "_append_traffic",
+        "_call_count",
+        "_in_multi_call",
+        "_can_append",
+        "shape",
+        "_descendants",
+        "_watched",
+    )
+
+    # counts renames of any node so that graphs know when to rebuild their
+    # name indexes
+    _renames = 0
+
+    # environment keys copied by clone, None for all of them
+    _clone_environment_keys = None
+
+    # whether nodes equal to this one always have the same _index_key, so
+    # that they can be looked up by it
+    _keyed_equality = True
+
     def __init__(self, name, independent=False, **kwargs):
         self._name = name
-        self.nodeid = str(uuid.uuid4())[:8]
+        self.nodeid = next(_node_ids)
         self._out = []
         self._in = []
         self._completed = []
         self.environment = Environment()
-        self._link_traffic = {}
-        self._share_traffic = {}
-        self._append_traffic = {}
+        # replaced by dicts when a link is made, see environment._empty
+        self._link_traffic = _empty
+        self._share_traffic = _empty
+        self._append_traffic = _empty
         self._call_count = 0
         self._in_multi_call = False
         self._can_append = independent
         self.shape = "oval"
+        # the ids and keys of the nodes reachable from this node, see
+        # _descendant_index
+        self._descendants = None
+        # whether this node may be held in the descendant index of a node,
+        # itself included
+        self._watched = False
         for key, value in kwargs.items():
             self.environment[key] = value
 
@@ -97,8 +137,52 @@ class Node:
     def name(self):
         return str(self._name)
 
+    @property
+    def _index_key(self):
+        """The key under which a Graph indexes this node"""
+        return self.name
+
     def change_name(self, new_name):
+        self._drop_descendants()
         self._name = new_name
+        Node._renames += 1
+
+    def clone(self, environment_keys=None):
+        """
+        A copy of this node, with the same name and nodeid, that is not linked
+        to any other node. Only the environment values with keys in
+        environment_keys are copied, or those in _clone_environment_keys if
+        environment_keys is None.
+        """
+        cloned = copy.copy(self)
+        self._refresh_clone(cloned, environment_keys)
+        return cloned
+
+    def _refresh_clone(self, cloned, environment_keys=None):
+        """
+        Bring an earlier clone of this node up to date with it, apart from its
+        name, leaving it unlinked as a new clone would be
+        """
+        if environment_keys is None:
+            environment_keys = self._clone_environment_keys
+        cloned._out = []
+        cloned._in = []
+        cloned._descendants = None
+        cloned._watched = False
+        cloned._completed = []
+        cloned.environment = self.environment.clone(keys=environment_keys)
+        cloned._link_traffic = _empty
+        cloned._share_traffic = _empty
+        cloned._append_traffic = _empty
+
+    def _clone_links(self, cloned, clones):
+        # link cloned as this node is linked, using the clones of the nodes
+        # keyed by the id of their originals
+        cloned._out = [clones[id(n)] for n in self._out]
+        cloned._in = [clones[id(n)] for n in self._in]
+        cloned._link_traffic = _copy_traffic(self._link_traffic)
+        cloned._share_traffic = _copy_traffic(self._share_traffic)
+        cloned._append_traffic = _copy_traffic(self._append_traffic)
 
     def link_to(
         self,
@@ -121,8 +205,11 @@ class Node:
         and the data transferred may therefore be affected by the call (default None)
         """
         if next_node not in self._out:
+            self._drop_descendants()
             self._out.append(next_node)
             next_node._in.append(self)
+            if self._link_traffic is _empty:
+                self._link_traffic = {}
             if traffic is None:
                 self._link_traffic[next_node.nodeid] = {}
             else:
@@ -130,6 +217,8 @@ class Node:
             if result_as_traffic:
                 self._link_traffic[next_node.nodeid] = None
             if share is not None:
+                if self._share_traffic is _empty:
+                    self._share_traffic = {}
                 self._share_traffic[next_node.nodeid] = share
 
     def propagate(self, share):
@@ -150,17 +239,106 @@ class Node:
         next_node -- node in this node's _out that is being unlinked
         """
         if next_node in self._out:
+            self._drop_descendants()
             self._out.remove(next_node)
 
-    def _is_child_checker(self, possible_child, checks):
-        if self == possible_child:
-            checks.extend([True])
-        for child in self:
-            checks.extend(child._is_child_checker(possible_child, checks=checks))
-        return checks
-
     def _is_child(self, possible_child):
-        if True in self._is_child_checker(possible_child, checks=[]):
+        """
+        Whether a node equal to possible_child can be reached from this node,
+        this node included
+        """
+        ids, keys = self._descendant_index()
+        if id(possible_child) in ids:
             return True
-        else:
+        if (
+            isinstance(possible_child, Node)
+            and possible_child._keyed_equality
+            and possible_child._index_key not in keys
+        ):
             return False
+        # an equal node that is not the same object, which is rare enough for
+        # the descendants to be compared one by one
+        return any(node == possible_child for node in _depth_first(self))
+
+    def _descendant_index(self) -> tuple:
+        """
+        The ids and the _index_keys of the nodes reachable from this node, this
+        node included. The index is built the first time it is needed, taking
+        in those of the nodes below that have one rather than walking past
+        them, and kept until the links below this node change, so that
+        ordering nodes does not walk the graph for every comparison.
+        """
+        if self._descendants is None:
+            ids = set()
+            keys = set()
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if id(node) in ids:
+                    continue
+                if node is not self and node._descendants is not None:
+                    # everything below a node that has an index is in it
+                    ids.update(node._descendants[0])
+                    keys.update(node._descendants[1])
+                    continue
+                node._watched = True
+                ids.add(id(node))
+                keys.add(node._index_key)
+                stack.extend(node._out)
+            self._descendants = (ids, keys)
+        return self._descendants
+
+    def _drop_descendants(self):
+        """
+        Drop the descendant indexes that hold this node, as its links or name
+        are about to change. Every node in a descendant index is marked as
+        watched, so the nodes linking to this one are only followed up to
+        those that are not.
+        """
+        self._descendants = None
+        if not self._watched:
+            return
+        self._watched = False
+        stack = list(self._in)
+        visited = {id(self)}
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            node._descendants = None
+            if node._watched:
+                node._watched = False
+                stack.extend(node._in)
+
+
+def _copy_traffic(traffic):
+    # traffic held for each link keyed by nodeid, as copied to a clone
+    if not traffic:
+        return _empty
+    return {nodeid: _copy_value(value) for nodeid, value in traffic.items()}
+
+
+def _depth_first(start, check=None, visited=None):
+    """
+    The nodes reachable from start, start included, in depth first pre-order.
+    Each node is given once, however many paths lead to it, and as a stack is
+    used rather than recursion the depth of the graph is not limited.
+
+    Keyword arguments:
+    check -- function called on each node before it is given (default None)
+    visited -- set of the ids of nodes that are not to be given, or followed,
+    to which the ids of the nodes given are added (default None)
+    """
+    if visited is None:
+        visited = set()
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        if check is not None:
+            check(node)
+        visited.add(id(node))
+        yield node
+        stack.extend(reversed(list(node)))
@@ -1,8 +1,48 @@
 from __future__ import annotations
 
+import collections.abc
+import copy
 import functools
 
 
+class _EmptyMapping(collections.abc.Mapping):
+    """
+    Stands in for the dicts of nodes and environments that have not been
+    written to yet, as most never are. Code writing to one of them replaces it
+    with a dict first.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        return "{}"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "_empty"
+
+
+_empty = _EmptyMapping()
+
+# the store of an Iterate that should not be iterated over, shared as it is
+# never changed in place
+_do_not_iterate = ["__do not iterate__"]
+
+
 def update_append(d01, d02):
     for key, value in d02.items():
         if key in d01:
@@ -13,15 +53,27 @@ def update_append(d01, d02):
             d01[key] = value
 
 
+def _copy_value(value):
+    # lists and dicts held in environments are updated in place, so copying
+    # them one level deep is enough to separate a clone from its original
+    if isinstance(value, (list, dict)):
+        return copy.copy(value)
+    return value
+
+
 class Propagate:
+    __slots__ = ("store", "released")
+
     def __init__(self):
-        self.store = {}
+        self.store = _empty
         self.released = False
 
     def __getitem__(self, key):
         return self.store[key]
 
     def __setitem__(self, key, value):
+        if self.store is _empty:
+            self.store = {}
         self.store[key] = value
         if not self.released:
             self.released = True
@@ -33,14 +85,19 @@ class Propagate:
             return []
 
     def update(self, in_dict):
-        self.store.update(in_dict)
+        if in_dict.keys():
+            if self.store is _empty:
+                self.store = {}
+            self.store.update(in_dict)
         if not self.released:
             self.released = True
 
 
 class Escalate:
+    __slots__ = ("store", "released")
+
     def __init__(self):
-        self.store = {}
+        self.store = _empty
         self.released = False
 
     def __getitem__(self, key):
@@ -56,8 +113,10 @@ class Escalate:
 
 
 class Iterate:
+    __slots__ = ("appended", "store")
+
     def __init__(self, initial_store):
-        self.appended = []
+        self.appended = ()
         self.store = initial_store
 
     def squash(self):
@@ -78,7 +137,7 @@ class Iterate:
                     self.store[i].update(tr)
             else:
                 self.store = squashed_appended
-            self.appended = []
+            self.appended = ()
 
     def __iter__(self):
         return iter(self.store)
@@ -89,6 +148,8 @@ class Iterate:
                 s.update(u)
         if isinstance(u, list):
             if can_append_list:
+                if not self.appended:
+                    self.appended = []
                 self.appended.append(u)
                 return
             if (
@@ -107,11 +168,21 @@ class Iterate:
 
 
 class Environment:
+    __slots__ = (
+        "base",
+        "iterate",
+        "iterator",
+        "propagate",
+        "escalate",
+        "temp",
+        "empty",
+    )
+
     def __init__(self, base=None):
         set_base(base, self)
         self.propagate = Propagate()
         self.escalate = Escalate()
-        self.temp = {}
+        self.temp = _empty
 
     def __getitem__(self, key):
         if key in self.base.keys():
@@ -141,7 +212,7 @@ class Environment:
             else:
                 self.empty = False
             if self.temp == "__do not iterate__":
-                self.temp = {}
+                self.temp = _empty
             return True
         except StopIteration:
             self.reset()
@@ -171,7 +242,28 @@ class Environment:
         self.propagate.update(prop)
 
     def reset(self):
-        self.iterate = Iterate(["__do not iterate__"])
+        self.iterate = Iterate(_do_not_iterate)
+
+    def clone(self, keys=None):
+        """
+        A new Environment holding the base values of this one for keys (all of
+        them if keys is None) and the values it propagates. Only lists and
+        dicts are copied, other values are shared. Temporary and escalated
+        values are not carried over.
+        """
+        cloned = Environment(
+            {
+                key: _copy_value(value)
+                for key, value in self.base.items()
+                if keys is None or key in keys
+            }
+        )
+        if self.propagate.store:
+            cloned.propagate.store = {
+                key: _copy_value(value) for key, value in self.propagate.store.items()
+            }
+        cloned.propagate.released = self.propagate.released
+        return cloned
 
 
 @functools.singledispatch
@@ -184,13 +276,13 @@ def set_base(base, env: Environment):
 @set_base.register(type(None))
 def _(base: type(None), env: Environment):
     env.base = {}
-    env.iterate = Iterate(["__do not iterate__"])
+    env.iterate = Iterate(_do_not_iterate)
 
 
 @set_base.register(dict)
 def _(base: dict, env: Environment):
     env.base = base
-    env.iterate = Iterate(["__do not iterate__"])
+    env.iterate = Iterate(_do_not_iterate)
 
 
 @set_base.register(list)
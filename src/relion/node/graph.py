@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from relion.node import Node
+import concurrent.futures
+
+from relion.node import Node, _depth_first
 
 try:
     from graphviz import Digraph
@@ -9,16 +11,24 @@ except ImportError:
 
 
 class Graph(Node):
-    def __init__(self, name, node_list, auto_connect=False):
+    # graphs are equal to any graph with the same nodes, whatever its name
+    _keyed_equality = False
+
+    def __init__(self, name, node_list, auto_connect=False, max_workers: int = 1):
         super().__init__(name)
         self._node_list = node_list
+        # number of threads the nodes of the graph are called on, see
+        # _traverse_in_waves
+        self._max_workers = max_workers
+        self._name_index = None
+        self._name_index_state = None
         try:
             self.origins = self.find_origins()
         except IndexError:
             self.origins = []
         self._call_returns = {}
-        self._called_nodes = []
-        self._traversed = []
+        self._called_nodes = set()
+        self._traversed = set()
         if auto_connect:
             self._check_connections()
 
@@ -54,14 +64,107 @@ class Graph(Node):
     def nodes(self):
         return self._node_list
 
+    def _node_index(self) -> dict:
+        """
+        The nodes of the graph grouped by name, in graph order. The index is
+        rebuilt when any node has been renamed or the node list has been
+        changed other than through the graph.
+        """
+        state = (Node._renames, len(self._node_list))
+        if self._name_index is None or self._name_index_state != state:
+            self._name_index = {}
+            for node in self._node_list:
+                self._name_index.setdefault(node._index_key, []).append(node)
+            self._name_index_state = state
+        return self._name_index
+
+    def _index_added(self, new_nodes):
+        # new_nodes have just been appended to the node list
+        if self._name_index_state != (
+            Node._renames,
+            len(self._node_list) - len(new_nodes),
+        ):
+            return
+        for node in new_nodes:
+            self._name_index.setdefault(node._index_key, []).append(node)
+        self._name_index_state = (Node._renames, len(self._node_list))
+
+    def _find(self, node):
+        """
+        The first node of the graph equal to node, which may be a Node or a
+        name, or None if there is none
+        """
+        key = node._index_key if isinstance(node, Node) else str(node)
+        for candidate in self._node_index().get(key, ()):
+            if candidate is node or candidate == node:
+                return candidate
+        return None
+
+    def _holds(self, node) -> bool:
+        """Whether this exact node object is part of the graph"""
+        return any(
+            candidate is node
+            for candidate in self._node_index().get(node._index_key, ())
+        )
+
+    def get_by_name(self, name):
+        for node in self._node_index().get(str(name), ()):
+            if node.name == str(name):
+                return node
+        return None
+
+    def clone(self, environment_keys=None, reuse=None):
+        """
+        A copy of the graph in which every node, and every node linked to
+        them, is replaced by its clone (see Node.clone), linked in the same
+        way. This is much cheaper than a deepcopy as anything else attached
+        to the nodes, like results held in their environments, is not copied.
+
+        Keyword arguments:
+        environment_keys -- the environment keys to copy (default None, see
+        Node.clone)
+        reuse -- dict of earlier clones of nodes of the graph keyed by nodeid.
+        These are brought up to date and used in place of new clones, so that
+        the nodes of repeated clones of a changing graph stay the same objects
+        (default None)
+        """
+        reuse = reuse or {}
+        cloned = super().clone(environment_keys)
+        cloned._name_index = None
+        cloned._name_index_state = None
+        cloned._call_returns = {}
+        cloned._called_nodes = set()
+        cloned._traversed = set()
+        originals = {id(self): self}
+        clones = {id(self): cloned}
+        pending = list(self._node_list)
+        while pending:
+            node = pending.pop()
+            if id(node) in clones:
+                continue
+            originals[id(node)] = node
+            if node.nodeid in reuse:
+                clones[id(node)] = reuse[node.nodeid]
+                node._refresh_clone(clones[id(node)], environment_keys)
+            else:
+                clones[id(node)] = node.clone(environment_keys)
+            pending.extend(node._out)
+            pending.extend(node._in)
+        for key, node in originals.items():
+            if node is not self:
+                node._clone_links(clones[key], clones)
+        cloned._node_list = [clones[id(n)] for n in self._node_list]
+        cloned.origins = [clones.get(id(n), n) for n in self.origins]
+        return cloned
+
     def func(self, *args, **kwargs):
         self._call_returns = {}
         if self._in_multi_call:
             for node in self.origins:
                 node._completed = self._completed
         self.traverse()
-        self._traversed = []
-        self._called_nodes = []
+        self._traversed = set()
+        self._called_nodes = set()
         for node in self.nodes:
             node.environment.reset()
             node._completed = []
@@ -83,26 +186,53 @@ class Graph(Node):
         if not isinstance(other, Graph):
             raise ValueError("Can only extend a ProtoGraph with another Graph")
         self._node_list.extend(other._node_list)
+        self._index_added(other._node_list)
 
     def index(self, node):
-        return self._node_list.index(node)
+        found = self._find(node)
+        if found is not None:
+            for position, candidate in enumerate(self._node_list):
+                if candidate is found:
+                    return position
+        raise ValueError(f"{node!r} is not in {self.name}")
 
     def link_from_to(self, from_node, to_node):
-        self[self.index(from_node)].link_to(to_node)
+        found = self._find(from_node)
+        if found is None:
+            raise ValueError(f"{from_node!r} is not in {self.name}")
+        found.link_to(to_node)
 
-    def node_explore(self, node, explored):
+    def _check_explorable(self, node):
         if not isinstance(node, Node):
             raise ValueError(
                 "Graph.node_explore must be called with a ProtoNode as the starting point; a string or similar is insufficient"
             )
-        if node not in explored:
-            explored.append(node)
-        for next_node in node:
-            self.node_explore(next_node, explored)
+
+    def node_explore(self, node, explored):
+        """
+        Append node and the nodes below it to explored in depth first
+        pre-order, leaving out those equal to a node already in explored
+        """
+        explored_by_key = {}
+        for n in explored:
+            explored_by_key.setdefault(n._index_key, []).append(n)
+        for next_node in _depth_first(node, check=self._check_explorable):
+            if isinstance(next_node, Graph):
+                # graphs are equal to any graph with the same nodes
+                if next_node in explored:
+                    continue
+            elif any(
+                n is next_node or n == next_node
+                for n in explored_by_key.get(next_node._index_key, ())
+            ):
+                continue
+            explored.append(next_node)
+            explored_by_key.setdefault(next_node._index_key, []).append(next_node)
 
     def add_node(self, new_node, auto_connect=False):
         if isinstance(new_node, Node):
             self._node_list.append(new_node)
+            self._index_added([new_node])
             if auto_connect:
                 for i_node in new_node._in:
                     if i_node not in self._node_list:
@@ -112,33 +242,77 @@ class Graph(Node):
             raise ValueError("Attempted to add a node that was not a Node")
 
     def remove_node(self, node_name, advance=False):
+        self.remove_nodes([node_name], advance=advance)
+
+    def remove_nodes(self, node_names, advance=False):
+        """
+        Remove nodes from the graph, in order, linking the nodes in front of
+        each to the nodes behind it. The node list is only rebuilt once, so
+        removing many nodes takes time linear in the size of the graph.
+
+        Keyword arguments:
+        node_names -- names (or nodes) of the nodes to remove
+        advance -- whether released propagated data of a removed node should
+        also be applied to the environment of its child nodes. Either a bool
+        for all nodes or a collection holding the names of the nodes it
+        applies to (default False)
+        """
+        removed = set()
+        try:
+            for node_name in node_names:
+                node = self._find(node_name)
+                if node is None:
+                    raise ValueError(f"{node_name!r} is not in {self.name}")
+                if isinstance(advance, bool):
+                    advance_node = advance
+                else:
+                    advance_node = node_name in advance
+                self._detach_node(node, node_name, advance_node)
+                self._name_index[node._index_key] = [
+                    n for n in self._name_index[node._index_key] if n is not node
+                ]
+                removed.add(id(node))
+        finally:
+            if removed:
+                self._node_list[:] = [
+                    n for n in self._node_list if id(n) not in removed
+                ]
+                self._name_index_state = (Node._renames, len(self._node_list))
+
+    def _detach_node(self, node, node_name, advance):
+        if node.environment.propagate.released:
+            for next_node in node:
+                next_node.environment.update_prop(node.environment.propagate.store)
+                if advance:
+                    next_node.environment.update(node.environment.propagate.store)
         behind_nodes = []
-        for currnode in self._node_list:
-            if currnode.name == str(node_name):
-                if currnode.environment.propagate.released:
-                    for next_node in currnode:
-                        next_node.environment.update_prop(
-                            currnode.environment.propagate.store
-                        )
-                        if advance:
-                            next_node.environment.update(
-                                currnode.environment.propagate.store
-                            )
-            if node_name in currnode:
+        for currnode in node._in:
+            if (
+                self._holds(currnode)
+                and all(b is not currnode for b in behind_nodes)
+                and node_name in currnode
+            ):
                 behind_nodes.append(currnode)
                 currnode.unlink_from(node_name)
-            if node_name in currnode._in:
+        for currnode in node._out:
+            if self._holds(currnode) and node_name in currnode._in:
                 currnode._in.remove(node_name)
         for bnode in behind_nodes:
-            for next_node in self._node_list[self._node_list.index(node_name)]:
+            for next_node in node:
                 bnode.link_to(next_node)
-        self._node_list.remove(node_name)
 
     def find_origins(self):
-        child_nodes = []
+        child_nodes = {}
         for node in self.nodes:
-            child_nodes.extend(node)
-        origins = [p for p in self.nodes if p not in child_nodes]
+            for child in node:
+                child_nodes.setdefault(child._index_key, []).append(child)
+        origins = [
+            p
+            for p in self.nodes
+            if not any(
+                child is p or child == p for child in child_nodes.get(p._index_key, ())
+            )
+        ]
         return origins
 
     def merge(self, other):
@@ -146,64 +320,172 @@ class Graph(Node):
         other_names = [p._name for p in other.nodes]
         if len(set(node_names).intersection(set(other_names))) > 0:
             for new_node in other.nodes:
-                if new_node not in self.nodes:
+                node = self._find(new_node)
+                if node is None:
                     self.add_node(new_node)
                 else:
                     for next_node in new_node:
-                        if next_node not in self.nodes[self.index(new_node)]:
-                            self.nodes[self.index(new_node)].link_to(next_node)
+                        if next_node not in node:
+                            node.link_to(next_node)
             return True
         else:
             return False
 
     def traverse(self):
+        """
+        Call the nodes of the graph by following the links from its origins.
+        Which nodes can be called when a node is reached depends on the nodes
+        that have completed by then, so the order is found while following
+        the links rather than taken from an order worked out in advance.
+        """
+        if self._max_workers > 1:
+            self._traverse_in_waves()
+            return
         for o in self.origins:
             self._follow(o, traffic={}, share=[], append=o._can_append)
 
-    def _follow(self, node, traffic, share, append=False):
-        called = False
-        if node not in self.nodes:
-            return
-        if node.nodeid in self._called_nodes:
-            called = True
-        node.environment.update(traffic, can_append_list=append)
+    def _traverse_in_waves(self):
+        """
+        Call the nodes of the graph in waves. The links are followed as
+        traverse follows them, passing on traffic, shared values and
+        propagated environments, but a node that is ready to be called, as
+        all the nodes linking to it have completed, is put in the next wave
+        instead of being called straight away. Each wave is called on a pool
+        of threads and once it has returned the links of its nodes are
+        followed in the order the nodes became ready, to find the next wave.
+        A link that passes on what its node returns is only followed once the
+        node has been called, as its wave may still be to come.
+        """
+        # the nodes of the next wave keyed by id(), in the order they became ready
+        wave = {}
+        for o in self.origins:
+            self._follow(o, traffic={}, share=[], append=o._can_append, wave=wave)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as pool:
+            while wave:
+                called, wave = list(wave.values()), {}
+                results = list(pool.map(lambda node: node(), called))
+                for node, result in zip(called, results):
+                    self._call_returns[node.nodeid] = result
+                    self._called_nodes.add(node.nodeid)
+                for node in called:
+                    self._follow_links(node, True, wave)
 
+    def _contains(self, node) -> bool:
+        if isinstance(node, Graph):
+            # graphs are equal to any graph with the same nodes
+            return node in self._node_list
+        return self._find(node) is not None
+
+    def _enter(self, node, traffic, share, append, wave=None):
+        """
+        Pass traffic and shared values to a node, calling it if every node
+        linking to it has completed, or adding it to wave if a wave is given.
+        Returns whether the node has been called, or None if it is not part
+        of the graph or has been added to the wave.
+        """
+        if not self._receive(node, traffic, share, append):
+            return None
+        if self._is_ready(node):
+            if wave is not None:
+                wave.setdefault(id(node), node)
+                return None
+            self._call_returns[node.nodeid] = node()
+            self._called_nodes.add(node.nodeid)
+        return node.nodeid in self._called_nodes
+
+    def _receive(self, node, traffic, share, append) -> bool:
+        """
+        Pass traffic and shared values to a node, returning whether it is part
+        of the graph
+        """
+        if not self._contains(node):
+            return False
+        node.environment.update(traffic, can_append_list=append)
         for sh in share:
             node.environment[sh[1]] = sh[0]
+        return True
 
-        if (
-            all(n in node._completed for n in node._in)
-            and node.nodeid not in self._called_nodes
-        ):
-            called = True
+    def _is_ready(self, node) -> bool:
+        """Whether node is still to be called and every node linking to it has completed"""
+        return node.nodeid not in self._called_nodes and all(
+            n in node._completed for n in node._in
+        )
 
-            self._call_returns[node.nodeid] = node()
-            self._called_nodes.append(node.nodeid)
-
-        for next_node in node:
-            next_node.environment.update_prop(node.environment.propagate)
-            next_traffic = node._link_traffic.get(next_node.nodeid, {})
-            if next_traffic is None:
-                next_traffic = self._call_returns[node.nodeid]
-            next_share = []
-            if node._share_traffic.get(next_node.nodeid) is not None:
-                for sh in node._share_traffic[next_node.nodeid]:
-                    next_share.append((node.environment[sh[0]], sh[1]))
-            if (node.nodeid, next_node.nodeid) not in self._traversed and called:
-                self._traversed.append((node.nodeid, next_node.nodeid))
-                self._follow(
-                    next_node,
-                    next_traffic,
-                    next_share,
-                    append=node._can_append,
-                )
-            elif not called:
-                self._follow(
-                    next_node,
-                    next_traffic,
-                    next_share,
-                    append=node._can_append,
+    def _link_values(self, node, next_node):
+        """The traffic and shared values passed along the link from node to next_node"""
+        next_traffic = node._link_traffic.get(next_node.nodeid, {})
+        if next_traffic is None:
+            next_traffic = self._call_returns[node.nodeid]
+        next_share = []
+        if node._share_traffic.get(next_node.nodeid) is not None:
+            for sh in node._share_traffic[next_node.nodeid]:
+                next_share.append((node.environment[sh[0]], sh[1]))
+        return next_traffic, next_share
+
+    def _follow(self, node, traffic, share, append=False, wave=None):
+        """
+        Visit node and then follow its links depth first. A node that has been
+        called passes on its traffic along each link once, while one that has
+        not passes it on every time it is visited. This is the order of a
+        recursive walk, but a stack of the nodes being visited is kept instead
+        so that the depth of the graph is not limited. If wave is given the
+        nodes that are ready to be called are added to it, see _enter, and
+        their links are not followed.
+        """
+        called = self._enter(node, traffic, share, append, wave)
+        if called is None:
+            return
+        self._follow_links(node, called, wave)
+
+    def _follow_links(self, node, called, wave=None):
+        """Follow the links of a node that has been visited, see _follow"""
+        # (node, whether it has been called, iterator over its links)
+        stack = [(node, called, iter(node))]
+        # for each node visited without being called that is still in the
+        # stack, how far the traversal had got when it was visited. If it is
+        # reached again, still not called, without anything having been called
+        # or followed since then it would be visited again without end.
+        uncalled = {} if called else {id(node): [self._progress()]}
+        while stack:
+            node, called, next_nodes = stack[-1]
+            for next_node in next_nodes:
+                next_node.environment.update_prop(node.environment.propagate)
+                if (
+                    wave is not None
+                    and not called
+                    and node._link_traffic.get(next_node.nodeid, {}) is None
+                ):
+                    # the traffic is what node returns, and it is still to be
+                    # called once the nodes of the wave have been
+                    continue
+                next_traffic, next_share = self._link_values(node, next_node)
+                if called:
+                    if (node.nodeid, next_node.nodeid) in self._traversed:
+                        continue
+                    self._traversed.add((node.nodeid, next_node.nodeid))
+                next_called = self._enter(
+                    next_node, next_traffic, next_share, node._can_append, wave
                 )
+                if next_called is None:
+                    continue
+                if not next_called:
+                    visits = uncalled.setdefault(id(next_node), [])
+                    if visits and visits[-1] == self._progress():
+                        raise RecursionError(
+                            f"Following the links of {self.name} from {next_node!r} leads back to it"
+                        )
+                    visits.append(self._progress())
+                stack.append((next_node, next_called, iter(next_node)))
+                break
+            else:
+                stack.pop()
+                if not called:
+                    uncalled[id(node)].pop()
+
+    def _progress(self) -> int:
+        return len(self._called_nodes) + len(self._traversed)
 
     def show(self):
         try:
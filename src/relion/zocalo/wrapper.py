@@ -169,6 +169,8 @@ class RelionWrapper(zocalo.wrapper.BaseWrapper):
                 "images_particles": images_particles_msgs,
             },
             version=self.params.get("relion_version", 3),
+            parser_threads=self.params.get("parser_threads", 1),
+            persistent_cache=self.params.get("persistent_cache", False),
         )
 
         while not relion_prj.origin_present() or (
@@ -179,6 +181,8 @@ class RelionWrapper(zocalo.wrapper.BaseWrapper):
                 break
 
         relion_prj.load()
+        # only reload the jobs that changed since the last load if asked to
+        incremental_load = self.params.get("incremental_load", False)
 
         preproc_recently_run = False
         processing_ended = False
@@ -204,7 +208,7 @@ class RelionWrapper(zocalo.wrapper.BaseWrapper):
 
             if pathlib.Path(self.params["stop_file"]).is_file():
                 logger.info("Stop file encountered")
-                relion_prj.load()
+                relion_prj.load(incremental=incremental_load)
                 for job_path in relion_prj._job_nodes:
                     (
                         self.results_directory
@@ -216,7 +220,7 @@ class RelionWrapper(zocalo.wrapper.BaseWrapper):
                 logger.info("Instructed Relion to stop. Terminating main loop.")
                 break
 
-            relion_prj.load()
+            relion_prj.load(incremental=incremental_load)
 
             # Should only return results that have not previously been sent
 
@@ -403,6 +407,8 @@ class RelionWrapper(zocalo.wrapper.BaseWrapper):
                 n.environment["status"] for n in relion_prj if n._out
             ]
 
+        relion_prj.close()
+
         if preprocess_check.is_file():
             preprocess_check.unlink()
 
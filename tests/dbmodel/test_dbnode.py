@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import datetime
+import sys
 from typing import NamedTuple
 
 import pytest
 
 import relion
-from relion.dbmodel import modeltables
+from relion.dbmodel import DBModel, modeltables
 from relion.dbmodel.dbnode import DBNode
+from relion.node import Node
+from relion.node.graph import Graph
 
 
 class Options(NamedTuple):
@@ -67,15 +71,120 @@ def test_correct_motion_correction_inserts_on_mc_table(mc_table):
         == "MotionCorr/job002/Movies/20170629_00021_frameImage.mrc"
     )
     second_row = mc_table.get_row_by_primary_key(base_id + 1)
-    assert second_row["total_motion"] == "19.551677"
+    assert second_row["total_motion"] == 19.551677
 
 
 def test_correct_inserts_on_ctf_table(ctf_table):
     base_id = sorted(ctf_table["ctf_id"])[0]
     first_row = ctf_table.get_row_by_primary_key(base_id)
     assert len(ctf_table["ctf_id"]) == 24
-    assert first_row["astigmatism"] == "288.135742"
+    assert first_row["astigmatism"] == 288.135742
 
 
 def test_boolean_db_node(mc_db_node):
     assert mc_db_node
+
+
+class PreprocessingOptions(NamedTuple):
+    motioncor_doseperframe: float = 1
+    motioncor_patches_x: int = 5
+    motioncor_patches_y: int = 5
+    ctffind_boxsize: int = 512
+    ctffind_minres: float = 5
+    ctffind_maxres: float = 30
+    ctffind_defocus_min: float = 5000
+    ctffind_defocus_max: float = 50000
+    ctffind_defocus_step: float = 500
+    cryolo_gmodel: str = ""
+    extract_boxsize: int = 256
+    angpix: float = 0.885
+    motioncor_binning: int = 1
+
+
+class _Job(Node):
+    # stands in for a job node, giving its rows to the database node it links to
+    def __init__(self, name, rows):
+        super().__init__(name)
+        self._rows = rows
+        self.environment["end_time_stamp"] = datetime.datetime(2021, 1, 1)
+
+    def func(self, *args, **kwargs):
+        return [dict(row) for row in self._rows]
+
+
+def _preprocessing_pipeline(max_workers, micrographs=100):
+    model = DBModel("ISPyB")
+    mics = [f"MotionCorr/job002/Movies/mic_{i}.mrc" for i in range(micrographs)]
+    jobs = {
+        "MotionCorr": _Job(
+            "MotionCorr",
+            [{"micrograph_full_path": m, "total_motion": 1.5} for m in mics],
+        ),
+        "CtfFind": _Job(
+            "CtfFind", [{"micrograph_full_path": m, "astigmatism": 2.5} for m in mics]
+        ),
+        "External/Icebreaker_5fig/": _Job(
+            "External", [{"micrograph_full_path": m, "minimum": 1} for m in mics]
+        ),
+        "AutoPick": _Job(
+            "AutoPick",
+            [
+                {
+                    "micrograph_full_path": m,
+                    "number_of_particles": 3,
+                    "job_string": "AutoPick/job004",
+                }
+                for m in mics
+            ],
+        ),
+    }
+    nodes = list(jobs.values())
+    for job in nodes[1:]:
+        jobs["MotionCorr"].link_to(job)
+    for label, job in jobs.items():
+        db_node = model[label]
+        db_node.environment["extra_options"] = PreprocessingOptions()
+        db_node.environment["message_constructors"] = {
+            "ispyb": lambda table, pid, **kwargs: {"id": pid}
+        }
+        job.link_to(
+            db_node, result_as_traffic=True, share=[("end_time_stamp", "end_time")]
+        )
+        nodes.append(db_node)
+    graph = Graph("DataPipeline", nodes, max_workers=max_workers)
+    return model, graph
+
+
+def test_database_model_is_filled_alike_in_waves():
+    interval = sys.getswitchinterval()
+    # switch threads as often as possible so that races show up
+    sys.setswitchinterval(1e-6)
+    try:
+        filled = []
+        for max_workers in (1, 4, 4, 4):
+            model, graph = _preprocessing_pipeline(max_workers)
+            returns = graph()
+            mc_ids = model["MotionCorr"].tables[0]["motion_correction_id"]
+            filled.append(
+                (
+                    len(mc_ids),
+                    [
+                        [i - mc_ids[0] for i in model[label].tables[0][column]]
+                        for label, column in (
+                            ("CtfFind", "motion_correction_id"),
+                            ("External/Icebreaker_5fig/", "motion_correction_id"),
+                            ("AutoPick", "first_motion_correction_id"),
+                        )
+                    ],
+                    sorted(
+                        sum(1 for r in node_returns if "ispyb" in r)
+                        for node_returns in returns.values()
+                    ),
+                )
+            )
+    finally:
+        sys.setswitchinterval(interval)
+    assert filled[0][0] == 100
+    assert filled[0][1] == [list(range(100))] * 3
+    assert filled[0][2] == [0] * 4 + [100] * 4
+    assert all(f == filled[0] for f in filled[1:])
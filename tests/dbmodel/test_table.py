@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import concurrent.futures
 import random
+import sys
 
 import pytest
 
@@ -371,3 +373,63 @@ def test_get_row_by_primary_key(fake_table, unique_value):
 def test_motion_correction_table_has_correct_columns():
     mctab = MotionCorrectionTable()
     assert "motion_correction_id" in mctab.columns
+
+
+def test_unique_column_index_is_not_changed_by_lookups(unique_value):
+    table = Table(
+        ["primary_id", "unique_value", "comment"],
+        "primary_id",
+        unique=["unique_value", "comment"],
+    )
+    first = table.add_row({"unique_value": unique_value, "comment": "a"})
+    table.add_row({"unique_value": unique_value + 1, "comment": "a"})
+    indices = table.get_row_index("comment", "a")
+    assert indices == [0, 1]
+    indices.append(2)
+    table._row_indices("comment", "a").clear()
+    assert table.get_row_index("comment", "a") == [0, 1]
+    table.add_row({"unique_value": unique_value, "comment": "a"})
+    assert len(table["primary_id"]) == 2
+    assert table.get_row_index("primary_id", first) == 0
+
+
+def test_rows_are_found_by_index_and_by_scan_alike(fake_table):
+    for i in range(50):
+        fake_table.add_row(
+            {"unique_value": i % 20, "comment": str(i), "appendable": i % 3}
+        )
+    assert len(fake_table["primary_id"]) == 20
+    assert "unique_value" in fake_table._indexes
+    for column in ("primary_id", "unique_value", "comment", "appendable"):
+        values = []
+        for value in fake_table[column]:
+            if value not in values:
+                values.append(value)
+        for value in values:
+            expected = [i for i, e in enumerate(fake_table[column]) if e == value]
+            found = fake_table.get_row_index(column, value)
+            assert (found if isinstance(found, list) else [found]) == expected
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    # switch threads as often as possible so that races show up
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_rows_added_from_several_threads_are_merged(
+    fake_table, frequent_thread_switches
+):
+    def add_rows(thread):
+        for i in range(200):
+            fake_table.add_row({"unique_value": i, "appendable": thread})
+            assert fake_table.get_row_index("unique_value", i) == i
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(add_rows, range(8)))
+    assert len(fake_table["primary_id"]) == 200
+    assert sorted(fake_table["count"]) == list(range(1, 201))
+    assert all(sorted(a) == list(range(8)) for a in fake_table["appendable"])
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from unittest import mock
 
 import pytest
@@ -174,12 +175,133 @@ def test_process_graph_merge_does_not_merge_if_merging_graph_is_not_connected_to
     assert not merged
 
 
+def test_graph_clone_copies_topology_but_not_nodes(node, graph):
+    node.environment["result"] = object()
+    node.environment["counts"] = [1, 2]
+    node._link_traffic[list(node)[0].nodeid] = {"key": "value"}
+    cloned = graph.clone()
+    assert cloned == graph
+    assert [n.nodeid for n in cloned] == [n.nodeid for n in graph]
+    assert not any(c is n for c, n in zip(cloned.nodes, graph.nodes))
+    assert all(c is n for c, n in zip(cloned[0], cloned.nodes[1:]))
+    assert cloned[1]._in == [cloned[0]] and cloned[1]._in[0] is cloned[0]
+    assert cloned.origins == [cloned[0]] and cloned.origins[0] is cloned[0]
+    assert cloned[0].environment["result"] is node.environment["result"]
+    cloned[0].environment["counts"].append(3)
+    cloned[0]._link_traffic[list(node)[0].nodeid]["key"] = "other"
+    assert node.environment["counts"] == [1, 2]
+    assert node._link_traffic[list(node)[0].nodeid] == {"key": "value"}
+    assert cloned.get_by_name("B") is cloned[1]
+
+
+def test_graph_clone_only_copies_requested_environment_keys(node, graph):
+    node.environment["status"] = True
+    node.environment["result"] = object()
+    node.environment["propagated"] = 3
+    node.propagate(("propagated", "propagated"))
+    cloned = graph.clone(environment_keys={"status"})
+    assert cloned[0].environment["status"]
+    assert cloned[0].environment["result"] is None
+    assert "result" not in cloned[0].environment.base
+    assert cloned[0].environment.propagate.store == {"propagated": 3}
+
+
 def test_calling_graph_gives_results_for_all_nodes(node, graph):
     graph()
     assert len(graph._call_returns.values()) == len(graph.nodes)
     assert graph._call_returns[node.nodeid] is None
 
 
+def test_deep_graphs_are_traversed_without_recursion():
+    nodes = [Node(f"node{i}") for i in range(5000)]
+    for node, next_node in zip(nodes, nodes[1:]):
+        node.link_to(next_node)
+    deep_graph = Graph("deep", nodes)
+    explored = []
+    deep_graph.node_explore(nodes[0], explored)
+    assert len(explored) == len(nodes)
+    assert nodes[0]._is_child(nodes[-1])
+    deep_graph()
+    assert len(deep_graph._call_returns) == len(nodes)
+
+
+class _Collector(Node):
+    # returns the value it was sent, waiting for the other collectors of its
+    # wave if given a barrier
+    def __init__(self, name, barrier=None):
+        super().__init__(name)
+        self._barrier = barrier
+
+    def func(self, *args, **kwargs):
+        if self._barrier is not None:
+            self._barrier.wait(timeout=5)
+        self.environment["collected"] = self.environment["value"]
+        return self.environment["value"]
+
+
+def _fan_out_graph(max_workers, barrier=None):
+    origin = _Collector("origin")
+    origin.environment["value"] = 1
+    branches = [_Collector(f"branch{i}", barrier) for i in range(3)]
+    sink = _Collector("sink")
+    for i, branch in enumerate(branches):
+        origin.link_to(branch, traffic={"value": i})
+        branch.link_to(sink, share=[("collected", f"from_branch{i}")])
+    sink.environment["value"] = 0
+    return Graph("fan", [origin, *branches, sink], max_workers=max_workers)
+
+
+def test_calling_graph_in_waves_gives_the_same_results():
+    sequential = _fan_out_graph(1)
+    in_waves = _fan_out_graph(4)
+    sequential_returns = sequential()
+    in_wave_returns = in_waves()
+    assert [in_wave_returns[n.nodeid] for n in in_waves.nodes] == [
+        sequential_returns[n.nodeid] for n in sequential.nodes
+    ]
+    sink = in_waves.nodes[-1]
+    assert [sink.environment[f"from_branch{i}"] for i in range(3)] == [0, 1, 2]
+
+
+def test_calling_graph_in_waves_calls_independent_nodes_concurrently():
+    # the branches can only all get past the barrier if they run at once
+    graph = _fan_out_graph(3, barrier=threading.Barrier(3))
+    assert len(graph()) == 5
+
+
+def _gated_graph(max_workers):
+    # gate is never called as a node outside the graph links to it, but the
+    # traffic it receives is still passed on to the nodes behind it
+    origin = _Collector("origin")
+    origin.environment["value"] = 1
+    gate = _Collector("gate")
+    Node("outside").link_to(gate)
+    after = _Collector("after")
+    origin.link_to(gate, traffic={"value": 2})
+    gate.link_to(after, traffic={"passed": 3}, share=[("value", "from_gate")])
+    side = _Collector("side")
+    origin.link_to(side, traffic={"value": 4})
+    return Graph("gated", [origin, gate, after, side], max_workers=max_workers)
+
+
+def test_calling_graph_in_waves_passes_traffic_through_uncalled_nodes():
+    environments = []
+    for max_workers in (1, 3):
+        graph = _gated_graph(max_workers)
+        graph.traverse()
+        assert sorted(graph._called_nodes) == sorted(
+            n.nodeid for n in graph.nodes if n.name in ("origin", "side")
+        )
+        environments.append(
+            [
+                {key: n.environment[key] for key in ("value", "passed", "from_gate")}
+                for n in graph.nodes
+            ]
+        )
+    assert environments[0] == environments[1]
+    assert environments[1][2] == {"value": None, "passed": 3, "from_gate": 2}
+
+
 @mock.patch("relion.node.graph.Digraph")
 def test_process_graph_show_all_nodes(mock_Digraph, graph):
     graph.show()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+import relion.node
 from relion.node import Node
 
 
@@ -100,3 +101,69 @@ def test_propagate_adds_correctly_to_environment():
     node_A.propagate(("a", "b"))
     assert node_A.environment["b"] == 1
     assert node_A.environment.propagate.store == {"b": 1}
+
+
+def test_nodes_only_hold_the_traffic_they_are_given():
+    node_A = Node("A")
+    node_B = Node("B")
+    assert not hasattr(node_A, "__dict__")
+    assert node_A._link_traffic == {} and node_A._share_traffic == {}
+    node_A.link_to(node_B, share=[("a", "b")])
+    assert node_A._link_traffic == {node_B.nodeid: {}}
+    assert node_A._share_traffic == {node_B.nodeid: [("a", "b")]}
+    assert node_B._share_traffic == {}
+    assert node_A.nodeid != node_B.nodeid
+
+
+def test_propagate_store_is_only_filled_when_written_to():
+    node_A = Node("A")
+    node_B = Node("B")
+    node_B.environment.update_prop(node_A.environment.propagate)
+    assert node_B.environment.propagate.released
+    assert node_B.environment.propagate.store == {}
+    node_A.environment.propagate["a"] = 1
+    node_B.environment.update_prop(node_A.environment.propagate)
+    assert node_B.environment["a"] == 1
+    assert node_A.environment.propagate.store == {"a": 1}
+
+
+def test_sorting_a_wide_graph_does_not_walk_it_again(monkeypatch):
+    walks = []
+    depth_first = relion.node._depth_first
+
+    def counted_depth_first(start, *args, **kwargs):
+        walks.append(start)
+        return depth_first(start, *args, **kwargs)
+
+    monkeypatch.setattr(relion.node, "_depth_first", counted_depth_first)
+    # every node of a layer links to every node of the next one, so the nodes
+    # of the last layers are shared by every path through the graph
+    layers = [[Node(f"layer{i}:node{j}") for j in range(10)] for i in range(5)]
+    for layer, next_layer in zip(layers, layers[1:]):
+        for node in layer:
+            for next_node in next_layer:
+                node.link_to(next_node)
+    nodes = [n for layer in reversed(layers) for n in layer]
+    sorted(nodes)
+    assert all(layers[0][0] < n for n in layers[-1])
+    assert not any(n < layers[0][0] for n in layers[-1])
+    indexes = [n._descendants for n in nodes]
+    sorted(nodes)
+    assert all(n._descendants is index for n, index in zip(nodes, indexes))
+    assert not walks
+
+
+def test_child_checking_follows_link_changes_and_renames():
+    nodes = [Node(f"node{i}") for i in range(4)]
+    nodes[0].link_to(nodes[1])
+    nodes[1].link_to(nodes[2])
+    assert nodes[0]._is_child(nodes[2])
+    assert not nodes[0]._is_child(nodes[3])
+    nodes[2].link_to(nodes[3])
+    assert nodes[0] < nodes[3]
+    nodes[1].unlink_from(nodes[2])
+    assert not nodes[0]._is_child(nodes[3])
+    assert nodes[2]._is_child(nodes[3])
+    nodes[1].change_name("renamed")
+    assert nodes[0]._is_child(Node("renamed"))
+    assert not nodes[0]._is_child(Node("node1"))
@@ -94,7 +94,7 @@ def test_invalid_job_references_raise_KeyErrors(ctffind):
 
 
 def test_astigmatism(ctffind):
-    assert ctffind["job003"][0].astigmatism == "288.135742"
+    assert ctffind["job003"][0].astigmatism == 288.135742
 
 
 @pytest.mark.skipif(sys.platform == "win32", reason="does not run on windows")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from relion._parser.dirsnapshot import DirectorySnapshot
+
+
+@pytest.fixture
+def job_dir(tmp_path):
+    (tmp_path / "Movies" / "GridSquare_1").mkdir(parents=True)
+    (tmp_path / "Movies" / "GridSquare_1" / "mic_01.star").write_text("data_\n")
+    (tmp_path / "Movies" / "mic_02.star").write_text("data_\n")
+    (tmp_path / "corrected_micrographs.star").write_text("data_\n")
+    return tmp_path
+
+
+def test_stat_matches_os_stat_for_existing_files(job_dir):
+    snapshot = DirectorySnapshot()
+    star_file = job_dir / "corrected_micrographs.star"
+    assert snapshot.stat(star_file).st_size == star_file.stat().st_size
+    assert snapshot.exists(star_file)
+    assert snapshot.is_file(star_file)
+    assert snapshot.is_dir(job_dir / "Movies")
+    assert not snapshot.is_file(job_dir / "Movies")
+
+
+def test_missing_files_raise_file_not_found(job_dir):
+    snapshot = DirectorySnapshot()
+    with pytest.raises(FileNotFoundError):
+        snapshot.stat(job_dir / "missing.star")
+    with pytest.raises(FileNotFoundError):
+        snapshot.stat(job_dir / "missing" / "mic_01.star")
+    assert not snapshot.exists(job_dir / "missing.star")
+
+
+def test_each_directory_is_listed_once(job_dir):
+    snapshot = DirectorySnapshot()
+    for _ in range(3):
+        snapshot.exists(job_dir / "corrected_micrographs.star")
+        snapshot.exists(job_dir / "missing.star")
+    assert snapshot.scans == 1
+
+
+def test_files_created_after_a_listing_are_not_seen(job_dir):
+    snapshot = DirectorySnapshot()
+    assert not snapshot.exists(job_dir / "new.star")
+    (job_dir / "new.star").write_text("data_\n")
+    assert not snapshot.exists(job_dir / "new.star")
+    assert DirectorySnapshot().exists(job_dir / "new.star")
+
+
+def test_files_are_listed_in_glob_order(job_dir):
+    expected = [p for p in job_dir.glob("**/*") if p.is_file()]
+    assert DirectorySnapshot().files(job_dir) == expected
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import datetime
+import io
+
+import pytest
+
+from relion._parser import joblogs
+from relion._parser.joblogs import ClusterSubmissions
+
+run_out = (
+    'Reading movies 000/??? sec ~~(,_,">  [oo] 2022-03-01 12:00:00.123: '
+    "Submitted with job ID cl1\n"
+    " * Movies/mic_00000.mrc\n"
+    "  3/  4 min ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~\n"
+    " Filtering Movies/mic_00001.tiff\n"
+    " ~~~~~~~~~~~~~[2022-03-01 12:05:01.5] Submitted with job ID cl2\n"
+    " * Movies/mic_00002.mrc\n"
+    " Movies/mic_00003.mrc is not counted\n"
+    " * Movies/mic_00004.tiff"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_files_read_in_pieces_give_the_same_submissions(monkeypatch, chunk_size):
+    monkeypatch.setattr(joblogs, "_chunk_size", chunk_size)
+    submissions = ClusterSubmissions(io.StringIO(run_out))
+    assert submissions.cluster_ids == ["cl1", "cl2"]
+    assert submissions.start_times == [
+        datetime.datetime(2022, 3, 1, 12, 0, 0),
+        datetime.datetime(2022, 3, 1, 12, 5, 1),
+    ]
+    assert submissions.mic_counts == [2, 2]
+    lines = ClusterSubmissions(run_out.splitlines(keepends=True))
+    assert lines.mic_counts == submissions.mic_counts
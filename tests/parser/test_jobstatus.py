@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import pathlib
+
+import pytest
+
+from relion._parser.dirsnapshot import DirectorySnapshot
+from relion._parser.jobstatus import JobStatusScanner
+
+job_paths = [
+    pathlib.PurePosixPath("Class2D/job008"),
+    pathlib.PurePosixPath("Class2D/job009"),
+    pathlib.PurePosixPath("Class2D/job010"),
+    pathlib.PurePosixPath("Class3D/job011"),
+    pathlib.PurePosixPath("Class3D/job012"),
+]
+
+
+@pytest.fixture
+def project(tmp_path):
+    exit_files = {
+        "Class2D/job008": ["RELION_JOB_EXIT_SUCCESS"],
+        "Class2D/job009": ["RELION_JOB_EXIT_SUCCESS", "RELION_JOB_EXIT_FAILURE"],
+        "Class2D/job010": [],
+        "Class3D/job011": ["RELION_JOB_EXIT_ABORTED"],
+    }
+    for job, names in exit_files.items():
+        (tmp_path / job).mkdir(parents=True)
+        for name in names:
+            (tmp_path / job / name).touch()
+            os.utime(tmp_path / job / name, ns=(2_000_000_000, 2_000_000_000))
+        os.utime(tmp_path / job, ns=(1_000_000_000, 1_000_000_000))
+    return tmp_path
+
+
+@pytest.mark.parametrize("threads", [1, 2])
+@pytest.mark.parametrize("snapshot", [None, DirectorySnapshot])
+def test_statuses_are_read_from_exit_files(project, threads, snapshot):
+    statuses = JobStatusScanner().scan(
+        project,
+        job_paths,
+        snapshot=snapshot and snapshot(),
+        threads=threads,
+    )
+    assert list(statuses) == job_paths
+    assert [s.status for s in statuses.values()] == [True, False, None, False, None]
+    assert statuses[job_paths[0]].end_time_stamp.timestamp() == 2
+    assert statuses[job_paths[2]].end_time_stamp is None
+
+
+def test_unchanged_job_directories_are_not_listed_again(project):
+    scanner = JobStatusScanner()
+    scanner.scan(project, job_paths)
+    assert scanner.scans == 4
+    (project / "Class2D/job010/RELION_JOB_EXIT_SUCCESS").touch()
+    os.utime(project / "Class2D/job010", ns=(3_000_000_000, 3_000_000_000))
+    statuses = scanner.scan(project, job_paths)
+    assert scanner.scans == 5
+    assert statuses[job_paths[2]].status
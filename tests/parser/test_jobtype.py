@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import pathlib
+
+import numpy as np
+import pytest
+from gemmi import cif
+
+from relion._parser.jobtype import JobType
+
+model_text = """
+data_model_general
+
+_rlnReferenceDimensionality 2
+
+data_model_classes
+
+loop_
+_rlnReferenceImage #1
+_rlnClassDistribution #2
+_rlnEstimatedResolution #3
+000001@Class2D/job008/run_it025_classes.mrcs 0.250000 12.500000
+000002@Class2D/job008/run_it025_classes.mrcs 0.750000 9.800000
+"""
+
+
+def test_parse_star_columns_matches_parse_star_file():
+    document = cif.read_string(model_text)
+    jobtype = JobType(pathlib.Path("Class2D"))
+    columns = ["_rlnReferenceImage", "_rlnClassDistribution"]
+    parsed = jobtype.parse_star_columns(document, 1, columns)
+    for column in columns:
+        assert parsed[column] == jobtype.parse_star_file(column, document, 1)
+
+
+def test_parse_star_columns_gives_typed_arrays():
+    document = cif.read_string(model_text)
+    parsed = JobType(pathlib.Path("Class2D")).parse_star_columns(
+        document,
+        1,
+        ["_rlnClassDistribution", "_rlnEstimatedResolution", "_rlnClassNumber"],
+        dtypes={"_rlnClassDistribution": float, "_rlnClassNumber": int},
+    )
+    assert parsed["_rlnClassDistribution"].dtype == np.float64
+    assert parsed["_rlnClassDistribution"].tolist() == [0.25, 0.75]
+    assert parsed["_rlnEstimatedResolution"] == ["12.500000", "9.800000"]
+    assert parsed["_rlnClassNumber"].dtype == int
+    assert len(parsed["_rlnClassNumber"]) == 0
+
+
+@pytest.fixture
+def class2d_job(tmp_path):
+    job_path = tmp_path / "Class2D" / "job008"
+    job_path.mkdir(parents=True)
+    for iteration in (1, 2):
+        for kind in ("data", "model", "optimiser"):
+            (job_path / f"run_it{iteration:03d}_{kind}.star").touch()
+    (job_path / "run_it003_data.star").touch()
+    os.utime(job_path, ns=(1_000_000_000, 1_000_000_000))
+    return job_path
+
+
+def test_newest_complete_iteration(class2d_job):
+    jobtype = JobType(class2d_job.parent)
+    assert jobtype.newest_complete_iteration("job008") == 2
+    assert jobtype.newest_complete_iteration("job008", kinds=("data",)) == 3
+    with pytest.raises(ValueError):
+        jobtype._final_data_and_model("job008")
+    (class2d_job / "run_it003_model.star").touch()
+    assert jobtype._final_data_and_model("job008") == (
+        "run_it003_data.star",
+        "run_it003_model.star",
+    )
+
+
+def test_job_directory_is_only_listed_again_when_it_changes(class2d_job):
+    iteration_cache = {}
+    assert JobType(class2d_job.parent, iteration_cache=iteration_cache)._iterations(
+        "job008"
+    ) == {
+        1: {"data", "model", "optimiser"},
+        2: {"data", "model", "optimiser"},
+        3: {"data"},
+    }
+    (class2d_job / "run_it003_model.star").touch()
+    os.utime(class2d_job, ns=(1_000_000_000, 1_000_000_000))
+    jobtype = JobType(class2d_job.parent, iteration_cache=iteration_cache)
+    assert jobtype.newest_complete_iteration("job008") == 2
+    os.utime(class2d_job, ns=(2_000_000_000, 2_000_000_000))
+    assert jobtype.newest_complete_iteration("job008") == 3
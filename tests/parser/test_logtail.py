@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import os
+
+from relion._parser.joblogs import ClusterSubmissions, JobCommand
+from relion._parser.logtail import LogTailReader
+
+submission = (
+    "~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~"
+    "[2020-07-02 11:20:54.123] Submitted batch job with job ID {}\n"
+)
+
+
+class Lines:
+    def __init__(self):
+        self.lines = []
+
+    def read(self, lines):
+        self.lines.extend(lines)
+
+
+def test_only_appended_bytes_are_parsed(tmp_path):
+    log = tmp_path / "run.out"
+    log.write_text("first\nsecond\n")
+    reader = LogTailReader()
+    assert reader.read(log, Lines).lines == ["first\n", "second\n"]
+    with open(log, "a") as f:
+        f.write("third\n")
+    assert reader.read(log, Lines).lines == ["first\n", "second\n", "third\n"]
+    assert reader.bytes_read == len("first\nsecond\nthird\n")
+
+
+def test_a_partial_last_line_is_read_again_once_complete(tmp_path):
+    log = tmp_path / "run.out"
+    log.write_text("first\nsec")
+    reader = LogTailReader()
+    assert reader.read(log, Lines).lines == ["first\n", "sec"]
+    with open(log, "a") as f:
+        f.write("ond\n")
+    assert reader.read(log, Lines).lines == ["first\n", "second\n"]
+
+
+def test_truncated_and_replaced_logs_are_read_from_the_start(tmp_path):
+    log = tmp_path / "run.out"
+    log.write_text("first\nsecond\n")
+    reader = LogTailReader()
+    reader.read(log, Lines)
+    log.write_text("new\n")
+    assert reader.read(log, Lines).lines == ["new\n"]
+    replacement = tmp_path / "run.out.new"
+    replacement.write_text("other\nlines\nafter\n")
+    os.replace(replacement, log)
+    assert reader.read(log, Lines).lines == ["other\n", "lines\n", "after\n"]
+
+
+def test_missing_logs_give_none(tmp_path):
+    assert LogTailReader().read(tmp_path / "run.out", Lines) is None
+
+
+def test_cluster_submissions_follow_a_growing_run_out(tmp_path):
+    log = tmp_path / "run.out"
+    log.write_text(submission.format("ab1") + " * mic1.mrc\n")
+    reader = LogTailReader()
+    submissions = reader.read(log, ClusterSubmissions)
+    assert submissions.cluster_ids == ["ab1"]
+    assert submissions.mic_counts == [1]
+    with open(log, "a") as f:
+        f.write(" * mic2.mrc\n" + submission.format("ab2") + " * mic3.tiff\n")
+    submissions = reader.read(log, ClusterSubmissions)
+    assert submissions.cluster_ids == ["ab1", "ab2"]
+    assert submissions.start_times == [datetime.datetime(2020, 7, 2, 11, 20, 54)] * 2
+    assert submissions.mic_counts == [2, 1]
+
+
+def test_partial_last_lines_are_read_into_copies_of_the_state(tmp_path, monkeypatch):
+    log = tmp_path / "run.out"
+    log.write_text(submission.format("ab1") + " * mic1.mrc\n * mic2")
+    # the states of the job logs copy only what a line can change
+    monkeypatch.setattr(copy, "deepcopy", None)
+    reader = LogTailReader()
+    submissions = reader.read(log, ClusterSubmissions)
+    assert submissions.mic_counts == [1]
+    with open(log, "a") as f:
+        f.write(".mrc\n" + submission.format("ab2")[:-1])
+    submissions = reader.read(log, ClusterSubmissions)
+    assert submissions.cluster_ids == ["ab1", "ab2"]
+    assert submissions.mic_counts == [2, 0]
+    with open(log, "a") as f:
+        f.write("\n * mic3.tiff\n")
+    submissions = reader.read(log, ClusterSubmissions)
+    assert submissions.cluster_ids == ["ab1", "ab2"]
+    assert submissions.mic_counts == [2, 1]
+
+
+def test_numeric_cluster_ids_have_no_mic_counts():
+    submissions = ClusterSubmissions([submission.format("123"), " * mic1.mrc\n"])
+    assert submissions.cluster_ids == ["123"]
+    assert submissions.mic_counts is None
+
+
+def test_job_command_is_the_last_which_line():
+    note = JobCommand(["`which relion_refine` --o a\n", "`which relion_refine_mpi`\n"])
+    assert note.command == "relion_refine_mpi"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 from pprint import pprint
 from typing import NamedTuple
@@ -7,6 +8,8 @@ from typing import NamedTuple
 import pytest
 
 import relion
+from relion._parser.motioncorrection import MotionCorr
+from relion._parser.starcache import star_document_cache
 
 
 class Options(NamedTuple):
@@ -96,17 +99,17 @@ def test_all_keys_are_different(input):
 
 def test_total_value(input):
     mc_object = input
-    assert mc_object["job002"][0].total_motion == "16.420495"
+    assert mc_object["job002"][0].total_motion == 16.420495
 
 
 def test_late_motion(input):
     mc_object = input
-    assert mc_object["job002"][0].late_motion == "13.914187"
+    assert mc_object["job002"][0].late_motion == 13.914187
 
 
 def test_early_motion(input):
     mc_object = input
-    assert mc_object["job002"][0].early_motion == "2.506308"
+    assert mc_object["job002"][0].early_motion == 2.506308
 
 
 def test_invalid_input(invalid_input):
@@ -116,3 +119,105 @@ def test_invalid_input(invalid_input):
     except TypeError:
         early_motion = False
     assert early_motion is False
+
+
+def test_threaded_drift_loading_matches_serial_loading(dials_data):
+    basepath = dials_data("relion_tutorial_data", pathlib=True) / "MotionCorr"
+    serial = MotionCorr(basepath)["job002"]
+    threaded = MotionCorr(basepath, threads=4)["job002"]
+    assert len(threaded) == len(serial) == 24
+    assert threaded == serial
+
+
+def test_threaded_drift_loading_of_a_growing_job(tmp_path):
+    job_path = tmp_path / "MotionCorr" / "job002"
+    (job_path / "Movies").mkdir(parents=True)
+    (tmp_path / "Movies").mkdir()
+    rows = []
+    for i in range(6):
+        (tmp_path / "Movies" / f"mic_{i}.tiff").touch()
+        drift = (
+            "data_general\n\n"
+            f"_rlnMicrographMovieName Movies/mic_{i}.tiff\n\n"
+            "data_global_shift\n\nloop_\n_rlnMicrographFrameNumber #1\n"
+            "_rlnMicrographShiftX #2\n_rlnMicrographShiftY #3\n"
+        )
+        drift += "".join(f"{f} {f * 0.1 + i} {-f * 0.2}\n" for f in range(1, 5))
+        (job_path / "Movies" / f"mic_{i}.star").write_text(drift)
+        rows.append(f"MotionCorr/job002/Movies/mic_{i}.mrc {i}.5 0.5 {i}.0\n")
+    header = (
+        "data_micrographs\n\nloop_\n_rlnMicrographName #1\n_rlnAccumMotionTotal #2\n"
+        "_rlnAccumMotionEarly #3\n_rlnAccumMotionLate #4\n"
+    )
+    star_path = job_path / "corrected_micrographs.star"
+    star_path.write_text(header + "".join(rows[:3]))
+    threaded = MotionCorr(tmp_path / "MotionCorr", threads=3)
+    assert len(threaded["job002"]) == 3
+    with open(star_path, "a") as star_file:
+        star_file.write("".join(rows[3:]))
+    # a new parser sharing the caches, as happens on Project.load
+    threaded = MotionCorr(
+        tmp_path / "MotionCorr",
+        threaded._drift_cache,
+        threaded._star_loop_cache,
+        threads=3,
+    )
+    serial = MotionCorr(tmp_path / "MotionCorr")["job002"]
+    assert threaded["job002"] == serial
+    assert [m.micrograph_number for m in serial] == [1, 2, 3, 4, 5, 6]
+    assert serial[5].drift_data[0].deltaX == pytest.approx(5.1)
+    assert serial[5].micrograph_timestamp is not None
+
+
+def test_reused_rows_follow_rewritten_drift_files(tmp_path):
+    job_path = tmp_path / "MotionCorr" / "job002"
+    (job_path / "Movies").mkdir(parents=True)
+    (tmp_path / "Movies").mkdir()
+    (tmp_path / "Movies" / "mic_0.tiff").touch()
+    drift_path = job_path / "Movies" / "mic_0.star"
+
+    def write_drift(shift):
+        drift_path.write_text(
+            "data_general\n\n"
+            "_rlnMicrographMovieName Movies/mic_0.tiff\n\n"
+            "data_global_shift\n\nloop_\n_rlnMicrographFrameNumber #1\n"
+            "_rlnMicrographShiftX #2\n_rlnMicrographShiftY #3\n"
+            f"1 {shift} 0.0\n"
+        )
+
+    write_drift("1.0")
+    (job_path / "corrected_micrographs.star").write_text(
+        "data_micrographs\n\nloop_\n_rlnMicrographName #1\n_rlnAccumMotionTotal #2\n"
+        "_rlnAccumMotionEarly #3\n_rlnAccumMotionLate #4\n"
+        "MotionCorr/job002/Movies/mic_0.mrc 0.5 0.5 0.0\n"
+    )
+    mc = MotionCorr(tmp_path / "MotionCorr")
+    assert mc["job002"][0].drift_data[0].deltaX == pytest.approx(1.0)
+    # the same size, but a later mtime
+    write_drift("2.0")
+    stat = drift_path.stat()
+    os.utime(drift_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    mc = MotionCorr(tmp_path / "MotionCorr", mc._drift_cache, mc._star_loop_cache)
+    assert mc["job002"][0].drift_data[0].deltaX == pytest.approx(2.0)
+
+
+def test_drift_files_are_kept_out_of_the_star_document_cache(tmp_path):
+    job_path = tmp_path / "MotionCorr" / "job002"
+    (job_path / "Movies").mkdir(parents=True)
+    (job_path / "Movies" / "mic_0.star").write_text(
+        "data_general\n\n"
+        "_rlnMicrographMovieName Movies/mic_0.tiff\n\n"
+        "data_global_shift\n\nloop_\n_rlnMicrographFrameNumber #1\n"
+        "_rlnMicrographShiftX #2\n_rlnMicrographShiftY #3\n"
+        "1 1.0 0.0\n"
+    )
+    star_path = job_path / "corrected_micrographs.star"
+    star_path.write_text(
+        "data_micrographs\n\nloop_\n_rlnMicrographName #1\n_rlnAccumMotionTotal #2\n"
+        "_rlnAccumMotionEarly #3\n_rlnAccumMotionLate #4\n"
+        "MotionCorr/job002/Movies/mic_0.mrc 0.5 0.5 0.0\n"
+    )
+    star_document_cache.clear()
+    mc = MotionCorr(tmp_path / "MotionCorr")
+    assert mc["job002"][0].drift_data[0].deltaX == pytest.approx(1.0)
+    assert job_path / "Movies" / "mic_0.star" not in star_document_cache
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import relion
+from relion._parser.motioncorrection import MotionCorr
+from relion._parser.persistentcache import PersistentFileCache
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    data_path = tmp_path / "mic_01.star"
+    data_path.write_text("data_\n")
+    return data_path
+
+
+def test_committed_entries_are_available_after_reopening(tmp_path, data_file):
+    cache = PersistentFileCache(tmp_path / "cache.sqlite")
+    cache.put("drift", "mic_01.star", data_file.stat(), {"drift_data": [[1, 0.5, 0.1]]})
+    assert cache.stats["pending"] == 1
+    cache.close()
+    reopened = PersistentFileCache(tmp_path / "cache.sqlite")
+    assert reopened.get("drift", "mic_01.star", data_file.stat()) == {
+        "drift_data": [[1, 0.5, 0.1]]
+    }
+    assert reopened.get("particles", "mic_01.star", data_file.stat()) is None
+    assert reopened.stats["hits"] == 1
+
+
+def test_entries_for_modified_files_are_ignored(tmp_path, data_file):
+    cache = PersistentFileCache(tmp_path / "cache.sqlite")
+    cache.put("particles", "mic_01.star", data_file.stat(), [["1.0", "2.0"]])
+    cache.commit()
+    stat_result = data_file.stat()
+    os.utime(
+        data_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000)
+    )
+    assert cache.get("particles", "mic_01.star", data_file.stat()) is None
+    assert cache.stats["misses"] == 1
+
+
+def test_motioncorr_drift_data_is_restored_from_the_persistent_cache(tmp_path):
+    job_path = tmp_path / "MotionCorr" / "job002"
+    (job_path / "Movies").mkdir(parents=True)
+    (job_path / "Movies" / "mic_01.star").write_text(
+        "data_general\n\n_rlnMicrographMovieName Movies/mic_01.tiff\n\n"
+        "data_global_shift\n\nloop_\n_rlnMicrographFrameNumber #1\n"
+        "_rlnMicrographShiftX #2\n_rlnMicrographShiftY #3\n1 0.5 -0.5\n2 1.5 -1.5\n"
+    )
+    (job_path / "corrected_micrographs.star").write_text(
+        "data_micrographs\n\nloop_\n_rlnMicrographName #1\n_rlnAccumMotionTotal #2\n"
+        "_rlnAccumMotionEarly #3\n_rlnAccumMotionLate #4\n"
+        "MotionCorr/job002/Movies/mic_01.mrc 2.0 0.5 1.5\n"
+    )
+    db_path = tmp_path / "cache.sqlite"
+    first = MotionCorr(tmp_path / "MotionCorr", file_cache=PersistentFileCache(db_path))
+    micrographs = first["job002"]
+    restarted = MotionCorr(
+        tmp_path / "MotionCorr", file_cache=PersistentFileCache(db_path)
+    )
+    assert restarted["job002"] == micrographs
+    assert restarted._file_cache.stats["hits"] == 1
+    assert restarted["job002"][0].drift_data[1].deltaY == -1.5
+
+
+def test_project_commits_and_closes_its_persistent_cache(tmp_path, data_file):
+    with relion.Project(tmp_path, persistent_cache=True) as project:
+        cache = project._file_cache
+        cache.put("drift", "mic_01.star", data_file.stat(), {"drift_data": []})
+    assert project._file_cache is None
+    assert cache.stats["pending"] == 0
+    reopened = PersistentFileCache(cache.db_path)
+    assert reopened.get("drift", "mic_01.star", data_file.stat()) == {"drift_data": []}
@@ -183,6 +183,28 @@ def test_process_graph_split_connected(graph, new_origin_graph):
     assert connected == [graph_snapshot, ProcessGraph("new", [new_node])]
 
 
+def test_process_graph_split_connected_joins_origins_linked_through_another():
+    # the first two origins only share nodes with the third
+    origins = [ProcessNode(f"Project/Import/job00{i}") for i in range(1, 4)]
+    shared = [ProcessNode(f"Project/External/job00{i}") for i in range(4, 6)]
+    origins[0].link_to(shared[0])
+    origins[1].link_to(shared[1])
+    origins[2].link_to(shared[0])
+    origins[2].link_to(shared[1])
+    unlinked = ProcessNode("Project/External/job006")
+    graph = ProcessGraph("test", [*origins, *shared, unlinked])
+    connected = graph.split_connected()
+    assert [g.name for g in connected] == ["test:Connected:0", "test:Connected:3"]
+    assert [str(n._path) for n in connected[0]] == [
+        "Project/Import/job001",
+        "Project/External/job004",
+        "Project/Import/job002",
+        "Project/External/job005",
+        "Project/Import/job003",
+    ]
+    assert list(connected[1]) == [unlinked]
+
+
 def test_process_graph_split_connected_without_any_nodes():
     empty_graph = ProcessGraph("empty", [])
     connected = empty_graph.split_connected()
@@ -215,3 +237,44 @@ def test_process_graph_wipe(graph):
 
 def test_get_by_name(graph):
     assert graph.get_by_name("Project/MotionCorr/job002") == graph[1]
+
+
+def test_get_by_name_follows_renames_and_removals(graph, next_node_01):
+    next_node_01.change_name("Project/MotionCorr/job005")
+    assert graph.get_by_name("Project/MotionCorr/job002") is None
+    assert graph.get_by_name("Project/MotionCorr/job005") is next_node_01
+    graph.remove_node("Project/MotionCorr/job005")
+    assert graph.get_by_name("Project/MotionCorr/job005") is None
+    assert "Project/MotionCorr/job005" not in graph
+    graph.add_node(next_node_01)
+    assert graph.get_by_name("Project/MotionCorr/job005") is next_node_01
+    assert graph.index("Project/MotionCorr/job005") == 2
+
+
+def test_process_graph_remove_nodes_relinks_in_one_pass():
+    nodes = [ProcessNode(f"Project/Job/job{i:03d}") for i in range(5)]
+    for node, next_node in zip(nodes, nodes[1:]):
+        node.link_to(next_node)
+    graph = ProcessGraph("chain", list(nodes))
+    graph.remove_nodes(["Project/Job/job001", "Project/Job/job003"])
+    assert [n.name for n in graph] == [
+        "Project/Job/job000",
+        "Project/Job/job002",
+        "Project/Job/job004",
+    ]
+    assert list(nodes[0]) == [nodes[2]]
+    assert list(nodes[2]) == [nodes[4]]
+    with pytest.raises(ValueError):
+        graph.remove_nodes(["Project/Job/job001"])
+
+
+def test_process_graph_clone_leaves_results_behind(graph, node_with_links):
+    node_with_links.environment["status"] = True
+    node_with_links.environment["result"] = object()
+    cloned = graph.clone()
+    assert isinstance(cloned, ProcessGraph)
+    assert cloned == graph
+    assert cloned[0] is not node_with_links
+    assert cloned[0].environment["status"]
+    assert cloned[0].environment["result"] is None
+    assert cloned[0].environment["drop"] == []
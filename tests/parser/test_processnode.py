@@ -63,3 +63,18 @@ def test_process_node_child_checking_behaviour(node_with_links):
 def test_process_node_less_than_behaviour(node_with_links):
     next_node_01 = ProcessNode("Project/MotionCorr/job002")
     assert node_with_links < next_node_01
+
+
+def test_process_node_clone_keeps_cluster_info():
+    node = ProcessNode("Project/MotionCorr/job002")
+    node.environment["cluster_job_ids"] = ["1234"]
+    node.environment["cluster_job_start_times"] = ["2021-04-01 12:00:00"]
+    node.environment["cluster_job_mic_counts"] = [10]
+    node.environment["cluster_command"] = "sbatch"
+    node.environment["result"] = object()
+    cloned = node.clone()
+    assert cloned.environment["cluster_job_ids"] == ["1234"]
+    assert cloned.environment["cluster_job_start_times"] == ["2021-04-01 12:00:00"]
+    assert cloned.environment["cluster_job_mic_counts"] == [10]
+    assert cloned.environment["cluster_command"] == "sbatch"
+    assert cloned.environment["result"] is None
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
 import pathlib
 import sys
+from unittest import mock
 
 import pytest
 
@@ -160,3 +162,162 @@ def test_get_pipeline_jobs_from_preprocess_log_file(dials_data):
         dials_data("relion_tutorial_data", pathlib=True) / "pipeline_PREPROCESS.log"
     )
     assert "MotionCorr/job002" in preproc_jobs
+
+
+pipeline_text = """
+data_pipeline_processes
+
+loop_
+_rlnPipeLineProcessName #1
+_rlnPipeLineProcessAlias #2
+Import/job001/ None
+Select/job002/ None
+{processes}
+
+data_pipeline_nodes
+
+loop_
+_rlnPipeLineNodeName #1
+Import/job001/movies.star
+Select/job002/particles_split1.star
+{files}
+
+data_pipeline_input_edges
+
+loop_
+_rlnPipeLineEdgeFromNode #1
+_rlnPipeLineEdgeProcess #2
+Import/job001/movies.star Select/job002/
+Select/job002/particles_split1.star Class2D/job003/
+{input_edges}
+
+data_pipeline_output_edges
+
+loop_
+_rlnPipeLineEdgeProcess #1
+_rlnPipeLineEdgeToNode #2
+Import/job001/ Import/job001/movies.star
+Select/job002/ Select/job002/particles_split1.star
+{output_edges}
+"""
+
+
+def _write_pipeline(star_path, batches):
+    star_path.write_text(
+        pipeline_text.format(
+            processes="\n".join(
+                f"Class2D/job{i + 2:03d}/ None" for i in range(1, batches + 1)
+            ),
+            files="\n".join(
+                f"Select/job002/particles_split{i}.star" for i in range(2, batches + 1)
+            ),
+            input_edges="\n".join(
+                f"Select/job002/particles_split{i}.star Class2D/job{i + 2:03d}/"
+                for i in range(2, batches + 1)
+            ),
+            output_edges="\n".join(
+                f"Select/job002/ Select/job002/particles_split{i}.star"
+                for i in range(2, batches + 1)
+            ),
+        )
+    )
+
+
+def _job_graph(pipeline):
+    return [
+        (
+            str(node._path),
+            [str(n._path) for n in node._out],
+            [str(n._path) for n in node._in],
+            node.environment["batch_number"],
+            node.environment.propagate.store,
+        )
+        for node in pipeline._job_nodes
+    ]
+
+
+def test_incremental_load_adds_jobs_to_the_same_nodes(tmp_path):
+    star_path = tmp_path / "default_pipeline.star"
+    _write_pipeline(star_path, 1)
+    pipeline = RelionPipeline("Import/job001")
+    pipeline.load_nodes_from_star(star_path, incremental=True)
+    job_nodes = list(pipeline._job_nodes)
+    jobtype_nodes = list(pipeline)
+
+    _write_pipeline(star_path, 3)
+    pipeline.load_nodes_from_star(star_path, incremental=True)
+    pipeline._jobs_collapsed = False
+    assert len(pipeline._job_nodes) == 5
+    assert all(a is b for a, b in zip(pipeline._job_nodes, job_nodes))
+    assert all(a is b for a, b in zip(pipeline, jobtype_nodes))
+
+    full_pipeline = RelionPipeline("Import/job001")
+    full_pipeline.load_nodes_from_star(star_path)
+    assert _job_graph(pipeline) == _job_graph(full_pipeline)
+    assert [n.name for n in pipeline] == [n.name for n in full_pipeline]
+    assert [n.environment["job_string"] for n in pipeline] == [
+        n.environment["job_string"] for n in full_pipeline
+    ]
+
+
+def test_incremental_load_skips_unchanged_pipeline(tmp_path):
+    star_path = tmp_path / "default_pipeline.star"
+    _write_pipeline(star_path, 2)
+    pipeline = RelionPipeline("Import/job001")
+    pipeline.load_nodes_from_star(star_path, incremental=True)
+    with mock.patch.object(pipeline, "_star_doc", wraps=pipeline._star_doc) as star_doc:
+        pipeline.load_nodes_from_star(star_path, incremental=True)
+        star_doc.assert_not_called()
+        pipeline.load_nodes_from_star(star_path)
+        star_doc.assert_called_once()
+
+
+def test_incremental_load_rebuilds_changed_pipeline(tmp_path):
+    star_path = tmp_path / "default_pipeline.star"
+    _write_pipeline(star_path, 3)
+    pipeline = RelionPipeline("Import/job001")
+    pipeline.load_nodes_from_star(star_path, incremental=True)
+    _write_pipeline(star_path, 2)
+    pipeline.load_nodes_from_star(star_path, incremental=True)
+    assert [str(n._path) for n in pipeline._job_nodes] == [
+        "Import/job001",
+        "Select/job002",
+        "Class2D/job003",
+        "Class2D/job004",
+    ]
+
+
+def test_cluster_info_is_only_collected_again_for_changed_jobs(tmp_path):
+    star_path = tmp_path / "default_pipeline.star"
+    _write_pipeline(star_path, 2)
+    job_path = tmp_path / "Class2D" / "job003"
+    job_path.mkdir(parents=True)
+    (job_path / "run.out").write_text(
+        '000/??? sec ~~(,_,">  [oo] 2022-03-01 12:00:00.123: '
+        "Submitted with job ID cl1\n"
+    )
+    (job_path / "note.txt").write_text("`which relion_refine_mpi` --o a\n")
+    for name in ("run.out", "note.txt"):
+        os.utime(job_path / name, ns=(1_000_000_000, 1_000_000_000))
+    pipeline = RelionPipeline("Import/job001")
+    pipeline.load_nodes_from_star(star_path)
+    with mock.patch.object(
+        pipeline, "_job_cluster_info", wraps=pipeline._job_cluster_info
+    ) as job_cluster_info:
+        pipeline.collect_cluster_info(tmp_path)
+        assert job_cluster_info.call_count == 4
+        pipeline.load_nodes_from_star(star_path)
+        pipeline.collect_cluster_info(tmp_path)
+        assert job_cluster_info.call_count == 4
+        job = pipeline._job_nodes.get_by_name("Class2D/job003")
+        assert job.environment["cluster_job_ids"] == ["cl1"]
+        assert job.environment["cluster_command"] == "relion_refine_mpi"
+
+        with open(job_path / "run.out", "a") as run_out:
+            run_out.write(
+                '000/??? sec ~~(,_,">  [oo] 2022-03-01 12:10:00.123: '
+                "Submitted with job ID cl2\n"
+            )
+        pipeline.collect_cluster_info(tmp_path)
+        assert job_cluster_info.call_count == 5
+        assert job.environment["cluster_job_ids"] == ["cl1", "cl2"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+from relion._parser.resultframe import ResultFrame
+
+Row = namedtuple("Row", ["name", "number", "value"])
+
+row_dtypes = {"number": int, "value": float}
+
+
+@pytest.fixture
+def frame():
+    return ResultFrame(
+        Row,
+        {
+            "name": ["mic_01", "mic_02", "mic_03"],
+            "number": ["1", "2", "3"],
+            "value": ["16.420495", "19.551677", "12.5"],
+        },
+        row_dtypes,
+    )
+
+
+def test_numeric_columns_are_typed_arrays(frame):
+    assert isinstance(frame.column("value"), np.ndarray)
+    assert frame.column("value").dtype == float
+    assert frame.column("number").dtype == int
+    assert frame.column("name") == ["mic_01", "mic_02", "mic_03"]
+    assert frame.column("value").mean() == pytest.approx(16.157391)
+
+
+def test_rows_are_namedtuples_of_python_values(frame):
+    assert len(frame) == 3
+    assert frame[0] == Row("mic_01", 1, 16.420495)
+    assert frame[-1].value == 12.5
+    assert type(frame[-1].value) is float
+    assert type(frame[1].number) is int
+    assert list(frame) == [frame[0], frame[1], frame[2]]
+    assert frame[0].value == eval(repr(frame[0].value))
+    with pytest.raises(IndexError):
+        frame[3]
+
+
+def test_frame_compares_equal_to_list_of_rows(frame):
+    rows = [Row("mic_01", 1, 16.420495), Row("mic_02", 2, 19.551677)]
+    assert frame[:2] == rows
+    assert frame == ResultFrame.from_rows(Row, list(frame), row_dtypes)
+    assert frame != rows
+
+
+def test_adding_frames_concatenates_columns(frame):
+    combined = frame[:1] + frame[1:]
+    assert combined == frame
+    assert combined.column("value").dtype == float
+
+
+def test_unconvertible_column_keeps_original_values():
+    frame = ResultFrame.from_rows(Row, [Row("mic_01", None, "1.0")], row_dtypes)
+    assert frame.column("number") == [None]
+    assert frame[0] == Row("mic_01", None, 1.0)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import pathlib
+
+from relion._parser.schedulelog import ScheduleLog, ScheduleLogIndex
+
+preprocess_log = """PIPELINER: writing out information in logfile pipeline_PREPROCESS.log
+ - Import/job001/
+ - MotionCorr/job002/
+ + Thu Jul 2 11:20:54 2020
+ ---- Executing Import/job001/
+ + Thu Jul 2 11:20:54 2020
+ ---- Executing MotionCorr/job002/
+ + Thu Jul 2 11:21:54 2020
+ ---- Executing MotionCorr/job002/
+"""
+
+class2d_log = """ + Thu Jul 2 12:27:54 2020
+ ---- Executing Class2D/job008/
+"""
+
+
+def test_execution_times_are_indexed_by_job():
+    log = ScheduleLog(preprocess_log.splitlines(keepends=True))
+    assert log.lines == 9
+    assert log.listed_jobs == ["Import/job001/", "MotionCorr/job002/"]
+    assert log.times(pathlib.PurePosixPath("MotionCorr/job002")) == [
+        datetime.datetime(2020, 7, 2, 11, 20, 54),
+        datetime.datetime(2020, 7, 2, 11, 21, 54),
+    ]
+    assert log.count("Import/job001") == 1
+    assert log.count("Import/job00") == 0
+    assert log.times("Class2D/job008") == []
+
+
+def test_lines_read_later_add_to_the_log():
+    lines = preprocess_log.splitlines(keepends=True)
+    log = ScheduleLog(lines[:7])
+    assert log.count("MotionCorr/job002") == 1
+    log.read(lines[7:])
+    assert log.count("MotionCorr/job002") == 2
+
+
+def test_copies_read_more_lines_without_changing_the_log():
+    lines = preprocess_log.splitlines(keepends=True)
+    log = ScheduleLog(lines[:7])
+    log_copy = copy.copy(log)
+    log_copy.read(lines[7:] + [" - Class2D/job008/\n"])
+    assert log_copy.count("MotionCorr/job002") == 2
+    assert log_copy.listed_jobs[-1] == "Class2D/job008/"
+    assert log.count("MotionCorr/job002") == 1
+    assert log.listed_jobs == ["Import/job001/", "MotionCorr/job002/"]
+    assert log.lines == 7
+    assert log_copy.times("Import/job001") == log.times("Import/job001")
+
+
+def test_index_combines_logs(tmp_path):
+    (tmp_path / "pipeline_PREPROCESS.log").write_text(preprocess_log)
+    (tmp_path / "pipeline_CLASS2D.log").write_text(class2d_log)
+    index = ScheduleLogIndex(sorted(tmp_path.glob("pipeline*.log")))
+    assert index.count("MotionCorr/job002") == 2
+    assert index.latest("MotionCorr/job002") == datetime.datetime(
+        2020, 7, 2, 11, 21, 54
+    )
+    assert index.latest("Class2D/job008") == datetime.datetime(2020, 7, 2, 12, 27, 54)
+    assert index.latest("Class3D/job009") is None
+    assert index.get(tmp_path / "pipeline_CLASS2D.log").count("Class2D/job008") == 1
+    assert index.get(tmp_path / "pipeline_CLASS3D.log").lines == 0
+    assert len(index.logs) == 2
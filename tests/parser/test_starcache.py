@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import re
+import sys
+
+import pytest
+
+from relion._parser.starcache import StarDocumentCache
+
+star_contents = """
+data_micrographs
+
+loop_
+_rlnMicrographName #1
+_rlnAccumMotionTotal #2
+MotionCorr/job002/Movies/mic_01.mrc 16.420495
+MotionCorr/job002/Movies/mic_02.mrc 19.551677
+"""
+
+
+@pytest.fixture
+def star_file(tmp_path):
+    star_path = tmp_path / "corrected_micrographs.star"
+    star_path.write_text(star_contents)
+    return star_path
+
+
+def test_unchanged_file_is_only_parsed_once(star_file):
+    cache = StarDocumentCache()
+    doc = cache.read(star_file)
+    assert list(doc[0].find_loop("_rlnAccumMotionTotal")) == [
+        "16.420495",
+        "19.551677",
+    ]
+    assert cache.read(star_file) is doc
+    assert cache.read(str(star_file)) is doc
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 1
+
+
+def test_modified_file_is_parsed_again(star_file):
+    cache = StarDocumentCache()
+    doc = cache.read(star_file)
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_03.mrc 12.0\n")
+    new_doc = cache.read(star_file)
+    assert new_doc is not doc
+    assert len(new_doc[0].find_loop("_rlnAccumMotionTotal")) == 3
+    assert cache.stats["misses"] == 2
+    assert cache.stats["documents"] == 1
+
+
+def test_file_with_same_size_but_new_mtime_is_parsed_again(star_file):
+    cache = StarDocumentCache()
+    doc = cache.read(star_file)
+    star_file.write_text(star_contents.replace("16.420495", "16.420496"))
+    stat_result = star_file.stat()
+    os.utime(
+        star_file,
+        ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000),
+    )
+    new_doc = cache.read(star_file)
+    assert new_doc is not doc
+    assert new_doc[0].find_loop("_rlnAccumMotionTotal")[0] == "16.420496"
+
+
+def test_least_recently_used_documents_are_evicted_over_budget(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"file_{i}.star")
+        paths[-1].write_text(star_contents)
+    cache = StarDocumentCache(max_file_bytes=2 * len(star_contents))
+    cache.read(paths[0])
+    cache.read(paths[1])
+    cache.read(paths[0])
+    cache.read(paths[2])
+    assert paths[0] in cache
+    assert paths[1] not in cache
+    assert paths[2] in cache
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["file_bytes"] <= cache.max_file_bytes
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    cache = StarDocumentCache()
+    with pytest.raises(FileNotFoundError):
+        cache.read(tmp_path / "missing.star")
+    assert len(cache) == 0
+
+
+def test_documents_read_from_several_threads_keep_the_budget(tmp_path):
+    paths = []
+    for i in range(8):
+        paths.append(tmp_path / f"file_{i}.star")
+        paths[-1].write_text(star_contents)
+    cache = StarDocumentCache(max_file_bytes=3 * len(star_contents))
+    interval = sys.getswitchinterval()
+    # switch threads as often as possible so that races show up
+    sys.setswitchinterval(1e-6)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            docs = list(pool.map(cache.read, paths * 50))
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(len(doc[0].find_loop("_rlnAccumMotionTotal")) == 2 for doc in docs)
+    assert cache.stats["hits"] + cache.stats["misses"] == 400
+    assert cache.stats["file_bytes"] == sum(e.size for e in cache._entries.values())
+    assert cache.stats["file_bytes"] <= cache.max_file_bytes
+    assert len(cache) <= 3
+
+
+def test_parse_errors_name_the_file(tmp_path):
+    star_path = tmp_path / "broken.star"
+    star_path.write_text('data_broken\n\nloop_\n_rlnMicrographName #1\n"mic_01.mrc\n')
+    cache = StarDocumentCache()
+    with pytest.raises(ValueError, match=f"^{re.escape(str(star_path))}:5:"):
+        cache.read(star_path)
+    assert len(cache) == 0
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import collections
+import random
+
+import pytest
+
+from relion._parser import starcount
+from relion._parser.starcount import count_star_column
+
+star_header = """
+# version 30001
+
+data_optics
+
+loop_
+_rlnOpticsGroupName #1
+_rlnOpticsGroup #2
+opticsGroup1 1
+
+# version 30001
+
+data_particles
+
+loop_
+_rlnImageName #1
+_rlnClassNumber #2
+_rlnAnglePsi #3
+"""
+
+
+@pytest.fixture
+def class_numbers():
+    rng = random.Random(1)
+    return [rng.randint(1, 50) for _ in range(2000)]
+
+
+@pytest.fixture
+def data_star(tmp_path, class_numbers):
+    star_path = tmp_path / "run_it025_data.star"
+    star_path.write_text(
+        star_header
+        + "".join(
+            f"{i:06d}@Extract/job007/Movies/mic_1.mrcs {n} 12.5\n"
+            for i, n in enumerate(class_numbers)
+        )
+    )
+    return star_path
+
+
+def test_counts_match_the_column(data_star, class_numbers):
+    counts = count_star_column(data_star, "_rlnClassNumber")
+    assert counts == collections.Counter(class_numbers)
+
+
+def test_counts_do_not_depend_on_the_chunk_size(data_star, class_numbers, monkeypatch):
+    monkeypatch.setattr(starcount, "_chunk_size", 100)
+    assert count_star_column(data_star, "_rlnClassNumber") == collections.Counter(
+        class_numbers
+    )
+
+
+def test_quoted_values_and_comments(tmp_path):
+    star_path = tmp_path / "run_it025_data.star"
+    star_path.write_text(
+        star_header
+        + "'000001@Extract/job007/Movies/mic 1.mrcs' 3 12.5 # a comment\n"
+        + "000002@Extract/job007/Movies/mic_1.mrcs 3 12.5\n"
+        + "000003@Extract/job007/Movies/mic_1.mrcs\n4 12.5\n"
+    )
+    assert count_star_column(star_path, "_rlnClassNumber") == {3: 2, 4: 1}
+
+
+def test_row_that_is_still_being_written_is_not_counted(tmp_path):
+    star_path = tmp_path / "run_it025_data.star"
+    star_path.write_text(
+        star_header
+        + "000001@Extract/job007/Movies/mic_1.mrcs 3 12.5\n"
+        + "000002@Extract/job007/Movies/mic_1.mrcs 4"
+    )
+    assert count_star_column(star_path, "_rlnClassNumber") == {3: 1}
+
+
+def test_multi_line_text_falls_back_to_gemmi(tmp_path):
+    star_path = tmp_path / "run_it025_data.star"
+    star_path.write_text(
+        star_header
+        + ";\n000001@Extract/job007/Movies/mic_1.mrcs\n;\n3 12.5\n"
+        + "000002@Extract/job007/Movies/mic_1.mrcs 5 12.5\n"
+    )
+    assert count_star_column(star_path, "_rlnClassNumber") == {3: 1, 5: 1}
+
+
+def test_missing_column_and_empty_file(tmp_path, data_star):
+    assert not count_star_column(data_star, "_rlnGroupNumber")
+    empty = tmp_path / "empty.star"
+    empty.touch()
+    assert not count_star_column(empty, "_rlnClassNumber")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from gemmi import cif
+
+from relion._parser.starloop import AppendedStarLoop
+
+star_header = """
+data_optics
+
+loop_
+_rlnOpticsGroupName #1
+_rlnAmplitudeContrast #2
+opticsGroup1 0.100000
+
+
+data_micrographs
+
+loop_
+_rlnMicrographName #1
+_rlnAccumMotionTotal #2
+"""
+
+star_rows = [
+    "MotionCorr/job002/Movies/mic_01.mrc 16.420495\n",
+    "MotionCorr/job002/Movies/mic_02.mrc 19.551677\n",
+]
+
+
+@pytest.fixture
+def star_file(tmp_path):
+    star_path = tmp_path / "corrected_micrographs.star"
+    star_path.write_text(star_header + "".join(star_rows))
+    return star_path
+
+
+def test_only_appended_rows_are_decoded(star_file):
+    loop = AppendedStarLoop(star_file, "_rlnAccumMotionTotal")
+    assert loop.read() == 0
+    assert loop["_rlnAccumMotionTotal"] == ["16.420495", "19.551677"]
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_03.mrc 12.000000\n")
+    assert loop.read() == 2
+    assert len(loop) == 3
+    assert loop["_rlnMicrographName"][-1] == "MotionCorr/job002/Movies/mic_03.mrc"
+    assert loop.read() == 3
+    assert loop.full_parses == 1
+
+
+def test_partially_written_row_is_left_for_the_next_read(star_file):
+    loop = AppendedStarLoop(star_file, "_rlnAccumMotionTotal")
+    loop.read()
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_03.mrc 12.0")
+    assert loop.read() == 2
+    assert len(loop) == 2
+    with open(star_file, "a") as sfile:
+        sfile.write("00000\n")
+    assert loop.read() == 2
+    assert loop["_rlnAccumMotionTotal"][-1] == "12.000000"
+    assert loop.full_parses == 1
+
+
+def test_settled_last_row_without_a_newline_is_read(star_file):
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_03.mrc 12.000000")
+    loop = AppendedStarLoop(star_file, "_rlnAccumMotionTotal")
+    assert loop.read() == 0
+    assert len(loop) == 2
+    os.utime(star_file, ns=(1_000_000_000, 1_000_000_000))
+    assert loop.read() == 2
+    assert loop["_rlnAccumMotionTotal"] == [
+        "16.420495",
+        "19.551677",
+        "12.000000",
+    ]
+    gemmi_loop = cif.read_file(str(star_file)).find_block("micrographs")
+    assert loop["_rlnAccumMotionTotal"] == list(
+        gemmi_loop.find_loop("_rlnAccumMotionTotal")
+    )
+    # the row is read again once the file grows
+    with open(star_file, "a") as sfile:
+        sfile.write("5\nMotionCorr/job002/Movies/mic_04.mrc 8.000000\n")
+    assert loop.read() == 2
+    assert loop["_rlnAccumMotionTotal"][2:] == ["12.0000005", "8.000000"]
+    assert loop.full_parses == 1
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("0.100000", "0.070000"),
+        ("16.420495", "16.420496"),
+    ],
+)
+def test_changes_before_the_end_of_the_loop_cause_a_full_parse(star_file, old, new):
+    loop = AppendedStarLoop(star_file, "_rlnAccumMotionTotal")
+    loop.read()
+    star_file.write_text(
+        (star_header + "".join(star_rows)).replace(old, new)
+        + "MotionCorr/job002/Movies/mic_03.mrc 12.000000\n"
+    )
+    assert loop.read() == 0
+    assert len(loop) == 3
+    assert loop.full_parses == 2
+    assert loop.preamble[0].find_loop("_rlnAmplitudeContrast")[0] in (
+        "0.100000",
+        "0.070000",
+    )
+
+
+def test_loop_that_is_not_at_the_end_of_the_file_matches_gemmi(tmp_path):
+    star_path = tmp_path / "micrographs.star"
+    star_path.write_text(
+        star_header
+        + "".join(star_rows)
+        + "'MotionCorr/job002/Movies/mic 03.mrc' 12.000000\n"
+        + "\n\ndata_other\n\nloop_\n_rlnOther #1\n1\n"
+    )
+    loop = AppendedStarLoop(star_path, "_rlnAccumMotionTotal")
+    loop.read()
+    block = cif.read_file(str(star_path))[1]
+    assert loop["_rlnMicrographName"] == list(block.find_loop("_rlnMicrographName"))
+    assert loop["_rlnAccumMotionTotal"] == list(block.find_loop("_rlnAccumMotionTotal"))
+
+
+def test_rows_appended_after_a_read_through_gemmi_are_decoded(star_file):
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_03.mrc\n;12.000000\n;\n")
+    loop = AppendedStarLoop(star_file, "_rlnAccumMotionTotal")
+    assert loop.read() == 0
+    assert len(loop) == 3
+    with open(star_file, "a") as sfile:
+        sfile.write("MotionCorr/job002/Movies/mic_04.mrc 8.000000\n")
+    assert loop.read() == 3
+    assert loop["_rlnAccumMotionTotal"][-1] == "8.000000"
+    block = cif.read_file(str(star_file))[1]
+    assert loop["_rlnAccumMotionTotal"] == list(block.find_loop("_rlnAccumMotionTotal"))
+    assert loop.full_parses == 1
+
+
+def test_loop_read_through_gemmi_before_another_block_is_parsed_again(tmp_path):
+    star_path = tmp_path / "micrographs.star"
+    star_path.write_text(
+        star_header + "".join(star_rows) + "\ndata_other\n\nloop_\n_rlnOther #1\n1\n"
+    )
+    loop = AppendedStarLoop(star_path, "_rlnAccumMotionTotal")
+    loop.read()
+    with open(star_path, "a") as sfile:
+        sfile.write("2\n")
+    assert loop.read() == 0
+    assert len(loop) == 2
+    assert loop.full_parses == 2
+
+
+def test_missing_column_gives_an_empty_loop(star_file):
+    loop = AppendedStarLoop(star_file, "_rlnCtfAstigmatism")
+    assert loop.read() == 0
+    assert len(loop) == 0
+    assert "_rlnMicrographName" not in loop
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from gemmi import cif
+
+from relion._parser.starcache import StarDocumentCache
+from relion._parser.starschema import StarSchema
+
+star_text = """
+data_optics
+
+loop_
+_rlnOpticsGroupName #1
+_rlnAmplitudeContrast #2
+opticsGroup1 0.100000
+
+
+data_empty
+
+loop_
+_rlnMicrographName #1
+
+
+data_micrographs
+
+_rlnVersion 30001
+
+loop_
+_rlnMicrographName #1
+_rlnAccumMotionTotal #2
+MotionCorr/job002/Movies/mic_01.mrc 16.420495
+MotionCorr/job002/Movies/mic_02.mrc 19.551677
+"""
+
+
+def test_columns_are_located_from_the_loop_headers():
+    schema = StarSchema(cif.read_string(star_text))
+    location = schema.find("_rlnAccumMotionTotal")
+    assert (location.block, location.item, location.column, location.rows) == (
+        2,
+        1,
+        1,
+        2,
+    )
+    assert schema.block_index("_rlnAmplitudeContrast") == 0
+    assert schema.block_index("_rlnamplitudecontrast") == 0
+    assert "_rlnVersion" not in schema
+    assert schema.block_index("_rlnCtfAstigmatism") is None
+
+
+def test_empty_loops_are_skipped_like_find_loop():
+    document = cif.read_string(star_text)
+    schema = StarSchema(document)
+    assert schema.block_index("_rlnMicrographName") == 2
+    assert schema.find("_rlnMicrographName", block=1) is None
+    assert not list(document[1].find_loop("_rlnMicrographName"))
+
+
+def test_schema_is_kept_for_cached_documents(tmp_path):
+    star_path = tmp_path / "corrected_micrographs.star"
+    star_path.write_text(star_text)
+    cache = StarDocumentCache()
+    document = cache.read(star_path)
+    assert cache.schema(document) is cache.schema(document)
+    cache.invalidate(star_path)
+    assert cache.schema(document) is not cache.schema(document)
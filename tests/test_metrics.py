@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import datetime
+import json
+
+import pytest
+
+from relion._parser.processnode import ProcessNode
+from relion._parser.relion_pipeline import RelionPipeline
+from relion.metrics import as_dict, job_metrics, prometheus_text, stage_metrics
+
+now = datetime.datetime(2022, 3, 1, 14, 0, 0)
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = RelionPipeline("Import/job001")
+    environments = {
+        "MotionCorr/job002": {
+            "alias": "None",
+            "status": True,
+            "start_time_stamp": datetime.datetime(2022, 3, 1, 12, 0, 0),
+            "end_time_stamp": datetime.datetime(2022, 3, 1, 13, 0, 0),
+            "job_count": 2,
+            "job_start_times": [
+                datetime.datetime(2022, 3, 1, 11, 0, 0),
+                datetime.datetime(2022, 3, 1, 12, 0, 0),
+            ],
+            "cluster_job_ids": ["a1", "a2"],
+            "cluster_job_start_times": [
+                datetime.datetime(2022, 3, 1, 11, 1, 0),
+                datetime.datetime(2022, 3, 1, 12, 3, 0),
+            ],
+            "cluster_job_mic_counts": [40, 60],
+        },
+        "Class2D/job003": {
+            "alias": 'batch "1"',
+            "status": None,
+            "start_time_stamp": datetime.datetime(2022, 3, 1, 13, 0, 0),
+            "end_time_stamp": None,
+            "job_count": 1,
+        },
+        "Class2D/job004": {
+            "alias": "None",
+            "status": None,
+        },
+    }
+    for path, environment in environments.items():
+        node = ProcessNode(path)
+        for key, value in environment.items():
+            node.environment[key] = value
+        pipeline._job_nodes.add_node(node)
+    return pipeline
+
+
+def test_job_metrics(pipeline):
+    motioncorr, running, unstarted = job_metrics(pipeline, now=now)
+    assert motioncorr.alias is None
+    assert motioncorr.stage == "MotionCorr"
+    assert motioncorr.duration == 3600
+    assert motioncorr.runs == 2
+    assert motioncorr.cluster_jobs == 2
+    assert motioncorr.queue_wait == 120
+    assert motioncorr.micrographs == 100
+    assert motioncorr.micrographs_per_hour == 100
+    assert running.end_time is None
+    assert running.duration == 3600
+    assert running.queue_wait is None
+    assert running.micrographs is None
+    assert unstarted.duration is None
+    assert unstarted.runs == 0
+
+
+def test_stage_metrics(pipeline):
+    motioncorr, class2d = stage_metrics(job_metrics(pipeline, now=now), now=now)
+    assert motioncorr.end_time == datetime.datetime(2022, 3, 1, 13, 0, 0)
+    assert motioncorr.micrographs_per_hour == 100
+    assert (class2d.jobs, class2d.running) == (2, 1)
+    assert class2d.end_time is None
+    assert class2d.duration == 3600
+    assert class2d.micrographs is None
+
+
+def test_metrics_as_json_and_prometheus_text(pipeline):
+    jobs = job_metrics(pipeline, now=now)
+    stages = stage_metrics(jobs, now=now)
+    exported = json.loads(json.dumps(as_dict(jobs, stages, now=now)))
+    assert exported["generated"] == "2022-03-01T14:00:00"
+    assert exported["jobs"][0]["end_time"] == "2022-03-01T13:00:00"
+    text = prometheus_text(jobs, stages)
+    assert "# TYPE relion_job_micrographs gauge" in text
+    assert (
+        'relion_job_micrographs{job="MotionCorr/job002",stage="MotionCorr"} 100.0'
+        in text.splitlines()
+    )
+    assert (
+        'relion_job_running{job="Class2D/job003",stage="Class2D",alias="batch \\"1\\""}'
+        " 1.0" in text.splitlines()
+    )
+    assert 'relion_stage_running_jobs{stage="Class2D"} 1.0' in text.splitlines()
+    assert 'relion_job_queue_wait_seconds{job="Class2D' not in text